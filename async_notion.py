@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+asyncio で Notion データベースへの書き込みを行うモジュール
+"""
+
+import asyncio
+import logging
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from notion_client import AsyncClient
+from notion_client.errors import APIResponseError
+
+from metrics import RunMetrics
+from notion import BaseNotionClient
+from notion_payload import NotionPayload, build_payload
+from pipeline import abounded_map
+from rate_limit import TokenBucket
+from sync_state import SyncStateStore
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+class AsyncNotionClient(BaseNotionClient):
+    """
+    Notion API の非同期クライアント
+
+    書き込みを CONCURRENCY 件まで同時に実行し、送信間隔はトークンバケットで
+    REQUESTS_PER_SECOND 以下に抑える。スキーマ検証結果のキャッシュ・差分判定・
+    リトライの判定は同期版の NotionClient と共通の BaseNotionClient を使い、
+    このクラスは通信だけを行う。
+    """
+
+    CONCURRENCY = 3  # 同時に実行する書き込み数
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        database_id: Optional[str] = None,
+        sync_state: Optional[SyncStateStore] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[RunMetrics] = None,
+        concurrency: Optional[int] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            token (str, optional): Notion APIトークン
+            database_id (str, optional): NotionデータベースID
+            sync_state (SyncStateStore, optional): 前回書き込んだプロパティの記録
+            base_url (str, optional): API のベースURL（未指定時は環境変数
+                NOTION_API_BASE_URL、それもなければ公式API）
+            metrics (RunMetrics, optional): リクエスト数や所要時間の記録先
+            concurrency (int, optional): 同時に実行する書き込み数
+            rate_limiter (TokenBucket, optional): 全リクエストで共有するトークンバケット
+        """
+        super().__init__(
+            token=token,
+            database_id=database_id,
+            rate_limiter=rate_limiter,
+            sync_state=sync_state,
+            base_url=base_url,
+            metrics=metrics,
+        )
+        self.concurrency = concurrency or self.CONCURRENCY
+
+    def _create_client(self) -> AsyncClient:
+        """notion-client の非同期クライアントを作成し、応答ごとの計測フックを登録"""
+        client = AsyncClient(**self._client_options())
+
+        # httpx.AsyncClient のイベントフックはコルーチン関数である必要がある
+        async def record_response(response: Any) -> None:
+            self.record_response_metrics(self.metrics, response)
+
+        client.client.event_hooks["response"].append(record_response)
+        return client
+
+    async def aclose(self) -> None:
+        """接続プールを閉じる"""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncNotionClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _throttle(self) -> None:
+        """トークンを予約し、送信できるまでイベントループを止めずに待機"""
+        delay = self.rate_limiter.reserve()
+        if delay > 0:
+            await self.metrics.async_sleep(
+                delay, "rate_limit_sleep_seconds", limiter="notion"
+            )
+
+    async def _request(self, stage: str, method: Callable, **kwargs: Any) -> Any:
+        """レート制御と計測を行ってから notion-client のメソッドを呼び出す"""
+        await self._throttle()
+        started = time.perf_counter()
+        try:
+            return await method(**kwargs)
+        finally:
+            self.metrics.add_time(stage, time.perf_counter() - started)
+
+    async def _check_database(self, force: bool = False) -> bool:
+        """
+        データベースのプロパティ構成を検証し、不足しているプロパティを追加
+
+        検証結果は同期版と同様に SCHEMA_CACHE_TTL 秒キャッシュされる。
+
+        Args:
+            force (bool): キャッシュを無視して再検証するか
+
+        Returns:
+            bool: データベースが利用可能な状態であれば True
+        """
+        if not force and self._is_schema_cache_valid():
+            return True
+
+        try:
+            db = await self._request(
+                "notion_schema_check",
+                self.client.databases.retrieve,
+                database_id=self.database_id,
+            )
+            properties = db.get("properties", {})
+            missing_props = self.find_missing_properties(properties)
+            if missing_props:
+                await self._request(
+                    "notion_schema_check",
+                    self.client.databases.update,
+                    database_id=self.database_id,
+                    properties=missing_props,
+                )
+            self._store_schema(properties, missing_props)
+            return True
+        except APIResponseError as e:
+            logger.error(f"データベース接続エラー: {e}")
+            self.invalidate_schema_cache()
+            return False
+
+    async def search_page_by_url(self, url: str) -> Optional[dict]:
+        """
+        URLに基づいてページを検索
+
+        Args:
+            url (str): 検索するページのURL
+
+        Returns:
+            dict or None: 見つかったページ情報、または None
+        """
+        try:
+            response = await self._request(
+                "notion_url_lookup",
+                self.client.databases.query,
+                database_id=self.database_id,
+                **self._url_lookup_query(url),
+            )
+        except APIResponseError as e:
+            logger.error(f"Notionページ検索エラー: {e}")
+            return None
+        results = response.get("results", [])
+        return results[0] if results else None
+
+    async def build_url_index(self, since: Optional[str] = None) -> Dict[str, str]:
+        """
+        データベースを一括走査して URL → ページID のインデックスを構築
+
+        Args:
+            since (str, optional): この日付（ISO形式）以降に作成された記事のみを対象にする
+
+        Returns:
+            dict: URL をキー、ページIDを値とする辞書
+        """
+        index: Dict[str, str] = {}
+        query_params = self._url_index_query(since)
+        while True:
+            response = await self._request(
+                "notion_url_index",
+                self.client.databases.query,
+                database_id=self.database_id,
+                **query_params,
+            )
+            if not self._add_to_url_index(index, response, query_params):
+                break
+
+        self._url_index = index
+        logger.info(f"Notion URLインデックスを構築しました: {len(index)} 件")
+        return index
+
+    async def prepare_url_index(self, since: Optional[str] = None) -> None:
+        """
+        データベースを検証し、URLインデックスを構築
+
+        構築に失敗した場合はインデックスを使わず、記事ごとの検索に切り替える。
+
+        Args:
+            since (str, optional): この日付（ISO形式）以降に作成された記事のみを対象にする
+        """
+        if not await self._check_database():
+            return
+        try:
+            await self.build_url_index(since=since)
+        except APIResponseError as e:
+            logger.warning(
+                f"URLインデックスの構築に失敗したため、記事ごとに検索します: {e}"
+            )
+            self.clear_url_index()
+
+    async def find_page_id_by_url(self, url: str) -> Optional[str]:
+        """
+        URLに対応するページIDを取得（インデックス未構築の場合は問い合わせる）
+
+        Args:
+            url (str): 記事のURL
+
+        Returns:
+            str or None: ページID、存在しない場合は None
+        """
+        if self._url_index is not None:
+            return self._url_index.get(url)
+
+        existing_page = await self.search_page_by_url(url)
+        return existing_page["id"] if existing_page else None
+
+    async def upsert_article(
+        self, article: dict, payload: Optional[NotionPayload] = None
+    ) -> Tuple[bool, bool, Optional[str]]:
+        """
+        記事を1件アップサート
+
+        Args:
+            article (dict): Notion用にフォーマットされた記事データ
+            payload (NotionPayload, optional): 作成済みのプロパティ。
+                省略時は記事データから作成する
+
+        Returns:
+            tuple: (成功したか, 新規作成か, ページID)
+        """
+        if payload is None:
+            payload = build_payload(article)
+        properties = payload.properties
+        fingerprints = payload.fingerprints
+        schema_revalidated = False
+        for attempt in range(self.MAX_WRITE_RETRIES):
+            if not await self._check_database():
+                logger.error("Notionデータベースの構造が不適切です")
+                return False, False, None
+            page_id = await self.find_page_id_by_url(article["url"])
+            try:
+                if page_id:
+                    changed_properties = self._get_update_properties(
+                        article, page_id, properties, fingerprints
+                    )
+                    if changed_properties is None:
+                        return True, False, page_id
+
+                    await self._request(
+                        "notion_page_write",
+                        self.client.pages.update,
+                        page_id=page_id,
+                        properties=changed_properties,
+                    )
+                    self._on_page_updated(
+                        article, page_id, changed_properties, fingerprints
+                    )
+                    return True, False, page_id
+
+                response = await self._request(
+                    "notion_page_write",
+                    self.client.pages.create,
+                    parent={"database_id": self.database_id},
+                    properties=properties,
+                )
+                page_id = response.get("id")
+                self._on_page_created(article, page_id, fingerprints)
+                return True, True, page_id
+            except APIResponseError as e:
+                wait_time = self._handle_write_error(
+                    e, attempt, page_id, schema_revalidated
+                )
+                if wait_time is None:
+                    return False, False, None
+                schema_revalidated = schema_revalidated or self._is_schema_error(e)
+                if wait_time > 0:
+                    await self.metrics.async_sleep(
+                        wait_time, "retry_sleep_seconds", **self._write_labels(page_id)
+                    )
+        logger.error("Notion API リトライ上限に達しました")
+        return False, False, None
+
+    async def _upsert_article_safely(
+        self, write: Tuple[dict, NotionPayload]
+    ) -> Tuple[bool, bool, Optional[str]]:
+        """(記事, ペイロード) の upsert_article を実行し、予期せぬ例外は失敗として扱う"""
+        article, payload = write
+        try:
+            return await self.upsert_article(article, payload)
+        except Exception as e:
+            logger.error(f"記事アップサート中にエラーが発生: {e}")
+            return False, False, None
+
+    async def bulk_upsert_articles(
+        self,
+        articles: Union[Iterable[dict], AsyncIterable[dict]],
+        since: Optional[str] = None,
+        on_result: Optional[Callable[[dict, bool, bool, Optional[str]], None]] = None,
+    ) -> Tuple[int, int, int, List[dict]]:
+        """
+        記事が届いた順に最大 concurrency 件ずつ並行してアップサート
+
+        Args:
+            articles (iterable): 記事データ（非同期イテラブルも可）
+            since (str, optional): URLインデックスの走査範囲（作成日の下限）
+            on_result (callable, optional): 記事ごとの結果
+                (記事, 成功したか, 新規作成か, ページID) を受け取るコールバック
+
+        Returns:
+            tuple: (成功件数, 新規作成件数, エラー件数, 新規記事のリスト)
+        """
+        success_count = 0
+        new_count = 0
+        error_count = 0
+        new_articles = []
+        skipped_before = self.skipped_count
+
+        # URLインデックスの構築は記事の取得・要約と並行して進め、最初の書き込みの前に待ち合わせる
+        index_ready = asyncio.ensure_future(self.prepare_url_index(since))
+
+        async def upsert(article: dict) -> Tuple[bool, bool, Optional[str]]:
+            # プロパティはURLインデックスの構築を待つ間に組み立てておく
+            payload = build_payload(article)
+            await index_ready
+            return await self._upsert_article_safely((article, payload))
+
+        async for article, (success, is_new, page_id) in abounded_map(
+            upsert, articles, self.concurrency
+        ):
+            if on_result is not None:
+                on_result(article, success, is_new, page_id)
+            if success:
+                success_count += 1
+                if is_new:
+                    new_count += 1
+                    new_articles.append(article)
+            else:
+                error_count += 1
+
+        await index_ready
+
+        logger.info(
+            f"Notionデータベース更新結果: 成功 {success_count}, 新規 {new_count}, エラー {error_count}"
+            f", 変更なし {self.skipped_count - skipped_before}"
+        )
+        return success_count, new_count, error_count, new_articles
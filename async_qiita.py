@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+asyncio で Qiita からの記事取得と要約を行うモジュール
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Callable, List, Optional
+
+import httpx
+
+from metrics import RunMetrics
+from pipeline import abounded_map
+from qiita import BaseQiitaClient, QiitaArticle
+from summary_cache import SummaryCache
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+class AsyncQiitaClient(BaseQiitaClient):
+    """
+    Qiita API の非同期クライアント
+
+    検索クエリを CONCURRENCY 件まで同時に実行する。リクエストの組み立て・
+    リトライの判定・要約・人気記事の判定は同期版の QiitaClient と共通の
+    BaseQiitaClient を使い、このクラスは通信だけを行う。
+    """
+
+    CONCURRENCY = 4  # 同時に実行する検索クエリ数
+    # トランスポート層では接続エラーのみリトライするため、5xx もここで扱う
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        summary_cache: Optional[SummaryCache] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[RunMetrics] = None,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            token (str, optional): Qiita APIトークン
+            summary_cache (SummaryCache, optional): 要約結果の永続キャッシュ
+            base_url (str, optional): API のベースURL（未指定時は環境変数
+                QIITA_API_BASE_URL、それもなければ BASE_URL）
+            metrics (RunMetrics, optional): リクエスト数や所要時間の記録先
+            concurrency (int, optional): 同時に実行する検索クエリ数
+        """
+        # 接続プールの大きさに使うため、セッションの作成より前に設定する
+        self.concurrency = concurrency or self.CONCURRENCY
+        super().__init__(
+            token=token, summary_cache=summary_cache, base_url=base_url, metrics=metrics
+        )
+
+    def _create_session(self) -> httpx.AsyncClient:
+        """接続エラーのみトランスポート層でリトライする httpx.AsyncClient を作成"""
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.TIMEOUT,
+            limits=httpx.Limits(max_connections=self.concurrency),
+            transport=httpx.AsyncHTTPTransport(retries=self.MAX_RETRIES),
+        )
+
+    async def aclose(self) -> None:
+        """接続プールを閉じる"""
+        await self.session.aclose()
+
+    async def __aenter__(self) -> "AsyncQiitaClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _make_request(self, endpoint: str, params: Optional[dict] = None) -> Any:
+        """APIリクエストを実行"""
+        url, labels = self._prepare_request(endpoint)
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            # 送信枠を予約し、待機はイベントループを止めずに行う
+            delay = self.rate_scheduler.reserve_slot()
+            if delay > 0:
+                await self.metrics.async_sleep(
+                    delay, "rate_limit_sleep_seconds", limiter="qiita"
+                )
+
+            started = time.perf_counter()
+            try:
+                response = await self.session.get(url, params=params)
+            except httpx.HTTPError as e:
+                self.metrics.increment("api_errors", **labels)
+                logger.error(f"Qiita API リクエストエラー: {e}")
+                raise
+            finally:
+                self.metrics.add_time("qiita_request", time.perf_counter() - started)
+            self.rate_scheduler.update(response.headers)
+            self._record_response(response, labels)
+
+            wait_time = self._get_retry_delay(response, attempt, labels)
+            if wait_time is not None:
+                await self.metrics.async_sleep(
+                    wait_time, "retry_sleep_seconds", **labels
+                )
+                continue
+
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Qiita API リクエストエラー: {e}")
+                raise
+            return response.json()
+
+    async def get_item(self, item_id: str) -> dict:
+        """
+        記事IDを指定して1件の記事を取得
+
+        Args:
+            item_id (str): 記事ID
+
+        Returns:
+            dict: Qiita API から取得した記事データ
+        """
+        return await self._make_request(f"items/{item_id}")
+
+    async def iter_search_pages(self, query: str) -> AsyncIterator[List[dict]]:
+        """
+        検索クエリに一致する記事をページ単位で順に返す非同期ジェネレータ
+
+        Args:
+            query (str): Qiita の検索クエリ
+
+        Yields:
+            list: 1ページ分の記事のリスト
+        """
+        page = 1
+        has_next = True
+        while has_next:
+            logger.debug(f"Qiita検索: {query} (ページ {page})")
+            try:
+                results = await self._make_request(
+                    "items", self._search_params(query, page)
+                )
+            except Exception as e:
+                self._record_fetch_error(e)
+                return
+
+            if not results:
+                return
+            has_next = self._has_next_page(query, results, page)
+            page += 1
+            yield results
+
+    async def search_items(self, query: str) -> List[dict]:
+        """
+        検索クエリに一致する記事をすべて取得
+
+        Args:
+            query (str): Qiita の検索クエリ
+
+        Returns:
+            list: 取得した記事のリスト
+        """
+        items = []
+        async for page in self.iter_search_pages(query):
+            items.extend(page)
+        logger.info(f"{query}: 合計 {len(items)} 記事を取得しました")
+        return items
+
+    async def iter_popular_articles(
+        self,
+        queries: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        min_likes: int = 500,
+        min_stocks: int = 500,
+        on_article: Optional[Callable[[QiitaArticle], None]] = None,
+    ) -> AsyncIterator[QiitaArticle]:
+        """
+        検索クエリを並行に実行し、人気記事の条件を満たす記事を完了したクエリから順に返す
+
+        Args:
+            queries (list): 検索クエリのリスト（build_search_queries で作成）
+            start_date (datetime): 期間の開始日時
+            end_date (datetime): 期間の終了日時
+            min_likes (int): 最低いいね数（LGTM or Stock）
+            min_stocks (int): 最低ストック数（LGTM or Stock）
+            on_article (callable, optional): 取得したすべての記事に対して呼び出すコールバック
+
+        Yields:
+            QiitaArticle: 条件を満たす記事
+        """
+        logger.info(
+            f"{len(queries)} 件のクエリを最大 {self.concurrency} 件ずつ並行取得します"
+        )
+        seen_ids = set()
+        total_count = 0
+        popular_count = 0
+        async for _, items in abounded_map(
+            self.search_items, queries, self.concurrency
+        ):
+            for item in items:
+                if item.get("id") in seen_ids:
+                    continue
+                seen_ids.add(item.get("id"))
+                total_count += 1
+                article = self._to_popular_article(
+                    item, start_date, end_date, min_likes, min_stocks, on_article
+                )
+                if article is not None:
+                    popular_count += 1
+                    yield article
+
+        logger.info(f"{total_count} 記事中、{popular_count} 件が条件に一致しました")
+
+    async def iter_format_articles_for_notion(
+        self,
+        articles: AsyncIterable[QiitaArticle],
+        executor: Executor,
+        workers: int = 1,
+    ) -> AsyncIterator[dict]:
+        """
+        記事をNotion用に整形する非同期ジェネレータ
+
+        要約は executor で実行するため、要約中もイベントループは
+        記事の取得やNotionへの書き込みを進められる。
+
+        Args:
+            articles (AsyncIterable): 本文を含む記事データ
+            executor (Executor): 要約を実行するエグゼキュータ
+            workers (int): 同時に要約する記事数
+
+        Yields:
+            dict: Notion用にフォーマットされた記事データ
+        """
+        loop = asyncio.get_running_loop()
+
+        async def summarize(article: QiitaArticle) -> str:
+            cached_summary = self.get_cached_summary(article)
+            if cached_summary is not None:
+                return cached_summary
+            summary, elapsed = await loop.run_in_executor(
+                executor, BaseQiitaClient._summarize_uncached, (article, None)
+            )
+            self.metrics.add_time("summarize", elapsed)
+            self.store_summary(article, summary)
+            return summary
+
+        async for article, summary in abounded_map(summarize, articles, workers):
+            yield article.to_notion_record(summary)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+模擬APIサーバーに対して daily_job 全体のスループットを計測するベンチマーク
+
+記事数ごとに新しいプロセスで daily_job を実行し、
+実行時間・リクエスト数・リクエスト/秒・最大RSSを表示する。
+
+    python benchmark.py --sizes 10 1000 10000 --latency 0.01 --notion-workers 4
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from fake_api import FakeApiServer
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10, 1000, 10000]  # 計測する人気記事の件数
+
+
+def _get_peak_rss_mb() -> float:
+    """現在のプロセスの最大RSS（MB）を取得"""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux は KB、macOS はバイト単位
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_daily_job(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    daily_job を実行して計測結果を返す（ベンチマーク用の子プロセスで実行）
+
+    Args:
+        config (dict): 接続先と daily_job の引数
+
+    Returns:
+        dict: 実行ごとの実行時間（秒）・ステージ別の所要時間と最大RSS（MB）
+    """
+    logging.basicConfig(level=config["log_level"])
+    os.environ.update(config["env"])
+
+    from metrics import RunMetrics
+    from notion import BaseNotionClient
+    from tasks import daily_job
+
+    # 模擬サーバーに対してはクライアント側のレート制御を緩めて計測する
+    BaseNotionClient.REQUESTS_PER_SECOND = config["notion_rps"]
+
+    wall_times = []
+    stages = []
+    with tempfile.TemporaryDirectory() as state_dir:
+        for _ in range(config["runs"]):
+            metrics = RunMetrics()
+            started = time.perf_counter()
+            daily_job(
+                **config["job"],
+                summary_cache_path=os.path.join(state_dir, "summary_cache.sqlite3"),
+                sync_state_path=os.path.join(state_dir, "sync_state.sqlite3"),
+                metrics=metrics,
+            )
+            wall_times.append(time.perf_counter() - started)
+            stages.append(metrics.report()["stages"])
+
+    return {
+        "wall_times": wall_times,
+        "stages": stages,
+        "peak_rss_mb": _get_peak_rss_mb(),
+    }
+
+
+def run_benchmark(
+    sizes: List[int],
+    days: int = 7,
+    runs: int = 1,
+    latency: float = 0.0,
+    qiita_error_every: int = 0,
+    notion_rate_limit: int = 0,
+    notion_rps: float = 1000.0,
+    body_length: int = 200,
+    job_options: Optional[Dict[str, Any]] = None,
+    log_level: int = logging.WARNING,
+) -> List[Dict[str, Any]]:
+    """
+    記事数ごとに daily_job を実行して計測
+
+    Args:
+        sizes (list): 人気記事の件数のリスト
+        days (int): バックフィル日数（記事はこの期間に均等に分布する）
+        runs (int): 同じ状態で続けて実行する回数（2回目以降は差分更新の計測）
+        latency (float): 模擬サーバーの1リクエストあたりの遅延（秒）
+        qiita_error_every (int): N回に1回 Qiita API が 429 を返す（0で無効）
+        notion_rate_limit (int): 模擬 Notion API の req/s 上限（0で無制限）
+        notion_rps (float): NotionClient 側のレート制御（req/s）
+        body_length (int): 記事本文の文字数（300以上で要約が実行される）
+        job_options (dict, optional): daily_job に渡す追加の引数（ワーカー数など）
+        log_level (int): 子プロセスのログレベル
+
+    Returns:
+        list: 記事数・実行ごとの計測結果
+    """
+    results = []
+    with FakeApiServer(
+        articles=0,
+        days=days,
+        body_length=body_length,
+        latency=latency,
+        qiita_error_every=qiita_error_every,
+        notion_rate_limit=notion_rate_limit,
+    ) as server:
+        for size in sizes:
+            server.reset(articles=size)
+            config = {
+                "env": {
+                    "QIITA_TOKEN": "x" * 40,
+                    "NOTION_TOKEN": "x" * 50,
+                    "NOTION_DB_ID": str(uuid.uuid4()),
+                    "QIITA_API_BASE_URL": server.qiita_base_url,
+                    "NOTION_API_BASE_URL": server.notion_base_url,
+                },
+                "notion_rps": notion_rps,
+                "runs": runs,
+                "log_level": log_level,
+                "job": {"backfill_days": days, **(job_options or {})},
+            }
+
+            # 最大RSSを記事数ごとに計測するため、毎回新しいプロセスで実行する
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                measured = executor.submit(_run_daily_job, config).result()
+
+            stats = server.stats()
+            wall_time = sum(measured["wall_times"])
+            requests_count = stats["qiita_requests"] + stats["notion_requests"]
+            result = {
+                "articles": size,
+                "wall_time": round(wall_time, 3),
+                "wall_times": [round(t, 3) for t in measured["wall_times"]],
+                "requests": requests_count,
+                "requests_per_sec": round(requests_count / wall_time, 1),
+                "peak_rss_mb": round(measured["peak_rss_mb"], 1),
+                "stages": measured["stages"],
+                "notion_pages": len(server.notion_pages(config["env"]["NOTION_DB_ID"])),
+                **stats,
+            }
+            logger.info(f"計測結果: {result}")
+            results.append(result)
+    return results
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """
+    計測結果を表形式の文字列に整形
+
+    Args:
+        results (list): run_benchmark の戻り値
+
+    Returns:
+        str: 表形式の文字列
+    """
+    columns = [
+        ("articles", "記事数"),
+        ("wall_time", "実行時間(s)"),
+        ("requests", "リクエスト数"),
+        ("requests_per_sec", "req/s"),
+        ("peak_rss_mb", "最大RSS(MB)"),
+        ("qiita_requests", "Qiita"),
+        ("notion_requests", "Notion"),
+        ("qiita_429", "Qiita 429"),
+        ("notion_429", "Notion 429"),
+        ("notion_pages", "ページ数"),
+    ]
+    lines = ["\t".join(label for _, label in columns)]
+    for result in results:
+        lines.append("\t".join(str(result[key]) for key, _ in columns))
+    return "\n".join(lines)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """コマンドライン引数をパース"""
+    parser = argparse.ArgumentParser(
+        description="模擬APIサーバーに対する daily_job のベンチマーク"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="人気記事の件数（複数指定可）",
+    )
+    parser.add_argument("--days", type=int, default=7, help="バックフィル日数")
+    parser.add_argument(
+        "--runs", type=int, default=1, help="続けて実行する回数（2回目以降は差分更新）"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="1リクエストあたりの遅延（秒）"
+    )
+    parser.add_argument(
+        "--qiita-error-every", type=int, default=0, help="N回に1回 Qiita が 429 を返す"
+    )
+    parser.add_argument(
+        "--notion-rate-limit",
+        type=int,
+        default=0,
+        help="模擬 Notion API の req/s 上限（0で無制限）",
+    )
+    parser.add_argument(
+        "--notion-rps",
+        type=float,
+        default=1000.0,
+        help="NotionClient 側のレート制御（本番は3 req/s）",
+    )
+    parser.add_argument(
+        "--body-length",
+        type=int,
+        default=200,
+        help="記事本文の文字数（300以上で要約も計測）",
+    )
+    parser.add_argument("--qiita-workers", type=int, default=1)
+    parser.add_argument("--notion-workers", type=int, default=1)
+    parser.add_argument("--summary-workers", type=int, default=1)
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="asyncio エンジンで計測",
+    )
+    parser.add_argument(
+        "--no-staged",
+        action="store_true",
+        help="取得・要約・書き込みを別スレッドで重ねずに計測",
+    )
+    parser.add_argument("--json", type=str, help="計測結果をJSONで保存するパス")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """メイン関数"""
+    args = parse_arguments()
+    logging.basicConfig(level=logging.INFO)
+
+    results = run_benchmark(
+        args.sizes,
+        days=args.days,
+        runs=args.runs,
+        latency=args.latency,
+        qiita_error_every=args.qiita_error_every,
+        notion_rate_limit=args.notion_rate_limit,
+        notion_rps=args.notion_rps,
+        body_length=args.body_length,
+        job_options={
+            "qiita_workers": args.qiita_workers,
+            "notion_workers": args.notion_workers,
+            "summary_workers": args.summary_workers,
+            "use_async": args.use_async,
+            "staged": not args.no_staged,
+        },
+    )
+    print(format_results(results))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+中断したバックフィルを再開するためのチェックポイントを担当するモジュール
+"""
+
+import dataclasses
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
+
+from utils import parse_iso_datetime
+
+# qiita（requests を含む）はジャーナルを使うときにだけ読み込む
+if TYPE_CHECKING:
+    from qiita import QiitaArticle, QiitaClient
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+class BackfillJournal:
+    """
+    SQLite によるバックフィルの進捗ジャーナル
+
+    実行単位（run_key）ごとに、対象期間・取得済みのページ・
+    要約済みの記事・Notion への書き込みが完了した記事を記録する。
+    同じ run_key で再実行すると、記録された期間で未完了の処理のみを再開する。
+    """
+
+    DEFAULT_PATH = "backfill_journal.sqlite3"
+    # 中断した実行を再開する期限（期間の終了日時の差）
+    RESUME_MAX_AGE = timedelta(days=1)
+
+    def __init__(self, run_key: str, path: str = DEFAULT_PATH) -> None:
+        """
+        初期化
+
+        Args:
+            run_key (str): 実行単位を識別するキー（日数や閾値から作成）
+            path (str): SQLite データベースファイルのパス（":memory:" も可）
+        """
+        self.run_key = run_key
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS journal_runs (
+                run_key TEXT PRIMARY KEY,
+                window_start TEXT NOT NULL,
+                window_end TEXT NOT NULL,
+                started_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS journal_queries (
+                run_key TEXT NOT NULL,
+                query TEXT NOT NULL,
+                last_page INTEGER NOT NULL,
+                done INTEGER NOT NULL,
+                PRIMARY KEY (run_key, query)
+            );
+            CREATE TABLE IF NOT EXISTS journal_articles (
+                run_key TEXT NOT NULL,
+                url TEXT NOT NULL,
+                article TEXT NOT NULL,
+                formatted TEXT,
+                written INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (run_key, url)
+            );
+            """)
+        self._conn.commit()
+
+    @staticmethod
+    def build_run_key(
+        days: int, min_likes: int, min_stocks: int, server_filter: bool
+    ) -> str:
+        """
+        バックフィルの条件から run_key を作成
+
+        検索クエリの組み立てが変わる条件（閾値による絞り込みの有無を含む）を
+        すべて含め、別の条件で中断した実行のページ位置を引き継がないようにする。
+
+        Args:
+            days (int): バックフィルの日数
+            min_likes (int): 最低いいね数
+            min_stocks (int): 最低ストック数
+            server_filter (bool): いいね数・ストック数の条件を検索クエリに含めるか
+
+        Returns:
+            str: run_key
+        """
+        return (
+            f"days={days}:likes={min_likes}:stocks={min_stocks}"
+            f":server_filter={int(server_filter)}"
+        )
+
+    def start(
+        self, start_date: datetime, end_date: datetime
+    ) -> Tuple[datetime, datetime]:
+        """
+        実行を開始し、対象期間を確定
+
+        未完了の同じ実行が記録されている場合は、その期間を引き継いで再開する。
+        記録された期間の終了日時が今回より RESUME_MAX_AGE 以上前の場合は、
+        古い実行として記録を破棄し、今回の期間で新たに実行する。
+
+        Args:
+            start_date (datetime): 今回算出した期間の開始日時
+            end_date (datetime): 今回算出した期間の終了日時
+
+        Returns:
+            tuple: (開始日時, 終了日時)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT window_start, window_end FROM journal_runs WHERE run_key = ?",
+                (self.run_key,),
+            ).fetchone()
+            if row is not None and (
+                end_date - parse_iso_datetime(row[1]) >= self.RESUME_MAX_AGE
+            ):
+                logger.info(
+                    f"中断したバックフィル（{row[0]} 〜 {row[1]}）は古いため破棄し、新しい期間で実行します"
+                )
+                self._delete_run()
+                row = None
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO journal_runs (run_key, window_start, window_end, started_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (
+                        self.run_key,
+                        start_date.isoformat(),
+                        end_date.isoformat(),
+                        time.time(),
+                    ),
+                )
+                self._conn.commit()
+                return start_date, end_date
+
+        resumed = parse_iso_datetime(row[0]), parse_iso_datetime(row[1])
+        logger.info(
+            f"中断したバックフィルを再開します: {resumed[0].isoformat()} 〜 {resumed[1].isoformat()}"
+        )
+        return resumed
+
+    def get_query_progress(self, query: str) -> Tuple[int, bool]:
+        """
+        検索クエリの取得状況を取得
+
+        Args:
+            query (str): 検索クエリ
+
+        Returns:
+            tuple: (取得済みの最終ページ番号, 全ページ取得済みか)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_page, done FROM journal_queries WHERE run_key = ? AND query = ?",
+                (self.run_key, query),
+            ).fetchone()
+        if row is None:
+            return 0, False
+        return row[0], bool(row[1])
+
+    def record_page(
+        self, query: str, page: int, done: bool, articles: List["QiitaArticle"]
+    ) -> List["QiitaArticle"]:
+        """
+        取得したページの人気記事と取得状況を1トランザクションで記録
+
+        Args:
+            query (str): 検索クエリ
+            page (int): 取得したページ番号
+            done (bool): このページでクエリの全ページを取得し終えたか
+            articles (list): ページ内の条件を満たす記事（本文を含む）
+
+        Returns:
+            list: 今回初めて記録された記事（他のクエリで取得済みの記事を除く）
+        """
+        new_articles = []
+        with self._lock:
+            for article in articles:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO journal_articles (run_key, url, article)"
+                    " VALUES (?, ?, ?)",
+                    (
+                        self.run_key,
+                        article.url,
+                        json.dumps(dataclasses.asdict(article), ensure_ascii=False),
+                    ),
+                )
+                if cursor.rowcount:
+                    new_articles.append(article)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO journal_queries (run_key, query, last_page, done)"
+                " VALUES (?, ?, ?, ?)",
+                (self.run_key, query, page, int(done)),
+            )
+            self._conn.commit()
+        return new_articles
+
+    def record_formatted(self, formatted: dict) -> None:
+        """
+        要約済み（Notion用に整形済み）の記事を記録
+
+        Args:
+            formatted (dict): Notion用にフォーマットされた記事データ
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE journal_articles SET formatted = ? WHERE run_key = ? AND url = ?",
+                (
+                    json.dumps(formatted, ensure_ascii=False),
+                    self.run_key,
+                    formatted["url"],
+                ),
+            )
+            self._conn.commit()
+
+    def mark_written(self, url: str) -> None:
+        """
+        Notion への書き込みが完了した記事を記録
+
+        Args:
+            url (str): 記事のURL
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE journal_articles SET written = 1 WHERE run_key = ? AND url = ?",
+                (self.run_key, url),
+            )
+            self._conn.commit()
+
+    def iter_record_formatted(
+        self, formatted_articles: Iterable[dict]
+    ) -> Iterator[dict]:
+        """
+        要約済みの記事を記録しながらそのまま返すジェネレータ
+
+        Args:
+            formatted_articles (iterable): Notion用にフォーマットされた記事データ
+
+        Yields:
+            dict: 記録済みの記事データ
+        """
+        for formatted in formatted_articles:
+            self.record_formatted(formatted)
+            yield formatted
+
+    def on_result(
+        self, article: dict, success: bool, is_new: bool, page_id: Optional[str]
+    ) -> None:
+        """
+        書き込みが成功した記事を記録（bulk_upsert_articles の on_result コールバック用）
+
+        Args:
+            article (dict): Notion用にフォーマットされた記事データ
+            success (bool): 書き込みに成功したか
+            is_new (bool): 新規作成されたか
+            page_id (str, optional): 書き込み先のページID
+        """
+        if success:
+            self.mark_written(article["url"])
+
+    def pending_articles(self) -> List["QiitaArticle"]:
+        """
+        取得済みだが要約が完了していない記事を取得
+
+        Returns:
+            list: 本文を含む記事のリスト
+        """
+        from qiita import QiitaArticle
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT article FROM journal_articles"
+                " WHERE run_key = ? AND formatted IS NULL AND written = 0",
+                (self.run_key,),
+            ).fetchall()
+        articles = []
+        for (data,) in rows:
+            fields = json.loads(data)
+            fields["tags"] = tuple(fields["tags"])
+            articles.append(QiitaArticle(**fields))
+        return articles
+
+    def pending_formatted(self) -> List[dict]:
+        """
+        要約済みだが Notion への書き込みが完了していない記事を取得
+
+        Returns:
+            list: Notion用にフォーマットされた記事データのリスト
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT formatted FROM journal_articles"
+                " WHERE run_key = ? AND formatted IS NOT NULL AND written = 0",
+                (self.run_key,),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def finish(self) -> None:
+        """実行が完了したため、この実行の記録を削除"""
+        with self._lock:
+            self._delete_run()
+        logger.info("バックフィルが完了したため、チェックポイントを削除しました")
+
+    def _delete_run(self) -> None:
+        """この実行の記録を削除（呼び出し側でロックを取得すること）"""
+        for table in ("journal_runs", "journal_queries", "journal_articles"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE run_key = ?", (self.run_key,)
+            )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+
+    def iter_popular_articles(
+        self,
+        qiita_client: "QiitaClient",
+        queries: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        min_likes: int,
+        min_stocks: int,
+    ) -> Iterator["QiitaArticle"]:
+        """
+        ジャーナルに記録しながら人気記事を取得するジェネレータ
+
+        前回の実行で取得済みだが要約が終わっていない記事を先に返し、
+        続いて未完了のクエリを記録済みの次のページから取得する。
+        取得エラーは打ち切らずに送出するため、再実行時は同じページから再開される。
+
+        Args:
+            qiita_client (QiitaClient): Qiita API クライアント
+            queries (list): 検索クエリのリスト
+            start_date (datetime): 期間の開始日時
+            end_date (datetime): 期間の終了日時
+            min_likes (int): 最低いいね数（LGTM or Stock）
+            min_stocks (int): 最低ストック数（LGTM or Stock）
+
+        Yields:
+            QiitaArticle: 条件を満たす記事（本文を含む）
+        """
+        from qiita import QiitaArticle
+
+        pending = self.pending_articles()
+        if pending:
+            logger.info(f"前回取得済みの {len(pending)} 件の記事から再開します")
+        yield from pending
+
+        for query in queries:
+            last_page, done = self.get_query_progress(query)
+            if done:
+                logger.debug(f"{query}: 取得済みのためスキップします")
+                continue
+
+            page = last_page
+            pages = qiita_client.iter_search_pages(
+                query, start_page=last_page + 1, raise_errors=True
+            )
+            for results in pages:
+                page += 1
+                popular = []
+                for item in results:
+                    article = QiitaArticle.from_item(item)
+                    if qiita_client.is_popular_article(
+                        article, start_date, end_date, min_likes, min_stocks
+                    ):
+                        article.body = item.get("body", "")
+                        popular.append(article)
+
+                done = (
+                    len(results) < qiita_client.PER_PAGE
+                    or page >= qiita_client.MAX_PAGE
+                )
+                yield from self.record_page(query, page, done, popular)
+
+            if not done:
+                # 最終ページがちょうど PER_PAGE 件だった場合など、空ページで終了したケース
+                self.record_page(query, page, True, [])
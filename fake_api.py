@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Qiita / Notion API のローカル模擬サーバーを提供するモジュール
+
+ベンチマークやテストで実際の API を呼ばずに daily_job 全体を実行するために使う。
+Qiita 側は合成した記事を検索クエリで絞り込んで返し、Rate-* ヘッダと 429 を再現する。
+Notion 側は databases.retrieve / update / query と pages.create / update を
+メモリ上のデータベースで再現する。
+"""
+
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from notion import NotionClient
+from utils import get_jst_now
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+class FakeApiServer:
+    """
+    Qiita / Notion API の模擬サーバー
+
+    1つのポートで両方の API を提供する。
+    Qiita のベースURLは qiita_base_url、Notion のベースURLは notion_base_url を参照する。
+    """
+
+    QIITA_PREFIX = "/api/v2"
+    NOTION_PREFIX = "/v1"
+    QUALIFIER_PATTERN = re.compile(r"(created|likes|stocks):(>=|<=|>|<)?(\S+)")
+
+    def __init__(
+        self,
+        articles: int = 10,
+        days: int = 7,
+        noise: int = 1,
+        body_length: int = 200,
+        latency: float = 0.0,
+        qiita_rate_limit: int = 1000,
+        qiita_rate_window: float = 3600.0,
+        qiita_error_every: int = 0,
+        notion_rate_limit: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            articles (int): 生成する人気記事（いいね数またはストック数が500以上）の件数
+            days (int): 記事の作成日時を分布させる日数（現在から遡る）
+            noise (int): 人気記事1件あたりに生成する条件を満たさない記事の件数
+            body_length (int): 記事本文の文字数（300未満の場合は要約されない）
+            latency (float): 1リクエストあたりに加える遅延（秒）
+            qiita_rate_limit (int): Qiita API の時間窓あたりのリクエスト上限
+            qiita_rate_window (float): Qiita API のレート制限の時間窓（秒）
+            qiita_error_every (int): N回に1回 Qiita API が 429 を返す（0で無効）
+            notion_rate_limit (int): Notion API の1秒あたりのリクエスト上限（0で無制限）
+            host (str): 待ち受けるホスト
+            port (int): 待ち受けるポート（0で空いているポートを使う）
+        """
+        self.latency = latency
+        self.qiita_rate_limit = qiita_rate_limit
+        self.qiita_rate_window = qiita_rate_window
+        self.qiita_error_every = qiita_error_every
+        self.notion_rate_limit = notion_rate_limit
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _FakeApiHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+        self.reset(articles, days, noise, body_length)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def qiita_base_url(self) -> str:
+        return f"{self.base_url}{self.QIITA_PREFIX}"
+
+    @property
+    def notion_base_url(self) -> str:
+        return self.base_url
+
+    def reset(
+        self,
+        articles: Optional[int] = None,
+        days: Optional[int] = None,
+        noise: Optional[int] = None,
+        body_length: Optional[int] = None,
+    ) -> None:
+        """
+        記事・Notion データベース・カウンタを初期化
+
+        Args:
+            articles (int, optional): 生成する人気記事の件数（未指定時は前回と同じ）
+            days (int, optional): 記事の作成日時を分布させる日数
+            noise (int, optional): 人気記事1件あたりの条件を満たさない記事の件数
+            body_length (int, optional): 記事本文の文字数
+        """
+        with self._lock:
+            if articles is not None:
+                self.articles = articles
+            if days is not None:
+                self.days = days
+            if noise is not None:
+                self.noise = noise
+            if body_length is not None:
+                self.body_length = body_length
+            self._items = self._generate_items()
+            self._items_by_id = {item["id"]: item for item in self._items}
+            self._databases: Dict[str, Dict[str, Any]] = {}
+            self._qiita_window_start = time.time()
+            self._qiita_window_count = 0
+            self._notion_timestamps: List[float] = []
+            self.counters = {
+                "qiita_requests": 0,
+                "qiita_429": 0,
+                "notion_requests": 0,
+                "notion_429": 0,
+                "pages_created": 0,
+                "pages_updated": 0,
+            }
+
+    def _generate_items(self) -> List[dict]:
+        """作成日時の新しい順に並んだ合成記事を生成"""
+        total = self.articles * (1 + self.noise)
+        if total == 0:
+            return []
+        now = get_jst_now()
+        interval = timedelta(days=self.days) / total
+        body = ("これは模擬記事の本文です。" * (self.body_length // 13 + 1))[
+            : self.body_length
+        ]
+
+        items = []
+        for i in range(total):
+            popular = i % (1 + self.noise) == 0
+            # いいね数とストック数のどちらか一方だけが閾値を超える記事を交互に作る
+            high, low = (
+                (500 + i % 1000, 10 + i % 400) if popular else (i % 400, i % 300)
+            )
+            likes, stocks = (
+                (high, low) if i // (1 + self.noise) % 2 == 0 else (low, high)
+            )
+            item_id = f"{i:020x}"
+            user_id = f"user{i % 97}"
+            items.append(
+                {
+                    "id": item_id,
+                    "title": f"模擬記事 {i}",
+                    "url": f"https://qiita.com/{user_id}/items/{item_id}",
+                    "user": {"id": user_id, "name": f"ユーザー{i % 97}"},
+                    "likes_count": likes,
+                    "stocks_count": stocks,
+                    "tags": [{"name": "Python"}, {"name": f"tag{i % 20}"}],
+                    "created_at": (now - interval * (i + 0.5)).isoformat(),
+                    "body": body,
+                }
+            )
+        return items
+
+    def stats(self) -> Dict[str, int]:
+        """
+        リクエスト数などのカウンタを取得
+
+        Returns:
+            dict: カウンタ名をキーとする辞書
+        """
+        with self._lock:
+            return dict(self.counters)
+
+    def notion_pages(self, database_id: str) -> List[dict]:
+        """
+        Notion データベースに作成されたページを取得
+
+        Args:
+            database_id (str): データベースID
+
+        Returns:
+            list: 作成順のページのリスト
+        """
+        with self._lock:
+            database = self._databases.get(database_id)
+            return list(database["pages"].values()) if database else []
+
+    def start(self) -> "FakeApiServer":
+        """バックグラウンドのスレッドでリクエストの受付を開始"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"模擬APIサーバーを起動しました: {self.base_url}")
+        return self
+
+    def serve_forever(self) -> None:
+        """現在のスレッドでリクエストを受け付け続ける（Ctrl+C で停止）"""
+        logger.info(f"模擬APIサーバーを起動しました: {self.base_url}")
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        """リクエストの受付を停止してソケットを閉じる"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeApiServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # ---- Qiita API ----
+
+    def _match_query(self, item: dict, query: str) -> bool:
+        """記事が検索クエリ（created / likes / stocks の修飾子のみ対応）に一致するか判定"""
+        fields = {
+            "created": item["created_at"][:10],
+            "likes": item["likes_count"],
+            "stocks": item["stocks_count"],
+        }
+        for name, op, value in self.QUALIFIER_PATTERN.findall(query):
+            actual = fields[name]
+            expected = value if name == "created" else int(value)
+            if op == ">=" and not actual >= expected:
+                return False
+            if op == "<=" and not actual <= expected:
+                return False
+            if op == ">" and not actual > expected:
+                return False
+            if op == "<" and not actual < expected:
+                return False
+            if not op and actual != expected:
+                return False
+        return True
+
+    def _check_qiita_rate(self) -> Tuple[Optional[Dict[str, str]], Dict[str, str]]:
+        """
+        Qiita のレート制限を判定
+
+        Returns:
+            tuple: (429 を返す場合のヘッダ、または None, 応答に付ける Rate-* ヘッダ)
+        """
+        now = time.time()
+        with self._lock:
+            self.counters["qiita_requests"] += 1
+            if now - self._qiita_window_start >= self.qiita_rate_window:
+                self._qiita_window_start = now
+                self._qiita_window_count = 0
+            reset = self._qiita_window_start + self.qiita_rate_window
+            rate_headers = {
+                "Rate-Limit": str(self.qiita_rate_limit),
+                "Rate-Reset": str(int(reset)),
+            }
+
+            if (
+                self.qiita_error_every
+                and self.counters["qiita_requests"] % self.qiita_error_every == 0
+            ):
+                self.counters["qiita_429"] += 1
+                remaining = self.qiita_rate_limit - self._qiita_window_count
+                rate_headers["Rate-Remaining"] = str(remaining)
+                return {"Retry-After": "0", **rate_headers}, rate_headers
+
+            if self._qiita_window_count >= self.qiita_rate_limit:
+                self.counters["qiita_429"] += 1
+                rate_headers["Rate-Remaining"] = "0"
+                return rate_headers, rate_headers
+
+            self._qiita_window_count += 1
+            remaining = self.qiita_rate_limit - self._qiita_window_count
+            rate_headers["Rate-Remaining"] = str(remaining)
+            return None, rate_headers
+
+    def handle_qiita(self, path: str, params: Dict[str, str]) -> Tuple[int, Any, dict]:
+        """
+        Qiita API のリクエストを処理
+
+        Args:
+            path (str): /api/v2 以降のパス
+            params (dict): クエリパラメータ
+
+        Returns:
+            tuple: (ステータスコード, 応答本文, ヘッダ)
+        """
+        error_headers, rate_headers = self._check_qiita_rate()
+        if error_headers is not None:
+            return (
+                429,
+                {"message": "Rate limit exceeded", "type": "rate_limit_exceeded"},
+                error_headers,
+            )
+
+        if path == "/items":
+            query = params.get("query", "")
+            page = int(params.get("page", 1))
+            per_page = int(params.get("per_page", 20))
+            if not 1 <= page <= 100 or not 1 <= per_page <= 100:
+                return (
+                    400,
+                    {"message": "Bad request", "type": "bad_request"},
+                    rate_headers,
+                )
+            matched = [item for item in self._items if self._match_query(item, query)]
+            offset = (page - 1) * per_page
+            return (
+                200,
+                matched[offset : offset + per_page],
+                {
+                    "Total-Count": str(len(matched)),
+                    **rate_headers,
+                },
+            )
+
+        if path.startswith("/items/"):
+            item = self._items_by_id.get(path[len("/items/") :])
+            if item is None:
+                return 404, {"message": "Not found", "type": "not_found"}, rate_headers
+            return 200, item, rate_headers
+
+        return 404, {"message": "Not found", "type": "not_found"}, rate_headers
+
+    # ---- Notion API ----
+
+    @staticmethod
+    def _notion_error(status: int, code: str, message: str) -> dict:
+        return {"object": "error", "status": status, "code": code, "message": message}
+
+    def _check_notion_rate(self) -> bool:
+        """Notion のレート制限（直近1秒のリクエスト数）を超えているか判定"""
+        now = time.monotonic()
+        with self._lock:
+            self.counters["notion_requests"] += 1
+            if not self.notion_rate_limit:
+                return False
+            self._notion_timestamps = [
+                t for t in self._notion_timestamps if now - t < 1.0
+            ]
+            if len(self._notion_timestamps) >= self.notion_rate_limit:
+                self.counters["notion_429"] += 1
+                return True
+            self._notion_timestamps.append(now)
+            return False
+
+    @staticmethod
+    def _validate_properties(
+        properties: Dict[str, Any], schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Notion のサイズ制限（テキスト2000文字・配列100要素・選択肢名100文字）を検証
+
+        schema を指定した場合は、データベースに存在しないプロパティや
+        型の異なるプロパティも Notion と同じメッセージで拒否する。
+        """
+        for name, value in properties.items():
+            if value is None:
+                continue
+            if schema is not None:
+                if name not in schema:
+                    return f"{name} is not a property that exists."
+                expected = schema[name]["type"]
+                if expected not in value:
+                    return f"{name} is expected to be {expected}."
+            for key in ("title", "rich_text", "multi_select"):
+                items = value.get(key) or []
+                if len(items) > 100:
+                    return f"body.properties.{name}.{key}.length should be ≤ 100"
+                for item in items:
+                    text = item.get("name") if key == "multi_select" else None
+                    if text is not None and (len(text) > 100 or "," in text):
+                        return f"body.properties.{name}.{key}.name is invalid"
+                    content = (item.get("text") or {}).get("content", "")
+                    if len(content) > 2000:
+                        return f"body.properties.{name}.{key}.text.content.length should be ≤ 2000"
+        return None
+
+    def _get_database(self, database_id: str) -> Dict[str, Any]:
+        """データベースを取得（初回アクセス時に必要なプロパティを揃えて作成）"""
+        if database_id not in self._databases:
+            self._databases[database_id] = {
+                "properties": {
+                    name: {"id": name, "name": name, "type": info["type"]}
+                    for name, info in NotionClient.REQUIRED_PROPERTIES.items()
+                },
+                "pages": {},
+            }
+        return self._databases[database_id]
+
+    @staticmethod
+    def _match_filter(page: dict, notion_filter: Optional[dict]) -> bool:
+        """ページがフィルタ（url の equals と date の on_or_after のみ対応）に一致するか判定"""
+        if not notion_filter:
+            return True
+        prop = page["properties"].get(notion_filter["property"], {})
+        if "url" in notion_filter:
+            return prop.get("url") == notion_filter["url"]["equals"]
+        if "date" in notion_filter:
+            start = (prop.get("date") or {}).get("start")
+            return (
+                bool(start) and start[:10] >= notion_filter["date"]["on_or_after"][:10]
+            )
+        return True
+
+    def handle_notion(
+        self, method: str, path: str, body: Optional[dict]
+    ) -> Tuple[int, Any, dict]:
+        """
+        Notion API のリクエストを処理
+
+        Args:
+            method (str): HTTPメソッド
+            path (str): /v1 以降のパス
+            body (dict, optional): リクエスト本文
+
+        Returns:
+            tuple: (ステータスコード, 応答本文, ヘッダ)
+        """
+        if self._check_notion_rate():
+            return (
+                429,
+                self._notion_error(429, "rate_limited", "Rate limited"),
+                {"Retry-After": "1"},
+            )
+
+        body = body or {}
+        parts = path.strip("/").split("/")
+        with self._lock:
+            if parts[0] == "databases" and len(parts) >= 2:
+                database = self._get_database(parts[1])
+                if len(parts) == 2 and method == "GET":
+                    return (
+                        200,
+                        {
+                            "object": "database",
+                            "id": parts[1],
+                            "properties": database["properties"],
+                        },
+                        {},
+                    )
+                if len(parts) == 2 and method == "PATCH":
+                    error = self._validate_properties(body.get("properties", {}))
+                    if error:
+                        return (
+                            400,
+                            self._notion_error(400, "validation_error", error),
+                            {},
+                        )
+                    for name, prop in body.get("properties", {}).items():
+                        if prop is None:
+                            # Notion と同様に null を指定したプロパティは削除する
+                            database["properties"].pop(name, None)
+                            continue
+                        database["properties"][name] = {
+                            "id": name,
+                            "name": name,
+                            "type": next(iter(prop)),
+                        }
+                    return (
+                        200,
+                        {
+                            "object": "database",
+                            "id": parts[1],
+                            "properties": database["properties"],
+                        },
+                        {},
+                    )
+                if len(parts) == 3 and parts[2] == "query" and method == "POST":
+                    pages = [
+                        page
+                        for page in database["pages"].values()
+                        if self._match_filter(page, body.get("filter"))
+                    ]
+                    offset = int(body.get("start_cursor") or 0)
+                    page_size = min(int(body.get("page_size", 100)), 100)
+                    results = pages[offset : offset + page_size]
+                    has_more = offset + page_size < len(pages)
+                    return (
+                        200,
+                        {
+                            "object": "list",
+                            "results": results,
+                            "has_more": has_more,
+                            "next_cursor": (
+                                str(offset + page_size) if has_more else None
+                            ),
+                        },
+                        {},
+                    )
+
+            if parts[0] == "pages":
+                if len(parts) == 1 and method == "POST":
+                    database_id = body.get("parent", {}).get("database_id")
+                    if not database_id:
+                        return (
+                            400,
+                            self._notion_error(
+                                400,
+                                "validation_error",
+                                "parent.database_id is required",
+                            ),
+                            {},
+                        )
+                    database = self._get_database(database_id)
+                    error = self._validate_properties(
+                        body.get("properties", {}), database["properties"]
+                    )
+                    if error:
+                        return (
+                            400,
+                            self._notion_error(400, "validation_error", error),
+                            {},
+                        )
+                    page = {
+                        "object": "page",
+                        "id": str(uuid.uuid4()),
+                        "properties": body.get("properties", {}),
+                    }
+                    database["pages"][page["id"]] = page
+                    self.counters["pages_created"] += 1
+                    return 200, page, {}
+                if len(parts) == 2 and method == "PATCH":
+                    for database in self._databases.values():
+                        page = database["pages"].get(parts[1])
+                        if page is not None:
+                            error = self._validate_properties(
+                                body.get("properties", {}), database["properties"]
+                            )
+                            if error:
+                                return (
+                                    400,
+                                    self._notion_error(400, "validation_error", error),
+                                    {},
+                                )
+                            page["properties"].update(body.get("properties", {}))
+                            self.counters["pages_updated"] += 1
+                            return 200, page, {}
+                    return (
+                        404,
+                        self._notion_error(
+                            404, "object_not_found", "Could not find page"
+                        ),
+                        {},
+                    )
+
+        return (
+            400,
+            self._notion_error(
+                400, "invalid_request_url", f"Invalid request URL: {method} {path}"
+            ),
+            {},
+        )
+
+
+class _FakeApiHandler(BaseHTTPRequestHandler):
+    """FakeApiServer にリクエストを振り分けるハンドラ"""
+
+    protocol_version = "HTTP/1.1"  # Keep-Alive で接続を再利用できるようにする
+    disable_nagle_algorithm = True  # ヘッダと本文の分割送信による遅延を避ける
+
+    def _dispatch(self) -> None:
+        fake: FakeApiServer = self.server.fake
+        if fake.latency:
+            time.sleep(fake.latency)
+
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+
+        if url.path.startswith(fake.QIITA_PREFIX):
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            status, payload, headers = fake.handle_qiita(
+                url.path[len(fake.QIITA_PREFIX) :], params
+            )
+        elif url.path.startswith(fake.NOTION_PREFIX):
+            body = json.loads(raw_body) if raw_body else None
+            status, payload, headers = fake.handle_notion(
+                self.command, url.path[len(fake.NOTION_PREFIX) :], body
+            )
+        else:
+            status, payload, headers = 404, {"message": "Not found"}, {}
+
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+    do_PATCH = _dispatch
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def main() -> None:
+    """模擬サーバーを単体で起動（手動での動作確認用）"""
+    parser = argparse.ArgumentParser(description="Qiita / Notion API の模擬サーバー")
+    parser.add_argument("--port", type=int, default=8080, help="待ち受けるポート")
+    parser.add_argument("--articles", type=int, default=100, help="人気記事の件数")
+    parser.add_argument("--days", type=int, default=7, help="記事を分布させる日数")
+    parser.add_argument("--latency", type=float, default=0.0, help="応答遅延（秒）")
+    parser.add_argument(
+        "--qiita-error-every", type=int, default=0, help="N回に1回 429 を返す"
+    )
+    parser.add_argument(
+        "--notion-rate-limit", type=int, default=0, help="Notion の req/s 上限"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = FakeApiServer(
+        articles=args.articles,
+        days=args.days,
+        latency=args.latency,
+        qiita_error_every=args.qiita_error_every,
+        notion_rate_limit=args.notion_rate_limit,
+        port=args.port,
+    )
+    print(f"QIITA_API_BASE_URL={server.qiita_base_url}")
+    print(f"NOTION_API_BASE_URL={server.notion_base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
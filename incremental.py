@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+前回実行からの差分のみを取得する差分同期を担当するモジュール
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Set, Tuple
+
+from qiita import QiitaArticle, QiitaClient
+from sync_state import SyncStateStore
+from utils import get_jst_now, parse_iso_datetime
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+class IncrementalSync:
+    """
+    最終処理日時（ハイウォーターマーク）に基づく差分同期
+
+    前回までに処理した記事の最新の作成日時を記録し、次回は
+    その日時から OVERLAP だけ遡った時点以降の記事のみを検索する。
+    閾値に届かなかったが NEAR_THRESHOLD_RATIO 以上の記事は再確認リストに登録し、
+    次回以降は記事単位の取得でいいね数・ストック数のみを確認する。
+    取得時に NEAR_THRESHOLD_RATIO に届かず、後から伸びた記事も取りこぼさないよう、
+    FULL_SCAN_INTERVAL ごとに期間全体を検索し直す。
+    """
+
+    HIGH_WATER_KEY = "qiita_high_water_mark"  # 閾値ごとに別のキーで保存する
+    OVERLAP = timedelta(hours=6)  # 取りこぼしを防ぐため前回位置から遡る時間
+    NEAR_THRESHOLD_RATIO = 0.5  # 閾値のこの割合以上の記事を再確認対象にする
+    FULL_SCAN_KEY = "qiita_full_scan_at"  # 閾値ごとに別のキーで保存する
+    FULL_SCAN_INTERVAL = timedelta(days=1)  # 期間全体を検索し直す間隔
+    # 定時実行の開始時刻のずれで全体検索が1日おきにならないよう、間隔から差し引く余裕
+    FULL_SCAN_MARGIN = timedelta(hours=1)
+
+    def __init__(
+        self, store: SyncStateStore, min_likes: int = 500, min_stocks: int = 500
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            store (SyncStateStore): ハイウォーターマークと再確認リストの保存先
+            min_likes (int): 最低いいね数（LGTM or Stock）
+            min_stocks (int): 最低ストック数（LGTM or Stock）
+        """
+        self.store = store
+        self.min_likes = min_likes
+        self.min_stocks = min_stocks
+        # 閾値を変更した場合は過去の記事も対象になり得るため、全期間を検索し直す
+        self.high_water_key = f"{self.HIGH_WATER_KEY}:{min_likes}:{min_stocks}"
+        self.full_scan_key = f"{self.FULL_SCAN_KEY}:{min_likes}:{min_stocks}"
+        self.is_full_scan = False
+        self._started_at: Optional[datetime] = None
+        self._seen_ids: Set[str] = set()
+        self._watched_ids: Set[str] = {article_id for article_id, _ in store.watched()}
+        self._max_created_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def get_fetch_from(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        今回の検索開始日時を取得
+
+        Args:
+            now (datetime, optional): 現在日時（省略時は日本時間の現在日時）
+
+        Returns:
+            datetime or None: 前回のハイウォーターマークから OVERLAP だけ遡った日時、
+                未記録の場合や前回の全体検索から FULL_SCAN_INTERVAL（FULL_SCAN_MARGIN
+                の余裕を含む）以上経った場合は None（期間全体を検索）
+        """
+        self._started_at = now or get_jst_now()
+        high_water_mark = self.store.get_value(self.high_water_key)
+        last_full_scan = self.store.get_value(self.full_scan_key)
+        if not high_water_mark or not last_full_scan:
+            self.is_full_scan = True
+            return None
+        elapsed = self._started_at - parse_iso_datetime(last_full_scan)
+        if elapsed >= self.FULL_SCAN_INTERVAL - self.FULL_SCAN_MARGIN:
+            logger.info(
+                "差分同期: 前回の全体検索から時間が経ったため、期間全体を検索します"
+            )
+            self.is_full_scan = True
+            return None
+        fetch_from = parse_iso_datetime(high_water_mark) - self.OVERLAP
+        logger.info(f"差分同期: {fetch_from.isoformat()} 以降の記事を取得します")
+        return fetch_from
+
+    def get_search_thresholds(self) -> Tuple[int, int]:
+        """
+        検索クエリで絞り込む (いいね数, ストック数) を取得
+
+        再確認リストに登録する閾値付近の記事も取得できるよう、
+        閾値に NEAR_THRESHOLD_RATIO を掛けた値で絞り込む。
+
+        Returns:
+            tuple: (いいね数, ストック数)
+        """
+        return (
+            int(self.min_likes * self.NEAR_THRESHOLD_RATIO),
+            int(self.min_stocks * self.NEAR_THRESHOLD_RATIO),
+        )
+
+    def _is_near_threshold(self, article: QiitaArticle) -> bool:
+        """閾値付近（閾値未満かつ NEAR_THRESHOLD_RATIO 以上）の記事か判定"""
+        if article.likes >= self.min_likes or article.stocks >= self.min_stocks:
+            return False
+        return (
+            article.likes >= self.min_likes * self.NEAR_THRESHOLD_RATIO
+            or article.stocks >= self.min_stocks * self.NEAR_THRESHOLD_RATIO
+        )
+
+    def observe(self, article: QiitaArticle) -> None:
+        """
+        取得した記事を記録（QiitaClient の on_article コールバック用）
+
+        ハイウォーターマーク候補を更新し、閾値付近の記事を再確認リストに登録する。
+
+        Args:
+            article (QiitaArticle): 取得した記事
+        """
+        created_at = parse_iso_datetime(article.created_at)
+        is_near_threshold = self._is_near_threshold(article)
+        with self._lock:
+            self._seen_ids.add(article.id)
+            if self._max_created_at is None or created_at > self._max_created_at:
+                self._max_created_at = created_at
+
+            # 再確認リストへの書き込みは登録状態が変わる記事に限る
+            if is_near_threshold and article.id not in self._watched_ids:
+                self._watched_ids.add(article.id)
+                self.store.watch(article.id, article.created_at)
+            elif not is_near_threshold and article.id in self._watched_ids:
+                self._watched_ids.discard(article.id)
+                self.store.unwatch(article.id)
+
+    def iter_refreshed(
+        self, qiita_client: QiitaClient, start_date: datetime, end_date: datetime
+    ) -> Iterator[QiitaArticle]:
+        """
+        再確認リストの記事のうち、条件を満たすようになった記事を返すジェネレータ
+
+        期間外になった記事はリストから削除し、今回の検索ですでに取得した記事は除く。
+
+        Args:
+            qiita_client (QiitaClient): Qiita API クライアント
+            start_date (datetime): 期間の開始日時
+            end_date (datetime): 期間の終了日時
+
+        Yields:
+            QiitaArticle: 条件を満たすようになった記事
+        """
+        item_ids = []
+        for article_id, created_at in self.store.watched():
+            if parse_iso_datetime(created_at) < start_date:
+                self._watched_ids.discard(article_id)
+                self.store.unwatch(article_id)
+            elif article_id not in self._seen_ids:
+                item_ids.append(article_id)
+
+        if not item_ids:
+            return
+
+        logger.info(f"閾値付近の {len(item_ids)} 件の記事を再確認します")
+        yield from qiita_client.iter_refreshed_articles(
+            item_ids,
+            start_date,
+            end_date,
+            min_likes=self.min_likes,
+            min_stocks=self.min_stocks,
+            on_article=self.observe,
+        )
+
+    def commit(self) -> None:
+        """
+        今回取得した記事の最新の作成日時をハイウォーターマークとして保存
+
+        期間全体を検索した場合は、その日時も次回の全体検索の判定用に保存する。
+        """
+        if self.is_full_scan:
+            self.store.set_value(self.full_scan_key, self._started_at.isoformat())
+        if self._max_created_at is None:
+            return
+        previous = self.store.get_value(self.high_water_key)
+        if previous and parse_iso_datetime(previous) >= self._max_created_at:
+            return
+        self.store.set_value(self.high_water_key, self._max_created_at.isoformat())
+        logger.info(
+            f"差分同期のハイウォーターマークを更新しました: {self._max_created_at.isoformat()}"
+        )
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ログ出力の設定を担当するモジュール
+
+ログはキュー（QueueHandler）に積むだけで呼び出し元に戻り、ファイルへの書き込みと
+ローテーションはバックグラウンドの QueueListener のスレッドで行う。
+各行には実行ごとの相関ID（run_id）を付与する。
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+LOG_FILE = "app.log"  # 既定のログファイル
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(run_id)s] %(message)s"
+MAX_BYTES = 10 * 1024 * 1024  # サイズによるローテーションの閾値（バイト）
+BACKUP_COUNT = 5  # 保持する過去のログファイル数
+NO_RUN_ID = "-"  # ジョブ実行中でないときの run_id
+
+# 実行中のジョブの run_id。ワーカースレッドのログにも付与できるよう、
+# コンテキスト変数ではなくプロセス全体で共有する（ジョブは同時に1つだけ実行される）
+_current_run_id = NO_RUN_ID
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RunIdFilter(logging.Filter):
+    """ログレコードに実行中のジョブの run_id を付与するフィルタ"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "run_id"):
+            record.run_id = _current_run_id
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    ログレコードを1行1件の JSON に変換するフォーマッタ
+
+    例外のトレースバックは QueueHandler がメッセージに含めてからキューに積む。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).astimezone().isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": getattr(record, "run_id", NO_RUN_ID),
+            "message": record.getMessage(),
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def get_run_id() -> str:
+    """実行中のジョブの run_id を取得"""
+    return _current_run_id
+
+
+@contextmanager
+def run_id_context(run_id: str) -> Iterator[None]:
+    """
+    ブロック内のログに run_id を付与するコンテキストマネージャ
+
+    Args:
+        run_id (str): 実行を識別するID（RunMetrics.run_id など）
+    """
+    global _current_run_id
+    previous = _current_run_id
+    _current_run_id = run_id
+    try:
+        yield
+    finally:
+        _current_run_id = previous
+
+
+def setup_logging(
+    log_file: Optional[str] = LOG_FILE,
+    level: int = logging.INFO,
+    max_bytes: int = MAX_BYTES,
+    backup_count: int = BACKUP_COUNT,
+    rotate_when: Optional[str] = None,
+    json_lines: bool = False,
+) -> logging.handlers.QueueListener:
+    """
+    コンソールとファイルへのログ出力を設定
+
+    ルートロガーには QueueHandler だけを登録し、コンソール・ファイルへの出力は
+    QueueListener のスレッドで行う。再度呼び出した場合は以前の設定を置き換える。
+    リスナーはプロセス終了時に停止し、キューに残ったログを書き出す。
+
+    Args:
+        log_file (str, optional): ログファイルのパス（空文字・None の場合はファイルに出力しない）
+        level (int): ログレベル
+        max_bytes (int): このサイズを超えたらローテーションする（0 で無効）
+        backup_count (int): 保持する過去のログファイル数
+        rotate_when (str, optional): 時間によるローテーションの単位
+            （"midnight" や "H" など。指定時は max_bytes より優先）
+        json_lines (bool): ファイルへの出力を JSON Lines 形式にする
+
+    Returns:
+        QueueListener: 開始済みのリスナー
+    """
+    global _listener
+    shutdown_logging()
+
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    handlers[0].setFormatter(logging.Formatter(LOG_FORMAT))
+    if log_file:
+        if rotate_when:
+            file_handler: logging.Handler = logging.handlers.TimedRotatingFileHandler(
+                log_file, when=rotate_when, backupCount=backup_count, encoding="utf-8"
+            )
+        else:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding="utf-8",
+            )
+        file_handler.setFormatter(
+            JsonLinesFormatter() if json_lines else logging.Formatter(LOG_FORMAT)
+        )
+        handlers.append(file_handler)
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RunIdFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """リスナーを停止し、キューに残ったログを書き出してファイルを閉じる"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logging)
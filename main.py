@@ -10,31 +10,119 @@ import argparse
 import logging
 import os
 import sys
-import time
 import unicodedata
+from typing import Any, Dict, List, Optional
 
-import schedule
 from dotenv import load_dotenv
 
-from tasks import daily_job
-
-# ロギング設定
-LOG_FILE = "app.log"
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(), logging.FileHandler(LOG_FILE, encoding="utf-8")],
+from checkpoint import BackfillJournal
+from log_config import BACKUP_COUNT, LOG_FILE, MAX_BYTES, run_id_context, setup_logging
+from scheduler import (
+    CronSchedule,
+    JobLock,
+    ScheduledJob,
+    Scheduler,
+    ScheduleState,
+    load_schedules,
 )
+from summary_cache import SummaryCache
+from sync_state import SyncStateStore
+
+# ロギング設定（出力先は main() で引数に応じて設定する）
 logger = logging.getLogger(__name__)
 
 # 環境変数のロード
 load_dotenv()
 
+DEFAULT_SCHEDULE = "0 7 * * *"  # 既定の実行スケジュール（毎日 07:00 JST）
+
+
+def run_daily_job(**kwargs) -> None:
+    """
+    tasks.daily_job を実行
+
+    Qiita / Notion クライアント（requests・notion-client）は初回実行時に読み込み、
+    起動直後や定時実行の待機中には読み込まない。
+    実行中のログには実行レポートと同じ run_id を付与する。
+
+    Args:
+        **kwargs: daily_job の引数
+    """
+    from metrics import RunMetrics
+    from tasks import daily_job
+
+    metrics = RunMetrics()
+    with run_id_context(metrics.run_id):
+        daily_job(metrics=metrics, **kwargs)
+
+
+def run_exclusive(lock_path: str, **kwargs) -> None:
+    """
+    他のプロセスがジョブを実行中でなければ run_daily_job を実行
+
+    Args:
+        lock_path (str): ロックファイルのパス（空文字で排他しない）
+        **kwargs: daily_job の引数
+    """
+    lock = JobLock(lock_path) if lock_path else None
+    if lock is not None and not lock.acquire():
+        logger.error(f"他のプロセスがジョブを実行中です（ロックファイル: {lock_path}）")
+        sys.exit(1)
+    try:
+        run_daily_job(**kwargs)
+    finally:
+        if lock is not None:
+            lock.release()
+
 
-def validate_environment():
-    """必要な環境変数が設定されているか確認"""
-    required_vars = ["QIITA_TOKEN", "NOTION_TOKEN", "NOTION_DB_ID"]
+def get_scheduled_jobs(
+    args: argparse.Namespace, job_options: Dict[str, Any]
+) -> List[ScheduledJob]:
+    """
+    引数から定時実行するジョブを作成
+
+    --schedule-file を指定した場合はその設定を、それ以外は --cron の
+    スケジュール（未指定時は毎日 07:00 JST）を使う。
+
+    Args:
+        args (Namespace): コマンドライン引数
+        job_options (dict): 全スケジュール共通の daily_job の引数
+
+    Returns:
+        list: ScheduledJob のリスト
+    """
+    if args.schedule_file:
+        jobs = load_schedules(args.schedule_file)
+    else:
+        expressions = list(dict.fromkeys(args.cron or [DEFAULT_SCHEDULE]))
+        jobs = [
+            ScheduledJob(
+                name=expression,
+                schedule=CronSchedule(expression),
+                jitter=args.schedule_jitter,
+            )
+            for expression in expressions
+        ]
+    for job in jobs:
+        unknown = sorted(set(job.options) - set(job_options))
+        if unknown:
+            raise ValueError(
+                f"スケジュール {job.name} の options に指定できない項目があります: {', '.join(unknown)}"
+            )
+    return jobs
+
+
+def validate_environment(use_targets: bool = False):
+    """
+    必要な環境変数が設定されているか確認
+
+    Args:
+        use_targets (bool): 同期先の設定ファイル（--targets）を使うか。
+            使う場合、データベースIDは設定ファイルから読むため NOTION_DB_ID は不要
+    """
+    required_vars = ["QIITA_TOKEN", "NOTION_TOKEN"]
+    if not use_targets:
+        required_vars.append("NOTION_DB_ID")
 
     # Raycast関連は削除されたため、必須環境変数から除外
 
@@ -48,6 +136,66 @@ def validate_environment():
     return True
 
 
+def get_unsupported_target_options(args: argparse.Namespace) -> List[str]:
+    """
+    マルチターゲット同期（--targets）と同時に指定できないオプションを列挙
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+
+    Returns:
+        List[str]: 指定されているオプション名のリスト
+    """
+    unsupported = []
+    if args.incremental:
+        unsupported.append("--incremental")
+    if args.journal is not None:
+        unsupported.append("--journal")
+    if args.use_async:
+        unsupported.append("--async")
+    return unsupported
+
+
+def get_unsupported_async_options(args: argparse.Namespace) -> List[str]:
+    """
+    asyncio エンジン（--async）と同時に指定できないオプションを列挙
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+
+    Returns:
+        List[str]: 指定されているオプション名のリスト
+    """
+    unsupported = []
+    if args.incremental:
+        unsupported.append("--incremental")
+    if args.journal is not None:
+        unsupported.append("--journal")
+    if args.no_staged:
+        unsupported.append("--no-staged")
+    return unsupported
+
+
+def get_journal_path(args: argparse.Namespace) -> Optional[str]:
+    """
+    バックフィルで使う進捗ジャーナルのパスを決定
+
+    マルチターゲット同期・asyncio エンジンは進捗ジャーナルに対応していないため None を返す
+    （--journal との同時指定は main で拒否する）。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+
+    Returns:
+        str or None: ジャーナルのパス、使わない場合は None
+    """
+    if args.targets or args.use_async:
+        return None
+    if args.journal is None:
+        return BackfillJournal.DEFAULT_PATH
+    return args.journal
+
+
 def get_int_input(prompt: str, default: int) -> int:
     while True:
         s = input(f"{prompt} [{default}]: ")
@@ -77,16 +225,167 @@ def parse_arguments():
     parser.add_argument(
         "--schedule", action="store_true", help="定時実行モード（サーバー用）"
     )
+    parser.add_argument(
+        "--cron",
+        type=str,
+        action="append",
+        help=f'定時実行のスケジュール（cron 形式・JST、複数指定可。既定: "{DEFAULT_SCHEDULE}"）',
+    )
+    parser.add_argument(
+        "--schedule-file",
+        type=str,
+        help="スケジュールごとに daily_job の引数を変える設定ファイル(JSON)",
+    )
+    parser.add_argument(
+        "--schedule-jitter",
+        type=float,
+        default=0.0,
+        help="--cron の実行時刻に加える最大のランダムな遅延（秒）",
+    )
+    parser.add_argument(
+        "--schedule-state",
+        type=str,
+        default=ScheduleState.DEFAULT_PATH,
+        help="スケジュールごとの最終実行時刻(SQLite)のパス（空文字で停止中の分を実行しない）",
+    )
+    parser.add_argument(
+        "--lock-file",
+        type=str,
+        default=JobLock.DEFAULT_PATH,
+        help="同時実行を防ぐロックファイルのパス（空文字で排他しない）",
+    )
+    parser.add_argument(
+        "--notion-workers",
+        type=int,
+        default=1,
+        help="Notionへ並行して書き込むワーカー数",
+    )
+    parser.add_argument(
+        "--qiita-workers",
+        type=int,
+        default=1,
+        help="Qiitaを日付単位で並行して検索するワーカー数",
+    )
+    parser.add_argument(
+        "--summary-workers",
+        type=int,
+        default=1,
+        help="要約を並列実行するプロセス数",
+    )
+    parser.add_argument(
+        "--summary-cache",
+        type=str,
+        default=SummaryCache.DEFAULT_PATH,
+        help="要約キャッシュ(SQLite)のパス（空文字でキャッシュ無効）",
+    )
+    parser.add_argument(
+        "--sync-state",
+        type=str,
+        default=SyncStateStore.DEFAULT_PATH,
+        help="Notion同期状態(SQLite)のパス（空文字で差分更新無効）",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="前回実行以降に作成された記事のみを取得する差分同期モード（1日に1回は期間全体を検索）",
+    )
+    parser.add_argument(
+        "--no-server-filter",
+        action="store_true",
+        help="いいね数・ストック数による絞り込みを検索クエリに含めない",
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        help=f"バックフィルの進捗ジャーナル(SQLite)のパス（既定: {BackfillJournal.DEFAULT_PATH}、空文字で再開無効）",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=str,
+        help="実行ごとのステージ別所要時間・API呼び出し数をJSONで保存するパス",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        type=str,
+        help="同じ内容をPrometheusのテキスト形式で保存するパス（textfile collector 用）",
+    )
+    parser.add_argument(
+        "--targets",
+        type=str,
+        help="同期先の設定ファイル(JSON)。1回の取得で複数のNotionデータベースに振り分ける",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        default=LOG_FILE,
+        help="ログファイルのパス（空文字でファイル出力を無効化）",
+    )
+    parser.add_argument(
+        "--log-max-bytes",
+        type=int,
+        default=MAX_BYTES,
+        help="ログファイルをローテーションするサイズ（バイト、0で無効）",
+    )
+    parser.add_argument(
+        "--log-backup-count",
+        type=int,
+        default=BACKUP_COUNT,
+        help="保持する過去のログファイル数",
+    )
+    parser.add_argument(
+        "--log-rotate-when",
+        type=str,
+        help="時間でローテーションする単位（例: midnight, H）。指定時はサイズより優先",
+    )
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="ログファイルを JSON Lines 形式で出力",
+    )
+    parser.add_argument(
+        "--no-staged",
+        action="store_true",
+        help="取得・要約・書き込みを別スレッドで重ねずに、書き込み側の要求に応じて順に実行",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="asyncio エンジンで Qiita の取得・要約・Notion への書き込みを重ねて実行",
+    )
     return parser.parse_args()
 
 
 def main():
     """メイン関数"""
+    args = parse_arguments()
+    setup_logging(
+        log_file=args.log_file,
+        max_bytes=args.log_max_bytes,
+        backup_count=args.log_backup_count,
+        rotate_when=args.log_rotate_when,
+        json_lines=args.log_json,
+    )
+
     # 環境変数チェック
-    if not validate_environment():
+    if not validate_environment(use_targets=bool(args.targets)):
         sys.exit(1)
 
-    args = parse_arguments()
+    if args.targets:
+        unsupported = get_unsupported_target_options(args)
+        if unsupported:
+            logger.error(
+                f"--targets と同時に指定できないオプションがあります: {', '.join(unsupported)}"
+            )
+            sys.exit(1)
+
+    if args.use_async:
+        unsupported = get_unsupported_async_options(args)
+        if unsupported:
+            logger.error(
+                f"--async と同時に指定できないオプションがあります: {', '.join(unsupported)}"
+            )
+            sys.exit(1)
 
     if args.no_interactive:
         min_likes = args.min_likes or 500
@@ -97,46 +396,79 @@ def main():
         min_stocks = get_int_input("記事の最低ストック数を入力してください", 500)
         backfill_days = get_int_input("バックフィル日数を入力してください", 1)
 
+    job_options = dict(
+        backfill_days=backfill_days,
+        min_likes=min_likes,
+        min_stocks=min_stocks,
+        notion_workers=args.notion_workers,
+        qiita_workers=args.qiita_workers,
+        summary_workers=args.summary_workers,
+        summary_cache_path=args.summary_cache,
+        sync_state_path=args.sync_state,
+        incremental=args.incremental,
+        server_filter=not args.no_server_filter,
+        metrics_path=args.metrics_json,
+        prometheus_path=args.metrics_prom,
+        use_async=args.use_async,
+        targets_path=args.targets,
+        staged=not args.no_staged,
+    )
+
     # バックフィルモード
     if args.backfill:
         try:
             key, value = args.backfill.split("=")
-            if key == "days":
-                days = int(value)
-                if days > 0:
-                    logger.info(f"過去 {days} 日分のデータを一括取得します")
-                    daily_job(
-                        backfill_days=days, min_likes=min_likes, min_stocks=min_stocks
-                    )
-                    return
-        except (ValueError, AttributeError):
-            pass
-
-        logger.error("バックフィル引数の形式が不正です。正しい形式: --backfill days=3")
-        sys.exit(1)
+            days = int(value)
+        except ValueError:
+            key, days = "", 0
+        if key != "days" or days <= 0:
+            logger.error(
+                "バックフィル引数の形式が不正です。正しい形式: --backfill days=3"
+            )
+            sys.exit(1)
+
+        logger.info(f"過去 {days} 日分のデータを一括取得します")
+        run_exclusive(
+            args.lock_file,
+            **{
+                **job_options,
+                "backfill_days": days,
+                "journal_path": get_journal_path(args),
+            },
+        )
+        return
 
     if args.no_interactive or args.schedule:
         logger.info("Qiita → Notion ハイライト・ブリッジ 起動")
-        logger.info("毎日 07:00 JSTに実行されるようスケジュール設定しました")
-        schedule.every().day.at("07:00").do(
-            lambda: daily_job(
-                backfill_days=backfill_days, min_likes=min_likes, min_stocks=min_stocks
+        try:
+            jobs = get_scheduled_jobs(args, job_options)
+        except (OSError, ValueError) as e:
+            logger.error(f"スケジュールの設定が不正です: {e}")
+            sys.exit(1)
+        for job in jobs:
+            label = "" if job.name == job.schedule.expression else f"{job.name}: "
+            logger.info(
+                f"{label}「{job.schedule.expression}」（JST）で実行するようスケジュール設定しました"
             )
+
+        scheduler = Scheduler(
+            jobs,
+            lambda job: run_daily_job(**{**job_options, **job.options}),
+            lock_path=args.lock_file or None,
+            state_path=args.schedule_state or None,
         )
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)
+            scheduler.run_forever()
         except KeyboardInterrupt:
             logger.info("プログラムを終了します")
         except Exception as e:
             logger.exception(f"予期せぬエラーが発生しました: {e}")
             sys.exit(1)
+        finally:
+            scheduler.close()
     else:
         logger.info("手動実行モード: 1回だけ実行して終了します")
-        daily_job(
-            backfill_days=backfill_days, min_likes=min_likes, min_stocks=min_stocks
-        )
+        run_exclusive(args.lock_file, **job_options)
         logger.info("手動実行完了。プログラムを終了します")
         sys.exit(0)
 
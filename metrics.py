@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ジョブ実行時の計測（ステージ別の所要時間・API呼び出し数・待機時間）を担当するモジュール
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _make_labels(labels: Dict[str, Any]) -> Labels:
+    """ラベルの辞書をキーとして使える形に変換"""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class RunMetrics:
+    """
+    1回のジョブ実行の計測結果
+
+    - ステージ: 処理ごとの累計所要時間と呼び出し回数（並行実行分は合算される）
+    - カウンタ: API・エンドポイントごとのリクエスト数、リトライ数、429 の回数、受信バイト数など
+    - ヒストグラム: レート制限やリトライによる待機時間の分布
+    - ゲージ: 処理件数などの実行結果
+
+    いずれもスレッドセーフに更新でき、JSON または Prometheus のテキスト形式で出力できる。
+    """
+
+    # 待機時間のヒストグラムの区切り（秒）
+    SLEEP_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+    PROMETHEUS_PREFIX = "qiita_notion_bridge"
+
+    def __init__(self, run_id: Optional[str] = None) -> None:
+        """
+        初期化
+
+        Args:
+            run_id (str, optional): 実行を識別するID（省略時は自動生成）
+        """
+        self.run_id = run_id or uuid.uuid4().hex
+        self.started_at = datetime.now().astimezone()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Dict[str, Any]] = {}
+        self._gauges: Dict[str, float] = {}
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """
+        ステージの所要時間を加算
+
+        Args:
+            stage (str): ステージ名
+            seconds (float): 所要時間（秒）
+        """
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        with ブロックの所要時間をステージに加算するコンテキストマネージャ
+
+        Args:
+            stage (str): ステージ名
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - started)
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        カウンタを加算
+
+        Args:
+            name (str): カウンタ名
+            value (float): 加算する値
+            **labels: ラベル（api="qiita", endpoint="items" など）
+        """
+        key = (name, _make_labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def get_counter(self, name: str, **labels: Any) -> float:
+        """
+        カウンタの値を取得
+
+        Args:
+            name (str): カウンタ名
+            **labels: ラベル
+
+        Returns:
+            float: カウンタの値（未記録の場合は0）
+        """
+        with self._lock:
+            return self._counters.get((name, _make_labels(labels)), 0)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        ヒストグラムに値を記録
+
+        Args:
+            name (str): ヒストグラム名
+            value (float): 記録する値（秒）
+            **labels: ラベル
+        """
+        key = (name, _make_labels(labels))
+        index = bisect.bisect_left(self.SLEEP_BUCKETS, value)
+        with self._lock:
+            histogram = self._histograms.setdefault(
+                key,
+                {
+                    "buckets": [0] * (len(self.SLEEP_BUCKETS) + 1),
+                    "sum": 0.0,
+                    "count": 0,
+                },
+            )
+            histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def sleep(self, seconds: float, name: str = "sleep_seconds", **labels: Any) -> None:
+        """
+        待機時間をヒストグラムに記録してから待機
+
+        Args:
+            seconds (float): 待機秒数
+            name (str): ヒストグラム名
+            **labels: ラベル
+        """
+        self.observe(name, seconds, **labels)
+        time.sleep(seconds)
+
+    async def async_sleep(
+        self, seconds: float, name: str = "sleep_seconds", **labels: Any
+    ) -> None:
+        """
+        待機時間をヒストグラムに記録してから、イベントループを止めずに待機
+
+        Args:
+            seconds (float): 待機秒数
+            name (str): ヒストグラム名
+            **labels: ラベル
+        """
+        self.observe(name, seconds, **labels)
+        await asyncio.sleep(seconds)
+
+    def sleeper(
+        self, name: str = "sleep_seconds", **labels: Any
+    ) -> Callable[[float], None]:
+        """
+        待機時間を記録する sleep 関数を作成（TokenBucket / RateScheduler 用）
+
+        Args:
+            name (str): ヒストグラム名
+            **labels: ラベル
+
+        Returns:
+            callable: 秒数を受け取って待機する関数
+        """
+        return lambda seconds: self.sleep(seconds, name, **labels)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        ゲージ（処理件数などの結果）を設定
+
+        Args:
+            name (str): ゲージ名
+            value (float): 値
+        """
+        with self._lock:
+            self._gauges[name] = value
+
+    @property
+    def duration(self) -> float:
+        """計測開始からの経過秒数"""
+        return time.perf_counter() - self._started
+
+    def report(self) -> Dict[str, Any]:
+        """
+        計測結果を JSON に変換できる辞書として取得
+
+        Returns:
+            dict: 実行ID・所要時間・ステージ・カウンタ・ヒストグラム・ゲージ
+        """
+        with self._lock:
+            stages = {
+                stage: {"count": count, "seconds": round(seconds, 6)}
+                for stage, (count, seconds) in sorted(self._stages.items())
+            }
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = []
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                bounds = [str(bound) for bound in self.SLEEP_BUCKETS] + ["+Inf"]
+                histograms.append(
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "buckets": dict(zip(bounds, histogram["buckets"])),
+                        "sum": round(histogram["sum"], 6),
+                        "count": histogram["count"],
+                    }
+                )
+            gauges = dict(sorted(self._gauges.items()))
+
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(self.duration, 6),
+            "stages": stages,
+            "counters": counters,
+            "histograms": histograms,
+            "gauges": gauges,
+        }
+
+    def summary(self) -> str:
+        """
+        ステージ別の所要時間をログ出力用の1行にまとめる
+
+        Returns:
+            str: "ステージ 秒数s (回数回)" をカンマで連結した文字列
+        """
+        stages = self.report()["stages"]
+        return ", ".join(
+            f"{stage} {entry['seconds']:.2f}s ({entry['count']}回)"
+            for stage, entry in stages.items()
+        )
+
+    def to_prometheus(self) -> str:
+        """
+        計測結果を Prometheus のテキスト形式に変換
+
+        Returns:
+            str: Prometheus のテキスト形式（node_exporter の textfile collector 用）
+        """
+        prefix = self.PROMETHEUS_PREFIX
+        report = self.report()
+        # run_id は実行ごとに変わるため、系列のラベルには含めず _run_info にだけ付ける
+        # （ファイルは毎回上書きされるので、時系列の数は増えない）
+        lines = [
+            f"# TYPE {prefix}_run_info gauge",
+            f"{prefix}_run_info{self._format_labels({'run_id': self.run_id})} 1",
+            f"# TYPE {prefix}_run_duration_seconds gauge",
+            f"{prefix}_run_duration_seconds {report['duration_seconds']}",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        for stage, entry in report["stages"].items():
+            lines.append(
+                f'{prefix}_stage_seconds_total{{stage="{stage}"}} {entry["seconds"]}'
+            )
+        lines.append(f"# TYPE {prefix}_stage_calls_total counter")
+        for stage, entry in report["stages"].items():
+            lines.append(
+                f'{prefix}_stage_calls_total{{stage="{stage}"}} {entry["count"]}'
+            )
+
+        declared = set()
+        for counter in report["counters"]:
+            metric = f"{prefix}_{counter['name']}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(
+                f"{metric}{self._format_labels(counter['labels'])} {counter['value']}"
+            )
+
+        for histogram in report["histograms"]:
+            metric = f"{prefix}_{histogram['name']}"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in histogram["buckets"].items():
+                cumulative += count
+                labels = self._format_labels({**histogram["labels"], "le": bound})
+                lines.append(f"{metric}_bucket{labels} {cumulative}")
+            labels = self._format_labels(histogram["labels"])
+            lines.append(f"{metric}_sum{labels} {histogram['sum']}")
+            lines.append(f"{metric}_count{labels} {histogram['count']}")
+
+        for name, value in report["gauges"].items():
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _escape_label_value(value: Any) -> str:
+        """ラベル値の \\・"・改行をテキスト形式の仕様に従ってエスケープ"""
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @classmethod
+    def _format_labels(cls, labels: Dict[str, str]) -> str:
+        """ラベルを Prometheus の {name="value"} 形式に変換"""
+        if not labels:
+            return ""
+        return (
+            "{"
+            + ",".join(
+                f'{name}="{cls._escape_label_value(value)}"'
+                for name, value in labels.items()
+            )
+            + "}"
+        )
+
+    def write_json(self, path: str) -> None:
+        """
+        計測結果を JSON ファイルに保存
+
+        Args:
+            path (str): 保存先のパス
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        logger.info(f"実行レポートを保存しました: {path}")
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        計測結果を Prometheus のテキスト形式で保存
+
+        Args:
+            path (str): 保存先のパス
+        """
+        # 収集側が書き込み途中のファイルを読まないよう、一時ファイルから置き換える
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        logger.info(f"Prometheus 形式のメトリクスを保存しました: {path}")
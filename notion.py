@@ -5,16 +5,25 @@
 Notion データベースとの連携を担当するモジュール
 """
 
+import itertools
 import logging
 import os
+import threading
 import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 from notion_client import Client
-from notion_client.errors import APIResponseError
+from notion_client.errors import APIErrorCode, APIResponseError
 
+from metrics import RunMetrics
+from notion_payload import NotionPayload, build_payload, build_properties, iter_payloads
+from pipeline import bounded_map
+from rate_limit import TokenBucket
+from sync_state import SyncStateStore
+from utils import format_datetime, parse_iso_datetime
 
 # ロギング設定
 logger = logging.getLogger(__name__)
@@ -23,13 +32,57 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
-class NotionClient:
-    """Notion API クライアント"""
+class BaseNotionClient(ABC):
+    """
+    Notion API クライアントの共通部分
+
+    スキーマ検証結果のキャッシュ・URLインデックス・同期状態との差分判定・
+    書き込みエラーのリトライ判定を担い、通信は行わない。notion-client の
+    同期版（NotionClient）と asyncio 版（AsyncNotionClient）がそれぞれ
+    通信部分を実装する。
+    """
+
+    SCHEMA_CACHE_TTL = 3600  # スキーマ検証結果のキャッシュ有効期間（秒）
+    SCHEMA_ERROR_PATTERNS = (  # スキーマ不整合を示す validation_error のメッセージ
+        "is not a property that exists",
+        "is expected to be",
+        "Could not find property",
+    )
+    QUERY_PAGE_SIZE = 100  # databases.query 1回あたりの最大取得件数
+    MAX_WRITE_RETRIES = 3  # ページ書き込みの最大試行回数（429・スキーマ再検証時）
+    REQUESTS_PER_SECOND = 3  # Notion API の平均リクエスト上限（req/s）
+    REQUIRED_PROPERTIES = {
+        "title": {"type": "title", "property": {"title": {}}},
+        "url": {"type": "url", "property": {"url": {}}},
+        "author": {"type": "rich_text", "property": {"rich_text": {}}},
+        "likes": {"type": "number", "property": {"number": {}}},
+        "stocks": {"type": "number", "property": {"number": {}}},
+        "tags": {"type": "multi_select", "property": {"multi_select": {}}},
+        "summary": {"type": "rich_text", "property": {"rich_text": {}}},
+        "created_at": {"type": "date", "property": {"date": {}}},
+    }
 
     def __init__(
-        self, token: Optional[str] = None, database_id: Optional[str] = None
+        self,
+        token: Optional[str] = None,
+        database_id: Optional[str] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        sync_state: Optional[SyncStateStore] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[RunMetrics] = None,
     ) -> None:
-        """初期化"""
+        """
+        初期化
+
+        Args:
+            token (str, optional): Notion APIトークン
+            database_id (str, optional): NotionデータベースID
+            rate_limiter (TokenBucket, optional): 全リクエストで共有するトークンバケット
+            sync_state (SyncStateStore, optional): 前回書き込んだプロパティの記録
+            base_url (str, optional): API のベースURL（未指定時は環境変数
+                NOTION_API_BASE_URL、それもなければ公式API。ローカルの模擬サーバー用）
+            metrics (RunMetrics, optional): リクエスト数や所要時間の記録先
+        """
         self.token = token or os.getenv("NOTION_TOKEN")
         if not self.token or len(self.token) < 32:
             raise ValueError("Notion APIトークンの形式が不正です（32文字以上の英数字）")
@@ -37,42 +90,395 @@ class NotionClient:
         if not self.database_id:
             raise ValueError("Notion データベースIDが設定されていません")
 
+        # リクエスト数・待機時間などの計測（HTTP 応答ごとにフックで記録）
+        self.metrics = metrics or RunMetrics()
+
         # Notion クライアント初期化
-        self.client = Client(auth=self.token)
+        self.base_url = base_url or os.getenv("NOTION_API_BASE_URL")
+        self.client = self._create_client()
+
+        # 全ワーカーで共有するレート制御（Notion API は平均 3 req/s）
+        self.rate_limiter = rate_limiter or TokenBucket(
+            rate=self.REQUESTS_PER_SECOND,
+            capacity=self.REQUESTS_PER_SECOND,
+            sleep=self.metrics.sleeper("rate_limit_sleep_seconds", limiter="notion"),
+        )
+
+        # データベーススキーマ検証結果のキャッシュ
+        self._schema_properties: Optional[Dict[str, Any]] = None
+        self._schema_checked_at: Optional[float] = None
+
+        # URL → ページID のインデックス（build_url_index で一括構築）
+        self._url_index: Optional[Dict[str, str]] = None
+
+        # 同期状態（未指定の場合は既存ページを毎回すべてのプロパティで更新する）
+        self.sync_state = sync_state
+        self.skipped_count = 0
+        self._skipped_lock = threading.Lock()
+
+    @abstractmethod
+    def _create_client(self) -> Any:
+        """notion-client のクライアントを作成し、応答ごとの計測フックを登録"""
+
+    def _client_options(self) -> Dict[str, Any]:
+        """notion-client のクライアントに渡す認証情報と接続先"""
+        options = {"auth": self.token}
+        if self.base_url:
+            options["base_url"] = self.base_url
+        return options
+
+    @staticmethod
+    def _endpoint_label(method: str, path: str) -> str:
+        """計測用のエンドポイント名（"POST databases/:id/query" のようにIDを置き換える）"""
+        parts = path.split("/v1/", 1)[-1].split("/")
+        if len(parts) > 1:
+            parts[1] = ":id"
+        return f"{method} {'/'.join(parts)}"
+
+    @classmethod
+    def record_response_metrics(cls, metrics: RunMetrics, response: Any) -> None:
+        """
+        HTTP 応答ごとのリクエスト数・受信バイト数・エラー数を記録
+
+        Args:
+            metrics (RunMetrics): 記録先
+            response (httpx.Response): notion-client が受け取った応答
+        """
+        request = response.request
+        labels = {
+            "api": "notion",
+            "endpoint": cls._endpoint_label(request.method, request.url.path),
+        }
+        metrics.increment("api_requests", **labels)
+        metrics.increment(
+            "api_bytes", int(response.headers.get("Content-Length", 0)), **labels
+        )
+        if response.status_code == 429:
+            metrics.increment("api_rate_limited", **labels)
+        elif response.status_code >= 400:
+            metrics.increment("api_errors", **labels)
+
+    def _is_schema_cache_valid(self) -> bool:
+        """スキーマ検証結果のキャッシュが有効期限内か判定"""
+        if self._schema_properties is None or self._schema_checked_at is None:
+            return False
+        return time.monotonic() - self._schema_checked_at < self.SCHEMA_CACHE_TTL
+
+    def invalidate_schema_cache(self) -> None:
+        """スキーマ検証結果のキャッシュを破棄し、次回アクセス時に再検証させる"""
+        self._schema_properties = None
+        self._schema_checked_at = None
+
+    @classmethod
+    def find_missing_properties(cls, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        データベースのプロパティ定義から不足しているプロパティを抽出
+
+        型が異なるプロパティは警告のみ出力する。
+
+        Args:
+            properties (dict): databases.retrieve で取得したプロパティ定義
+
+        Returns:
+            dict: 追加が必要なプロパティ名と定義
+        """
+        missing_props = {}
+        for prop_name, prop_info in cls.REQUIRED_PROPERTIES.items():
+            if prop_name not in properties:
+                missing_props[prop_name] = prop_info["property"]
+            elif properties[prop_name]["type"] != prop_info["type"]:
+                logger.warning(
+                    f"プロパティ {prop_name} の型が違います（{properties[prop_name]['type']} != {prop_info['type']}）"
+                )
+        if missing_props:
+            logger.warning(
+                f"データベースに必要なプロパティがありません: {', '.join(missing_props.keys())}。追加します。"
+            )
+        return missing_props
+
+    def _store_schema(
+        self, properties: Dict[str, Any], added_props: Dict[str, Any]
+    ) -> None:
+        """
+        検証したプロパティ定義をキャッシュに保存
+
+        Args:
+            properties (dict): databases.retrieve で取得したプロパティ定義
+            added_props (dict): databases.update で追加したプロパティ
+        """
+        for prop_name in added_props:
+            properties[prop_name] = {
+                "type": self.REQUIRED_PROPERTIES[prop_name]["type"]
+            }
+        self._schema_properties = properties
+        self._schema_checked_at = time.monotonic()
+
+    @classmethod
+    def _is_schema_error(cls, error: APIResponseError) -> bool:
+        """
+        ページ書き込みエラーがスキーマ不整合に起因するものか判定
+
+        validation_error のうち、プロパティの欠落・型の不一致を示すものだけを対象とし、
+        文字数・要素数の超過などペイロード自体の誤りは再検証しても直らないため除外する。
+        """
+        if getattr(error, "code", None) != APIErrorCode.ValidationError:
+            return False
+        message = str(error)
+        return any(pattern in message for pattern in cls.SCHEMA_ERROR_PATTERNS)
+
+    @staticmethod
+    def _url_lookup_query(url: str) -> Dict[str, Any]:
+        """URLが一致するページを1件だけ検索する databases.query の引数"""
+        return {"filter": {"property": "url", "url": {"equals": url}}, "page_size": 1}
+
+    def _url_index_query(self, since: Optional[str] = None) -> Dict[str, Any]:
+        """
+        URLインデックスを構築する databases.query の引数を作成
+
+        Args:
+            since (str, optional): この日付（ISO形式）以降に作成された記事のみを対象にする
+
+        Returns:
+            dict: 最初のページを取得する引数
+        """
+        query_params: Dict[str, Any] = {"page_size": self.QUERY_PAGE_SIZE}
+        if since:
+            query_params["filter"] = {
+                "property": "created_at",
+                "date": {"on_or_after": since},
+            }
+        return query_params
+
+    @staticmethod
+    def _add_to_url_index(
+        index: Dict[str, str], response: dict, query_params: Dict[str, Any]
+    ) -> bool:
+        """
+        databases.query の結果をURLインデックスに追加
+
+        Args:
+            index (dict): 追加先のインデックス
+            response (dict): databases.query の応答
+            query_params (dict): 次のページを取得できるよう start_cursor を更新する引数
+
+        Returns:
+            bool: 続きのページがある場合は True
+        """
+        for page in response.get("results", []):
+            url = page.get("properties", {}).get("url", {}).get("url")
+            if url:
+                index[url] = page["id"]
+        if not response.get("has_more"):
+            return False
+        query_params["start_cursor"] = response.get("next_cursor")
+        return True
+
+    @staticmethod
+    def _get_index_since(articles: List[dict]) -> Optional[str]:
+        """
+        URLインデックスの走査範囲（作成日の下限）を記事群から算出
+
+        タイムゾーン差で取りこぼさないよう、最も古い作成日の1日前を下限とする。
+        作成日が不明な記事が含まれる場合は全件を走査する。
+        """
+        created_dates = [article.get("created_at") for article in articles]
+        if not all(created_dates):
+            return None
+        oldest = min(parse_iso_datetime(created_at) for created_at in created_dates)
+        return format_datetime(oldest - timedelta(days=1))
+
+    def clear_url_index(self) -> None:
+        """URLインデックスを破棄し、以降は search_page_by_url で検索する"""
+        self._url_index = None
+
+    def _get_changed_properties(
+        self,
+        url: str,
+        page_id: str,
+        properties: Dict[str, Any],
+        fingerprints: Dict[str, str],
+    ) -> Dict[str, Any]:
+        """
+        前回の同期状態と比較し、値が変わったプロパティのみを抽出
+
+        同期状態が無い、またはページIDが異なる場合はすべてのプロパティを返す。
+
+        Args:
+            url (str): 記事のURL
+            page_id (str): 更新対象のページID
+            properties (dict): 送信しようとしているプロパティ
+            fingerprints (dict): properties のフィンガープリント
+
+        Returns:
+            dict: 送信が必要なプロパティ
+        """
+        if self.sync_state is None:
+            return properties
+        return self.sync_state.get_changed(url, page_id, properties, fingerprints)
+
+    def _get_update_properties(
+        self,
+        article: dict,
+        page_id: str,
+        properties: Dict[str, Any],
+        fingerprints: Dict[str, str],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        既存ページの更新で送信するプロパティを取得
+
+        Args:
+            article (dict): Notion用にフォーマットされた記事データ
+            page_id (str): 更新対象のページID
+            properties (dict): 記事のすべてのプロパティ
+            fingerprints (dict): properties のフィンガープリント
+
+        Returns:
+            dict or None: 送信が必要なプロパティ、変更がなく更新を省略する場合は None
+        """
+        changed_properties = self._get_changed_properties(
+            article["url"], page_id, properties, fingerprints
+        )
+        if changed_properties:
+            return changed_properties
+        with self._skipped_lock:
+            self.skipped_count += 1
+        logger.debug(f"変更がないため更新をスキップしました: {article['title']}")
+        return None
+
+    def _record_sync_state(
+        self, url: str, page_id: str, fingerprints: Dict[str, str]
+    ) -> None:
+        """書き込みが完了したプロパティを同期状態に記録"""
+        if self.sync_state is not None and page_id:
+            self.sync_state.record(url, page_id, fingerprints)
+
+    def _on_page_created(
+        self, article: dict, page_id: Optional[str], fingerprints: Dict[str, str]
+    ) -> None:
+        """作成したページをURLインデックスと同期状態に記録"""
+        if self._url_index is not None and page_id:
+            self._url_index[article["url"]] = page_id
+        self._record_sync_state(article["url"], page_id, fingerprints)
+        logger.info(f"新規ページを作成しました: {article['title']}")
+
+    def _on_page_updated(
+        self,
+        article: dict,
+        page_id: str,
+        changed_properties: Dict[str, Any],
+        fingerprints: Dict[str, str],
+    ) -> None:
+        """更新したページを同期状態に記録"""
+        self._record_sync_state(article["url"], page_id, fingerprints)
+        logger.debug(
+            f"既存ページを更新しました: {article['title']}（{', '.join(changed_properties)}）"
+        )
+
+    @staticmethod
+    def _write_labels(page_id: Optional[str]) -> Dict[str, str]:
+        """ページ書き込みの計測用のラベル"""
+        return {
+            "api": "notion",
+            "endpoint": "PATCH pages/:id" if page_id else "POST pages",
+        }
+
+    def _handle_write_error(
+        self,
+        error: APIResponseError,
+        attempt: int,
+        page_id: Optional[str],
+        schema_revalidated: bool,
+    ) -> Optional[float]:
+        """
+        ページ書き込みのエラーをリトライするか判定
+
+        429 は指数バックオフで待機してリトライする。スキーマ不整合によるエラーは
+        1回に限りスキーマのキャッシュを破棄し、待機せずにリトライする。
+
+        Args:
+            error (APIResponseError): 書き込み時のエラー
+            attempt (int): 何回目の試行か（0始まり）
+            page_id (str, optional): 更新対象のページID（新規作成の場合は None）
+            schema_revalidated (bool): この記事ですでにスキーマを再検証したか
+
+        Returns:
+            float or None: リトライ前の待機秒数、リトライしない場合は None
+        """
+        if getattr(error, "status", None) == 429:
+            wait_time = 2**attempt
+            logger.warning(
+                f"Notion API レート制限。{wait_time}秒後にリトライします (試行{attempt+1}/{self.MAX_WRITE_RETRIES})"
+            )
+            self.metrics.increment("api_retries", **self._write_labels(page_id))
+            return float(wait_time)
+        if self._is_schema_error(error) and not schema_revalidated:
+            # スキーマ変更の可能性があるため、キャッシュを破棄して再検証
+            logger.warning(
+                f"スキーマ関連のエラーが発生したため、データベース構造を再検証します: {error}"
+            )
+            self.invalidate_schema_cache()
+            return 0.0
+        logger.error(f"Notion API エラー: {error}")
+        return None
+
+    @staticmethod
+    def build_properties(article: dict) -> Dict[str, Any]:
+        """
+        記事データから Notion に送信するプロパティを作成
+
+        Args:
+            article (dict): Notion用にフォーマットされた記事データ
+
+        Returns:
+            dict: プロパティ名をキーとする Notion API のプロパティ値
+        """
+        return build_properties(article)
+
+
+class NotionClient(BaseNotionClient):
+    """Notion API クライアント"""
+
+    def _create_client(self) -> Client:
+        """notion-client のクライアントを作成し、応答ごとの計測フックを登録"""
+        client = Client(**self._client_options())
+        client.client.event_hooks["response"].append(
+            lambda response: self.record_response_metrics(self.metrics, response)
+        )
+        return client
+
+    def _check_database(self, force: bool = False) -> bool:
+        """
+        データベースのプロパティ構成を検証し、不足しているプロパティを追加
+
+        検証結果（プロパティ定義）はクライアント単位でキャッシュされ、
+        SCHEMA_CACHE_TTL 秒が経過するか force=True が指定されるまで再取得しない。
+
+        Args:
+            force (bool): キャッシュを無視して再検証するか
+
+        Returns:
+            bool: データベースが利用可能な状態であれば True
+        """
+        if not force and self._is_schema_cache_valid():
+            return True
 
-    def _check_database(self) -> bool:
         try:
-            db = self.client.databases.retrieve(self.database_id)
+            self.rate_limiter.acquire()
+            with self.metrics.timer("notion_schema_check"):
+                db = self.client.databases.retrieve(self.database_id)
             properties = db.get("properties", {})
-            required_props = {
-                "title": {"type": "title", "property": {"title": {}}},
-                "url": {"type": "url", "property": {"url": {}}},
-                "author": {"type": "rich_text", "property": {"rich_text": {}}},
-                "likes": {"type": "number", "property": {"number": {}}},
-                "stocks": {"type": "number", "property": {"number": {}}},
-                "tags": {"type": "multi_select", "property": {"multi_select": {}}},
-                "summary": {"type": "rich_text", "property": {"rich_text": {}}},
-                "created_at": {"type": "date", "property": {"date": {}}},
-            }
-            missing_props = {}
-            for prop_name, prop_info in required_props.items():
-                if prop_name not in properties:
-                    missing_props[prop_name] = prop_info["property"]
-                elif properties[prop_name]["type"] != prop_info["type"]:
-                    logger.warning(
-                        f"プロパティ {prop_name} の型が違います（{properties[prop_name]['type']} != {prop_info['type']}）"
-                    )
+            missing_props = self.find_missing_properties(properties)
             if missing_props:
-                logger.warning(
-                    f"データベースに必要なプロパティがありません: {', '.join(missing_props.keys())}。追加します。"
-                )
-                self.client.databases.update(
-                    database_id=self.database_id, properties=missing_props
-                )
-                return True
+                self.rate_limiter.acquire()
+                with self.metrics.timer("notion_schema_check"):
+                    self.client.databases.update(
+                        database_id=self.database_id, properties=missing_props
+                    )
+            self._store_schema(properties, missing_props)
             return True
         except APIResponseError as e:
             logger.error(f"データベース接続エラー: {e}")
+            self.invalidate_schema_cache()
             return False
 
     def search_page_by_url(self, url: str) -> Optional[dict]:
@@ -86,15 +492,11 @@ class NotionClient:
             dict or None: 見つかったページ情報、または None
         """
         try:
-            # URLフィルタでページを検索
-            filter_params = {
-                "filter": {"property": "url", "url": {"equals": url}},
-                "page_size": 1,
-            }
-
-            response = self.client.databases.query(
-                database_id=self.database_id, **filter_params
-            )
+            self.rate_limiter.acquire()
+            with self.metrics.timer("notion_url_lookup"):
+                response = self.client.databases.query(
+                    database_id=self.database_id, **self._url_lookup_query(url)
+                )
 
             results = response.get("results", [])
             return results[0] if results else None
@@ -103,92 +505,219 @@ class NotionClient:
             logger.error(f"Notionページ検索エラー: {e}")
             return None
 
-    def upsert_article(self, article: dict) -> Tuple[bool, bool, Optional[str]]:
-        max_retries = 3
-        for attempt in range(max_retries):
-            # データベース構造を確認
+    def build_url_index(self, since: Optional[str] = None) -> Dict[str, str]:
+        """
+        データベースを一括走査して URL → ページID のインデックスを構築
+
+        page_size=100 でページネーションしながら全件を取得するため、
+        記事ごとに search_page_by_url を呼ぶよりもリクエスト数が大幅に少ない。
+
+        Args:
+            since (str, optional): この日付（ISO形式）以降に作成された記事のみを対象にする
+
+        Returns:
+            dict: URL をキー、ページIDを値とする辞書
+        """
+        index: Dict[str, str] = {}
+        query_params = self._url_index_query(since)
+        while True:
+            self.rate_limiter.acquire()
+            with self.metrics.timer("notion_url_index"):
+                response = self.client.databases.query(
+                    database_id=self.database_id, **query_params
+                )
+            if not self._add_to_url_index(index, response, query_params):
+                break
+
+        self._url_index = index
+        logger.info(f"Notion URLインデックスを構築しました: {len(index)} 件")
+        return index
+
+    def prepare_url_index(self, since: Optional[str] = None) -> None:
+        """
+        データベースを検証し、URLインデックスを構築
+
+        構築に失敗した場合はインデックスを使わず、記事ごとの検索に切り替える。
+
+        Args:
+            since (str, optional): この日付（ISO形式）以降に作成された記事のみを対象にする
+        """
+        if not self._check_database():
+            return
+        try:
+            self.build_url_index(since=since)
+        except APIResponseError as e:
+            logger.warning(
+                f"URLインデックスの構築に失敗したため、記事ごとに検索します: {e}"
+            )
+            self.clear_url_index()
+
+    def find_page_id_by_url(self, url: str) -> Optional[str]:
+        """
+        URLに対応するページIDを取得
+
+        URLインデックスが構築済みであればメモリ上で解決し、
+        未構築の場合は search_page_by_url で問い合わせる。
+
+        Args:
+            url (str): 記事のURL
+
+        Returns:
+            str or None: ページID、存在しない場合は None
+        """
+        if self._url_index is not None:
+            return self._url_index.get(url)
+
+        existing_page = self.search_page_by_url(url)
+        return existing_page["id"] if existing_page else None
+
+    def upsert_article(
+        self, article: dict, payload: Optional[NotionPayload] = None
+    ) -> Tuple[bool, bool, Optional[str]]:
+        """
+        記事を Notion に作成、または既存ページを更新
+
+        Args:
+            article (dict): Notion用にフォーマットされた記事データ
+            payload (NotionPayload, optional): 作成済みのプロパティ。
+                省略時は記事データから作成する
+
+        Returns:
+            tuple: (成功したか, 新規作成か, ページID)
+        """
+        if payload is None:
+            payload = build_payload(article)
+        properties = payload.properties
+        fingerprints = payload.fingerprints
+        schema_revalidated = False
+        for attempt in range(self.MAX_WRITE_RETRIES):
+            # データベース構造を確認（検証結果はキャッシュされる）
             if not self._check_database():
                 logger.error("Notionデータベースの構造が不適切です")
                 return False, False, None
-            existing_page = self.search_page_by_url(article["url"])
+            page_id = self.find_page_id_by_url(article["url"])
             try:
-                properties = {
-                    "title": {"title": [{"text": {"content": article["title"]}}]},
-                    "url": {"url": article["url"]},
-                    "author": {"rich_text": [{"text": {"content": article["author"]}}]},
-                    "likes": {"number": article["likes"]},
-                    "stocks": {"number": article.get("stocks", 0)},
-                    "tags": {
-                        "multi_select": [{"name": tag} for tag in article["tags"][:10]]
-                    },
-                    "summary": {
-                        "rich_text": [{"text": {"content": article["summary"]}}]
-                    },
-                    "created_at": {"date": {"start": article.get("created_at", None)}},
-                }
-                if existing_page:
-                    page_id = existing_page["id"]
-                    self.client.pages.update(page_id=page_id, properties=properties)
-                    logger.debug(f"既存ページを更新しました: {article['title']}")
+                if page_id:
+                    changed_properties = self._get_update_properties(
+                        article, page_id, properties, fingerprints
+                    )
+                    if changed_properties is None:
+                        return True, False, page_id
+
+                    self.rate_limiter.acquire()
+                    with self.metrics.timer("notion_page_write"):
+                        self.client.pages.update(
+                            page_id=page_id, properties=changed_properties
+                        )
+                    self._on_page_updated(
+                        article, page_id, changed_properties, fingerprints
+                    )
                     return True, False, page_id
-                else:
+
+                self.rate_limiter.acquire()
+                with self.metrics.timer("notion_page_write"):
                     response = self.client.pages.create(
-                        parent={"database_id": self.database_id}, properties=properties
+                        parent={"database_id": self.database_id},
+                        properties=properties,
                     )
-                    page_id = response.get("id")
-                    logger.info(f"新規ページを作成しました: {article['title']}")
-                    return True, True, page_id
+                page_id = response.get("id")
+                self._on_page_created(article, page_id, fingerprints)
+                return True, True, page_id
             except APIResponseError as e:
-                if hasattr(e, "status") and e.status == 429:
-                    wait_time = 2**attempt
-                    logger.warning(
-                        f"Notion API レート制限。{wait_time}秒後にリトライします (試行{attempt+1}/{max_retries})"
-                    )
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.error(f"Notion API エラー: {e}")
+                wait_time = self._handle_write_error(
+                    e, attempt, page_id, schema_revalidated
+                )
+                if wait_time is None:
                     return False, False, None
+                schema_revalidated = schema_revalidated or self._is_schema_error(e)
+                if wait_time > 0:
+                    self.metrics.sleep(
+                        wait_time, "retry_sleep_seconds", **self._write_labels(page_id)
+                    )
             except Exception as e:
                 logger.error(f"Notion API その他エラー: {e}")
                 return False, False, None
         logger.error("Notion API リトライ上限に達しました")
         return False, False, None
 
+    def _upsert_article_safely(
+        self, write: Tuple[dict, NotionPayload]
+    ) -> Tuple[bool, bool, Optional[str]]:
+        """(記事, ペイロード) の upsert_article を実行し、予期せぬ例外は失敗として扱う"""
+        article, payload = write
+        try:
+            return self.upsert_article(article, payload)
+        except Exception as e:
+            logger.error(f"記事アップサート中にエラーが発生: {e}")
+            return False, False, None
+
     def bulk_upsert_articles(
-        self, articles: List[dict]
+        self,
+        articles: Iterable[dict],
+        workers: int = 1,
+        since: Optional[str] = None,
+        on_result: Optional[Callable[[dict, bool, bool, Optional[str]], None]] = None,
     ) -> Tuple[int, int, int, List[dict]]:
         """
         複数の記事を一括でアップサート
 
+        articles にはリストのほかジェネレータも渡せる。ジェネレータの場合は
+        記事が届いた順に書き込むため、全件をメモリに載せる必要がない。
+        workers が2以上の場合はスレッドプールで並行に書き込む。
+        リクエスト速度はクライアントが共有するトークンバケットで制御される。
+
         Args:
-            articles (list): 記事データのリスト
+            articles (iterable): 記事データのリストまたはイテレータ
+            workers (int): 並行して書き込むワーカー数
+            since (str, optional): URLインデックスの走査範囲（作成日の下限）。
+                省略時はリストであれば記事群から算出し、イテレータであれば全件を走査する
+            on_result (callable, optional): 記事ごとの結果
+                (記事, 成功したか, 新規作成か, ページID) を受け取るコールバック
 
         Returns:
-            tuple: (成功件数, 新規作成件数, エラー件数)
+            tuple: (成功件数, 新規作成件数, エラー件数, 新規記事のリスト)
         """
         success_count = 0
         new_count = 0
         error_count = 0
         new_articles = []
+        skipped_before = self.skipped_count
 
-        for article in articles:
-            try:
-                success, is_new, page_id = self.upsert_article(article)
+        if since is None and isinstance(articles, list) and articles:
+            since = self._get_index_since(articles)
 
-                if success:
-                    success_count += 1
-                    if is_new:
-                        new_count += 1
-                        new_articles.append(article)
-                else:
-                    error_count += 1
+        # 最初の記事が届くまでNotionへのリクエストは行わない
+        iterator = iter(articles)
+        first_article = next(iterator, None)
+        if first_article is None:
+            logger.info("Notionに登録する記事がありません")
+            return success_count, new_count, error_count, new_articles
 
-            except Exception as e:
-                logger.error(f"記事アップサート中にエラーが発生: {e}")
+        # 既存ページの有無をメモリ上で判定できるよう、URLインデックスを一括構築
+        self.prepare_url_index(since=since)
+
+        if workers > 1:
+            logger.info(f"{workers} ワーカーで並行してアップサートします")
+
+        # プロパティの組み立ては送信前にまとめて行い、ワーカーは送信だけを行う
+        results = bounded_map(
+            self._upsert_article_safely,
+            iter_payloads(itertools.chain([first_article], iterator)),
+            workers=workers,
+        )
+        for (article, _), (success, is_new, page_id) in results:
+            if on_result is not None:
+                on_result(article, success, is_new, page_id)
+            if success:
+                success_count += 1
+                if is_new:
+                    new_count += 1
+                    new_articles.append(article)
+            else:
                 error_count += 1
 
         logger.info(
             f"Notionデータベース更新結果: 成功 {success_count}, 新規 {new_count}, エラー {error_count}"
+            f", 変更なし {self.skipped_count - skipped_before}"
         )
         return success_count, new_count, error_count, new_articles
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Notion に送信するページプロパティの組み立てを担当するモジュール
+
+Notion API のサイズ制限（rich_text 1要素あたり2000文字、配列100要素、
+multi_select の選択肢名100文字・カンマ不可、URL 2000文字）に収まるよう
+記事データを変換し、書き込み前にまとめて作成する。
+"""
+
+import logging
+import sys
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sync_state import fingerprint_properties
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+MAX_TEXT_CHARS = 2000  # rich_text / title の1要素あたりの最大文字数
+MAX_RICH_TEXT_ITEMS = 100  # rich_text / title の最大要素数
+MAX_URL_CHARS = 2000  # url プロパティの最大文字数
+MAX_OPTION_CHARS = 100  # multi_select の選択肢名の最大文字数
+MAX_TAGS = 10  # 1記事あたりに登録するタグの最大数
+
+
+@dataclass(frozen=True)
+class NotionPayload:
+    """1記事分の Notion プロパティと、差分更新用のフィンガープリント"""
+
+    properties: Dict[str, Any]
+    fingerprints: Dict[str, str]
+
+
+def chunk_rich_text(text: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    テキストを Notion の rich_text 配列に変換
+
+    MAX_TEXT_CHARS 文字ごとに要素を分け、MAX_RICH_TEXT_ITEMS 要素を
+    超える分は切り捨てる。
+
+    Args:
+        text (str, optional): テキスト
+
+    Returns:
+        list: rich_text 配列（空文字の場合は空のリスト）
+    """
+    if not text:
+        return []
+    limit = MAX_TEXT_CHARS * MAX_RICH_TEXT_ITEMS
+    if len(text) > limit:
+        logger.debug(f"テキストが長すぎるため {limit} 文字に切り詰めます")
+        text = text[:limit]
+    return [
+        {"text": {"content": text[start : start + MAX_TEXT_CHARS]}}
+        for start in range(0, len(text), MAX_TEXT_CHARS)
+    ]
+
+
+@lru_cache(maxsize=4096)
+def normalize_tag(name: str) -> str:
+    """
+    タグ名を multi_select の選択肢名に正規化
+
+    NFKC 正規化・前後の空白除去・カンマの置換・長さの制限を行い、
+    結果はインターンして同じ選択肢名の文字列を記事間で共有する。
+    表記揺れ（全角・半角）による選択肢の増殖を防ぐため、
+    タグごとの結果はキャッシュする。
+
+    Args:
+        name (str): タグ名
+
+    Returns:
+        str: 選択肢名（空文字の場合は登録しない）
+    """
+    normalized = unicodedata.normalize("NFKC", name).replace(",", " ")
+    normalized = " ".join(normalized.split())[:MAX_OPTION_CHARS]
+    return sys.intern(normalized)
+
+
+def build_tag_options(tags: Iterable[str]) -> List[Dict[str, str]]:
+    """
+    タグのリストを multi_select の選択肢に変換
+
+    正規化後に大文字・小文字を区別せず重複を除き、先頭から MAX_TAGS 件までを返す。
+
+    Args:
+        tags (iterable): タグ名
+
+    Returns:
+        list: multi_select の選択肢
+    """
+    options = []
+    seen = set()
+    for tag in tags:
+        name = normalize_tag(tag)
+        key = name.casefold()
+        if not name or key in seen:
+            continue
+        seen.add(key)
+        options.append({"name": name})
+        if len(options) >= MAX_TAGS:
+            break
+    return options
+
+
+def build_properties(article: dict) -> Dict[str, Any]:
+    """
+    記事データから Notion に送信するプロパティを作成
+
+    Args:
+        article (dict): Notion用にフォーマットされた記事データ
+
+    Returns:
+        dict: プロパティ名をキーとする Notion API のプロパティ値
+    """
+    url = article["url"]
+    if url and len(url) > MAX_URL_CHARS:
+        logger.warning(f"URLが長すぎるため切り詰めます: {url[:100]}...")
+        url = url[:MAX_URL_CHARS]
+    return {
+        "title": {"title": chunk_rich_text(article["title"])},
+        "url": {"url": url},
+        "author": {"rich_text": chunk_rich_text(article["author"])},
+        "likes": {"number": article["likes"]},
+        "stocks": {"number": article.get("stocks", 0)},
+        "tags": {"multi_select": build_tag_options(article["tags"])},
+        "summary": {"rich_text": chunk_rich_text(article["summary"])},
+        "created_at": {"date": {"start": article.get("created_at", None)}},
+    }
+
+
+def build_payload(article: dict) -> NotionPayload:
+    """
+    記事データからプロパティとフィンガープリントを作成
+
+    Args:
+        article (dict): Notion用にフォーマットされた記事データ
+
+    Returns:
+        NotionPayload: 送信するプロパティとフィンガープリント
+    """
+    properties = build_properties(article)
+    return NotionPayload(properties, fingerprint_properties(properties))
+
+
+def iter_payloads(articles: Iterable[dict]) -> Iterator[Tuple[dict, NotionPayload]]:
+    """
+    記事ごとに書き込み用のペイロードを作成するジェネレータ
+
+    書き込みワーカーに渡す前にまとめて変換することで、
+    ワーカーはリクエストの送信だけを行う。
+
+    Args:
+        articles (iterable): Notion用にフォーマットされた記事データ
+
+    Yields:
+        tuple: (記事データ, ペイロード)
+    """
+    for article in articles:
+        yield article, build_payload(article)
+
+
+def build_payloads(articles: Iterable[dict]) -> List[Tuple[dict, NotionPayload]]:
+    """
+    記事のリストをまとめてペイロードに変換
+
+    Args:
+        articles (iterable): Notion用にフォーマットされた記事データ
+
+    Returns:
+        list: (記事データ, ペイロード) のリスト（入力順）
+    """
+    return list(iter_payloads(articles))
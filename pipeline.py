@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ストリーミング処理のためのユーティリティを定義するモジュール
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+STAGE_QUEUE_SIZE = 32  # ステージ間のキューに保持する最大要素数
+_STAGE_POLL_INTERVAL = 0.1  # 停止要求を確認する間隔（秒）
+_STAGE_END = object()  # 上流の終了を表す番兵
+
+
+def bounded_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    workers: int = 1,
+    max_pending: int = 0,
+    executor: Optional[Executor] = None,
+) -> Iterator[Tuple[T, R]]:
+    """
+    入力を逐次消費しながら func を適用し、(入力, 結果) を入力順に返すジェネレータ
+
+    executor.map と異なり入力を先読みしすぎないため、
+    同時に保持する要素数は max_pending 件に抑えられる。
+
+    Args:
+        func (callable): 各要素に適用する関数
+        items (iterable): 入力要素
+        workers (int): 並行実行するワーカー数（1以下なら逐次実行）
+        max_pending (int): 同時に保持する未完了要素数の上限（0なら workers の2倍）
+        executor (Executor, optional): 使用するエグゼキュータ（ProcessPoolExecutor など）。
+            省略時は workers 個のスレッドプールを作成する。渡したエグゼキュータは停止しない
+
+    Yields:
+        tuple: (入力要素, func の結果)
+    """
+    if executor is None and workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    max_pending = max_pending or max(workers, 1) * 2
+    if executor is not None:
+        yield from _bounded_submit(executor, func, items, max_pending)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as thread_executor:
+        yield from _bounded_submit(thread_executor, func, items, max_pending)
+
+
+def _bounded_submit(
+    executor: Executor,
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_pending: int,
+) -> Iterator[Tuple[T, R]]:
+    """未完了のタスクを max_pending 件以内に保ちながらエグゼキュータへ投入"""
+    pending: Deque[Tuple[T, Future]] = deque()
+    for item in items:
+        pending.append((item, executor.submit(func, item)))
+        if len(pending) >= max_pending:
+            head, future = pending.popleft()
+            yield head, future.result()
+
+    while pending:
+        head, future = pending.popleft()
+        yield head, future.result()
+
+
+def threaded_stage(
+    items: Iterable[T], maxsize: int = STAGE_QUEUE_SIZE, name: str = "stage"
+) -> Iterator[T]:
+    """
+    上流のイテラブルを専用のスレッドで消費し、上限付きキュー経由で要素を返すジェネレータ
+
+    上流（Qiita のページ取得や要約など）は下流の処理を待たずに先へ進み、
+    キューが maxsize 件で埋まると下流が追いつくまで待つ（バックプレッシャー）。
+    ステージを連結すると各ステージが並行して進むため、全体の所要時間は
+    各ステージの合計ではなく最も遅いステージに近づく。
+
+    上流で発生した例外は下流の次の取得時に送出する。下流が途中で終了した場合
+    （例外や close）は上流のスレッドに停止を伝え、上流のイテレータを閉じて
+    スレッドの終了を待つ。
+
+    Args:
+        items (iterable): 上流の要素（ジェネレータなど）
+        maxsize (int): キューに保持する最大要素数
+        name (str): ステージ名（スレッド名に使用）
+
+    Yields:
+        上流の要素（上流と同じ順序）
+    """
+    buffer: "queue.Queue[Tuple[object, Optional[BaseException]]]" = queue.Queue(
+        maxsize=max(maxsize, 1)
+    )
+    stop = threading.Event()
+
+    def put(entry: Tuple[object, Optional[BaseException]]) -> bool:
+        """停止要求があるまでキューへの追加を試み、追加できたかを返す"""
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=_STAGE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((_STAGE_END, None))
+        except BaseException as e:
+            put((_STAGE_END, e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name=f"pipeline-{name}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _STAGE_END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def close_stages(stages: Iterable[Iterator]) -> None:
+    """
+    threaded_stage で連結したステージを下流から順に閉じる
+
+    下流のステージのスレッドが上流のステージを消費しているため、
+    下流のスレッドの終了を待ってから上流を閉じる。
+
+    Args:
+        stages (iterable): 上流から順に並べた threaded_stage のジェネレータ
+    """
+    for stage in reversed(list(stages)):
+        close = getattr(stage, "close", None)
+        if close is not None:
+            close()
+
+
+async def _aiter(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    """同期・非同期どちらのイテラブルも非同期イテレータとして扱う"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def abounded_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Union[Iterable[T], AsyncIterable[T]],
+    limit: int = 1,
+) -> AsyncIterator[Tuple[T, R]]:
+    """
+    入力を逐次消費しながらコルーチン関数 func を適用し、(入力, 結果) を完了順に返す非同期ジェネレータ
+
+    同時に実行する func は limit 件までに抑えられる。
+    次の入力の取得（上流の非同期ジェネレータ）と実行中のタスクの完了を同時に待つため、
+    上流の処理と func の実行が重なって進む。
+
+    Args:
+        func (callable): 各要素に適用するコルーチン関数
+        items (iterable): 入力要素（非同期イテラブルも可）
+        limit (int): 同時に実行する func の上限
+
+    Yields:
+        tuple: (入力要素, func の結果)
+    """
+    limit = max(limit, 1)
+    iterator = _aiter(items)
+    running: Set[asyncio.Future] = set()
+    fetching: Optional[asyncio.Future] = None
+    exhausted = False
+
+    async def run(item: T) -> Tuple[T, R]:
+        return item, await func(item)
+
+    try:
+        while True:
+            if fetching is None and not exhausted and len(running) < limit:
+                fetching = asyncio.ensure_future(iterator.__anext__())
+            waiting = running | ({fetching} if fetching is not None else set())
+            if not waiting:
+                return
+
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if fetching in done:
+                try:
+                    running.add(asyncio.ensure_future(run(fetching.result())))
+                except StopAsyncIteration:
+                    exhausted = True
+                fetching = None
+            for task in done & running:
+                running.discard(task)
+                yield task.result()
+    finally:
+        # 途中で打ち切られた場合は実行中のタスクを取り消してから上流を閉じる
+        leftover = running | ({fetching} if fetching is not None else set())
+        for task in leftover:
+            task.cancel()
+        await asyncio.gather(*leftover, return_exceptions=True)
+        await iterator.aclose()
@@ -7,20 +7,26 @@ Qiitaからの記事取得を担当するモジュール
 
 import logging
 import os
+import random
+import threading
 import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from sumy.parsers.html import HtmlParser
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-from sumy.nlp.stemmers import Stemmer
-from sumy.utils import get_stop_words
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from utils import format_datetime, parse_iso_datetime
+from metrics import RunMetrics
+from pipeline import bounded_map
+from rate_limit import RateScheduler
+from summarizer import DEFAULT_BACKEND, get_summarizer, warm_up_summarizer
+from summary_cache import SummaryCache
+from utils import format_datetime, get_date_range, parse_iso_datetime
 
 # ロギング設定
 logger = logging.getLogger(__name__)
@@ -29,194 +35,903 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
-class QiitaClient:
-    """Qiita API クライアント"""
+@dataclass(slots=True)
+class QiitaArticle:
+    """
+    フィルタリング以降の処理で使う Qiita 記事のコンパクトな内部表現
+
+    API レスポンスの rendered_body や user/group オブジェクト全体は保持せず、
+    本文（body）は人気記事の条件を満たした記事にのみ設定する。
+    """
+
+    id: str
+    title: str
+    url: str
+    author: str
+    likes: int
+    stocks: int
+    tags: Tuple[str, ...]
+    created_at: str
+    body: str = ""
+
+    @classmethod
+    def from_item(cls, item: dict, keep_body: bool = False) -> "QiitaArticle":
+        """
+        Qiita API の記事データから必要なフィールドのみを取り出して生成
+
+        Args:
+            item (dict): Qiita API から取得した記事データ
+            keep_body (bool): 本文を保持するか
+
+        Returns:
+            QiitaArticle: コンパクトな記事データ
+        """
+        user = item.get("user") or {}
+        return cls(
+            id=item.get("id", ""),
+            title=item.get("title", ""),
+            url=item.get("url", ""),
+            author=user.get("name", user.get("id", "")),
+            likes=item.get("likes_count", 0),
+            stocks=item.get("stocks_count", 0),
+            tags=tuple(tag["name"] for tag in item.get("tags", [])),
+            created_at=item.get("created_at", ""),
+            body=item.get("body", "") if keep_body else "",
+        )
+
+    def to_notion_record(self, summary: str) -> dict:
+        """
+        Notion への書き込みに使う記事データに変換
+
+        Args:
+            summary (str): 要約
+
+        Returns:
+            dict: Notion用にフォーマットされた記事データ
+        """
+        return {
+            "title": self.title,
+            "url": self.url,
+            "author": self.author,
+            "likes": self.likes,
+            "stocks": self.stocks,
+            "tags": list(self.tags),
+            "created_at": self.created_at,
+            "summary": summary,
+        }
+
+
+class BaseQiitaClient(ABC):
+    """
+    Qiita API クライアントの共通部分
+
+    リクエストの組み立て・リトライの判定・検索クエリの作成・人気記事の判定・
+    要約を担い、通信は行わない。requests による同期版（QiitaClient）と
+    httpx による asyncio 版（AsyncQiitaClient）がそれぞれ通信部分を実装する。
+    """
 
     BASE_URL = "https://qiita.com/api/v2"
     PER_PAGE = 100  # 1リクエストあたりの最大取得件数
+    MAX_PAGE = 100  # 検索APIで指定できるページ番号の上限
     RATE_LIMIT = 60  # 1分あたりのリクエスト上限
+    TIMEOUT = 30  # リクエストのタイムアウト（秒）
+    MAX_RETRIES = 5  # 429・5xx・接続エラー時の最大リトライ回数
+    # _make_request でリトライするステータス（5xx はアダプタ層でリトライする）
+    RETRY_STATUSES = (429,)
+    BACKOFF_BASE = 1.0  # 指数バックオフの基準秒数
+    BACKOFF_MAX = 120.0  # 指数バックオフの上限秒数
+    POOL_CONNECTIONS = 4  # 接続プール数（ホスト単位）
+    POOL_MAXSIZE = 10  # 1ホストあたりに保持する最大接続数
+    SUMMARY_LANGUAGE = "japanese"  # 要約に使用する言語
+    # 要約エンジン（"textrank" または "lsa"。環境変数 SUMMARIZER_BACKEND で変更可）
+    SUMMARY_BACKEND = os.getenv("SUMMARIZER_BACKEND", DEFAULT_BACKEND)
+    SUMMARY_SENTENCES = 3  # 要約後の文の数
+    SUMMARY_MIN_LENGTH = 300  # これより短い本文は要約せずそのまま使う
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        summary_cache: Optional[SummaryCache] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[RunMetrics] = None,
+    ) -> None:
+        """
+        初期化
 
-    def __init__(self, token: Optional[str] = None) -> None:
-        """初期化"""
+        Args:
+            token (str, optional): Qiita APIトークン
+            summary_cache (SummaryCache, optional): 要約結果の永続キャッシュ
+            base_url (str, optional): API のベースURL（未指定時は環境変数
+                QIITA_API_BASE_URL、それもなければ BASE_URL。ローカルの模擬サーバー用）
+            metrics (RunMetrics, optional): リクエスト数や所要時間の記録先
+        """
         self.token = token or os.getenv("QIITA_TOKEN")
         if not self.token or len(self.token) < 20:
             raise ValueError("Qiita APIトークンの形式が不正です（20文字以上の英数字）")
+        self.base_url = base_url or os.getenv("QIITA_API_BASE_URL") or self.BASE_URL
 
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
         }
+        self.session = self._create_session()
 
-    def _make_request(self, endpoint: str, params: Optional[dict] = None) -> Any:
-        """APIリクエストを実行"""
-        url = f"{self.BASE_URL}/{endpoint}"
+        # リクエスト数・待機時間などの計測（未指定の場合はクライアント単位で記録）
+        self.metrics = metrics or RunMetrics()
 
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+        # Rate-* ヘッダに基づいてリクエスト間隔を調整するスケジューラ
+        self.rate_scheduler = RateScheduler(
+            sleep=self.metrics.sleeper("rate_limit_sleep_seconds", limiter="qiita")
+        )
+
+        # 要約結果のキャッシュ（未指定の場合は毎回要約する）
+        self.summary_cache = summary_cache
+
+        # 取得エラーで打ち切った検索の件数（差分同期の進捗を進めるかの判定に使う）
+        self.fetch_error_count = 0
+        self._fetch_error_lock = threading.Lock()
+
+    @abstractmethod
+    def _create_session(self) -> Any:
+        """Keep-Alive で接続を再利用する HTTP セッションを作成"""
 
-            # レート制限情報をログ出力
-            remaining = response.headers.get("Rate-Remaining", "Unknown")
-            logger.debug(f"Qiita API レート制限残り: {remaining}")
+    @classmethod
+    def _get_retry_wait(cls, response: Any, attempt: int) -> float:
+        """
+        429 応答後の待機秒数を算出
+
+        Retry-After ヘッダ、Rate-Reset ヘッダ（UNIX時刻）の順に参照し、
+        どちらも無い場合は指数バックオフとする。いずれの場合もジッタを加える。
+
+        Args:
+            response (requests.Response or httpx.Response): 429 応答
+            attempt (int): 何回目の試行か（0始まり）
+
+        Returns:
+            float: 待機秒数
+        """
+        wait_time = None
+
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                wait_time = float(retry_after)
+            except ValueError:
+                wait_time = None
+
+        rate_reset = response.headers.get("Rate-Reset")
+        if wait_time is None and rate_reset:
+            try:
+                wait_time = max(0.0, float(rate_reset) - time.time())
+            except ValueError:
+                wait_time = None
 
-            # レート制限に達しそうな場合は待機
-            if remaining and int(remaining) < 5:
-                logger.warning(
-                    f"Qiita API レート制限に近づいています（残り: {remaining}）"
-                )
-                time.sleep(10)  # 10秒待機
+        if wait_time is None:
+            wait_time = min(cls.BACKOFF_MAX, cls.BACKOFF_BASE * (2**attempt))
 
-            return response.json()
+        return wait_time + random.uniform(0, cls.BACKOFF_BASE * (2**attempt))
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Qiita API リクエストエラー: {e}")
-            if hasattr(e.response, "status_code") and e.response.status_code == 429:
-                wait_time = int(e.response.headers.get("Retry-After", 60))
-                logger.warning(f"レート制限に達しました。{wait_time}秒待機します")
-                time.sleep(wait_time)
-            raise
+    @staticmethod
+    def _endpoint_label(endpoint: str) -> str:
+        """計測用のエンドポイント名（記事IDなどを :id に置き換える）"""
+        name, _, item_id = endpoint.partition("/")
+        return f"{name}/:id" if item_id else name
+
+    def _prepare_request(self, endpoint: str) -> Tuple[str, Dict[str, str]]:
+        """
+        リクエスト先のURLと計測用のラベルを作成
+
+        Args:
+            endpoint (str): "items" や "items/<記事ID>" などのエンドポイント
+
+        Returns:
+            tuple: (URL, ラベル)
+        """
+        labels = {"api": "qiita", "endpoint": self._endpoint_label(endpoint)}
+        return f"{self.base_url}/{endpoint}", labels
+
+    def _record_response(self, response: Any, labels: dict) -> None:
+        """応答ごとのリクエスト数・受信バイト数・エラー数を記録"""
+        self.metrics.increment("api_requests", **labels)
+        self.metrics.increment("api_bytes", len(response.content), **labels)
+        # 接続エラーや 5xx はアダプタ層でリトライされるため、その回数も加える
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        if retries is not None and retries.history:
+            self.metrics.increment("api_retries", len(retries.history), **labels)
+        if response.status_code == 429:
+            self.metrics.increment("api_rate_limited", **labels)
+        elif response.status_code >= 400:
+            self.metrics.increment("api_errors", **labels)
+
+    def _get_retry_delay(
+        self, response: Any, attempt: int, labels: dict
+    ) -> Optional[float]:
+        """
+        応答をリトライするか判定し、リトライする場合は待機秒数を返す
+
+        ステータスが RETRY_STATUSES に含まれ、試行回数が MAX_RETRIES 未満の場合に
+        リトライする。待機秒数は _get_retry_wait で算出する。
+
+        Args:
+            response (requests.Response or httpx.Response): 受け取った応答
+            attempt (int): 何回目の試行か（0始まり）
+            labels (dict): 計測用のラベル
+
+        Returns:
+            float or None: 待機秒数、リトライしない場合は None
+        """
+        if response.status_code not in self.RETRY_STATUSES:
+            return None
+        if attempt >= self.MAX_RETRIES:
+            return None
+        wait_time = self._get_retry_wait(response, attempt)
+        logger.warning(
+            f"Qiita API がステータス {response.status_code} を返しました。{wait_time:.1f}秒後にリトライします (試行{attempt+1}/{self.MAX_RETRIES})"
+        )
+        self.metrics.increment("api_retries", **labels)
+        return wait_time
 
     @staticmethod
     def get_summary(
-        text: str, language: str = "japanese", sentences_count: int = 3
+        text: str,
+        language: str = "japanese",
+        sentences_count: int = 3,
+        backend: str = DEFAULT_BACKEND,
     ) -> str:
         """
         テキストを要約する関数
 
+        要約エンジンは言語・バックエンドごとにプロセス内で共有される。
+
         Args:
             text (str): 要約するテキスト
             language (str): 言語（日本語の場合は"japanese"）
             sentences_count (int): 要約後の文の数
+            backend (str): 要約エンジン（"textrank" または "lsa"）
 
         Returns:
             str: 要約されたテキスト
         """
-        parser = PlaintextParser.from_string(text, Tokenizer(language))
-        stemmer = Stemmer(language)
-        summarizer = LsaSummarizer(stemmer)
-        summarizer.stop_words = get_stop_words(language)
+        return get_summarizer(language, backend).summarize(text, sentences_count)
 
-        # 要約を生成
-        summary_sentences = summarizer(parser.document, sentences_count)
-        summary = " ".join([str(sentence) for sentence in summary_sentences])
+    def _record_fetch_error(self, error: Exception) -> None:
+        """検索の取得エラーをログに出力し、件数を記録"""
+        logger.error(f"記事取得中にエラーが発生しました: {error}")
+        with self._fetch_error_lock:
+            self.fetch_error_count += 1
 
-        return summary
+    def _search_params(self, query: str, page: int) -> Dict[str, Any]:
+        """検索APIのクエリパラメータを作成"""
+        return {"query": query, "per_page": self.PER_PAGE, "page": page}
 
-    def get_popular_articles(
-        self, days: int = 1, min_likes: int = 500, min_stocks: int = 500
-    ) -> List[dict]:
+    def _has_next_page(self, query: str, results: List[dict], page: int) -> bool:
         """
-        指定日数以内の人気記事を取得
+        取得したページの件数から次のページがあるか判定
+
+        ページ上限（MAX_PAGE）に達した場合は警告を出して打ち切る。
 
         Args:
-            days (int): 何日前までの記事を取得するか
+            query (str): 検索クエリ
+            results (list): 取得したページの記事
+            page (int): 取得したページ番号
+
+        Returns:
+            bool: 次のページを取得する場合は True
+        """
+        if len(results) < self.PER_PAGE:
+            return False
+        if page >= self.MAX_PAGE:
+            logger.warning(
+                f"{query}: ページ上限 ({self.MAX_PAGE}) に達したため、以降の記事は取得できません"
+            )
+            return False
+        return True
+
+    @staticmethod
+    def build_date_queries(start_date: datetime, end_date: datetime) -> List[str]:
+        """
+        日付範囲を1日単位の検索クエリに分割
+
+        Args:
+            start_date (datetime): 開始日時
+            end_date (datetime): 終了日時
+
+        Returns:
+            list: "created:>=YYYY-MM-DD created:<YYYY-MM-DD" 形式のクエリのリスト
+        """
+        queries = []
+        day = start_date.date()
+        while day <= end_date.date():
+            next_day = day + timedelta(days=1)
+            queries.append(
+                f"created:>={format_datetime(day)} created:<{format_datetime(next_day)}"
+            )
+            day = next_day
+        return queries
+
+    @staticmethod
+    def add_threshold_qualifiers(
+        queries: List[str], min_likes: int, min_stocks: int
+    ) -> List[str]:
+        """
+        検索クエリにいいね数・ストック数の絞り込み条件を追加
+
+        Qiita の検索は条件の OR を表現できないため、各クエリを
+        "stocks:>=N" と "likes:>=M" の2本に分け、結果は記事IDで重複排除して結合する。
+
+        Args:
+            queries (list): 元の検索クエリのリスト
+            min_likes (int): 最低いいね数
+            min_stocks (int): 最低ストック数
+
+        Returns:
+            list: 絞り込み条件を追加した検索クエリのリスト
+        """
+        return [
+            f"{query} {qualifier}"
+            for query in queries
+            for qualifier in (f"stocks:>={min_stocks}", f"likes:>={min_likes}")
+        ]
+
+    @classmethod
+    def build_search_queries(
+        cls,
+        start_date: datetime,
+        end_date: datetime,
+        search_thresholds: Optional[Tuple[int, int]] = None,
+    ) -> List[str]:
+        """
+        検索期間と絞り込み条件から検索クエリのリストを作成
+
+        期間が1日を超える場合は1日単位のクエリに分割し、
+        ページ上限による取りこぼしを防ぐ。
+
+        Args:
+            start_date (datetime): 検索を開始する日時
+            end_date (datetime): 検索を終了する日時
+            search_thresholds (tuple, optional): 検索クエリで絞り込む (いいね数, ストック数)
+
+        Returns:
+            list: 検索クエリのリスト
+        """
+        if end_date - start_date > timedelta(days=1):
+            queries = cls.build_date_queries(start_date, end_date)
+        else:
+            queries = [f"created:>={format_datetime(start_date)}"]
+
+        if search_thresholds is not None:
+            queries = cls.add_threshold_qualifiers(queries, *search_thresholds)
+        return queries
+
+    @staticmethod
+    def is_popular_article(
+        article: QiitaArticle,
+        start_date: datetime,
+        end_date: datetime,
+        min_likes: int,
+        min_stocks: int,
+    ) -> bool:
+        """
+        記事が期間内かつ人気記事の条件を満たすか判定
+
+        Args:
+            article (QiitaArticle): 判定する記事
+            start_date (datetime): 期間の開始日時
+            end_date (datetime): 期間の終了日時
             min_likes (int): 最低いいね数（LGTM or Stock）
             min_stocks (int): 最低ストック数（LGTM or Stock）
 
         Returns:
-            list: 条件を満たす記事のリスト
+            bool: 条件を満たす場合は True
         """
-        # 日付範囲を計算 (タイムゾーン情報を含む)
-        from utils import get_date_range
+        article_date = parse_iso_datetime(article.created_at)
+
+        # 日付が範囲内かチェック
+        # タイムゾーン情報を無視してUTCとして比較
+        article_date_naive = article_date.replace(tzinfo=None)
+        start_date_naive = start_date.replace(tzinfo=None)
+        end_date_naive = end_date.replace(tzinfo=None)
+
+        if not start_date_naive <= article_date_naive <= end_date_naive:
+            return False
+
+        # いいね数またはストック数が条件を満たすか
+        return article.likes >= min_likes or article.stocks >= min_stocks
+
+    def _to_popular_article(
+        self,
+        item: dict,
+        start_date: datetime,
+        end_date: datetime,
+        min_likes: int,
+        min_stocks: int,
+        on_article: Optional[Callable[[QiitaArticle], None]] = None,
+    ) -> Optional[QiitaArticle]:
+        """
+        API の記事データを変換し、人気記事の条件を満たす場合のみ返す
 
-        start_date, end_date = get_date_range(days)
+        必要なフィールドのみを取り出し、本文は条件を満たした記事にだけ残す。
 
-        # 日付文字列に変換
-        date_str = format_datetime(start_date)
+        Args:
+            item (dict): Qiita API から取得した記事データ
+            start_date (datetime): 期間の開始日時
+            end_date (datetime): 期間の終了日時
+            min_likes (int): 最低いいね数（LGTM or Stock）
+            min_stocks (int): 最低ストック数（LGTM or Stock）
+            on_article (callable, optional): 条件に関わらず変換した記事に対して呼び出すコールバック
 
-        logger.info(f"{date_str} 以降の記事を検索中...")
+        Returns:
+            QiitaArticle or None: 条件を満たす記事（本文を含む）、満たさない場合は None
+        """
+        article = QiitaArticle.from_item(item)
+        if on_article is not None:
+            on_article(article)
+        if not self.is_popular_article(
+            article, start_date, end_date, min_likes, min_stocks
+        ):
+            return None
+        article.body = item.get("body", "")
+        return article
+
+    @staticmethod
+    def summarize_article(article: QiitaArticle) -> str:
+        """
+        記事本文から Notion に登録する要約を作成
+
+        プロセスプールのワーカーからも呼び出せるよう、インスタンスの状態に依存しない。
+
+        Args:
+            article (QiitaArticle): 本文を含む記事データ
+
+        Returns:
+            str: 要約（短い本文の場合は本文そのもの）
+        """
+        body = article.body
+        if len(body) > BaseQiitaClient.SUMMARY_MIN_LENGTH:
+            return BaseQiitaClient.get_summary(
+                body,
+                language=BaseQiitaClient.SUMMARY_LANGUAGE,
+                sentences_count=BaseQiitaClient.SUMMARY_SENTENCES,
+                backend=BaseQiitaClient.SUMMARY_BACKEND,
+            )
+        return body[: BaseQiitaClient.SUMMARY_MIN_LENGTH]
+
+    @staticmethod
+    def _summarize_uncached(
+        pending: Tuple[QiitaArticle, Optional[str]],
+    ) -> Tuple[str, float]:
+        """
+        キャッシュ済みの要約があればそれを返し、なければ要約を作成
+
+        Returns:
+            tuple: (要約, 要約にかかった秒数)。ワーカープロセスでの所要時間を親プロセスで記録する
+        """
+        article, cached_summary = pending
+        if cached_summary is not None:
+            return cached_summary, 0.0
+        started = time.perf_counter()
+        summary = BaseQiitaClient.summarize_article(article)
+        return summary, time.perf_counter() - started
+
+    @classmethod
+    def summary_params(cls) -> str:
+        """要約結果に影響するパラメータを表す文字列（キャッシュキーに使用）"""
+        return (
+            f"{cls.SUMMARY_BACKEND}:{cls.SUMMARY_LANGUAGE}:{cls.SUMMARY_SENTENCES}"
+            f":{cls.SUMMARY_MIN_LENGTH}"
+        )
+
+    def get_cached_summary(self, article: QiitaArticle) -> Optional[str]:
+        """
+        キャッシュ済みの要約を取得
+
+        Args:
+            article (QiitaArticle): 本文を含む記事データ
+
+        Returns:
+            str or None: キャッシュ済みの要約、キャッシュが無効または未登録の場合は None
+        """
+        if self.summary_cache is None or not article.id:
+            return None
+        return self.summary_cache.get(article.id, article.body, self.summary_params())
+
+    def store_summary(self, article: QiitaArticle, summary: str) -> None:
+        """
+        要約をキャッシュに保存
+
+        Args:
+            article (QiitaArticle): 本文を含む記事データ
+            summary (str): 要約
+        """
+        if self.summary_cache is None or not article.id:
+            return
+        self.summary_cache.put(article.id, article.body, self.summary_params(), summary)
+
+
+class QiitaClient(BaseQiitaClient):
+    """Qiita API クライアント"""
+
+    def _create_session(self) -> requests.Session:
+        """
+        Keep-Alive で接続を再利用するセッションを作成
+
+        接続エラーと 5xx はアダプタ層でジッタ付き指数バックオフによりリトライする。
+        429 は Retry-After / Rate-Reset ヘッダを参照するため _make_request で扱う。
+        """
+        retry = Retry(
+            total=self.MAX_RETRIES,
+            connect=self.MAX_RETRIES,
+            read=self.MAX_RETRIES,
+            status=self.MAX_RETRIES,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            backoff_factor=self.BACKOFF_BASE,
+            backoff_jitter=self.BACKOFF_BASE,
+            backoff_max=self.BACKOFF_MAX,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
-        page = 1
-        all_articles = []
-        popular_articles = []
+    def close(self) -> None:
+        """セッションを閉じてプール中の接続を解放"""
+        self.session.close()
+
+    def _make_request(self, endpoint: str, params: Optional[dict] = None) -> Any:
+        """APIリクエストを実行"""
+        url, labels = self._prepare_request(endpoint)
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                self.rate_scheduler.wait()
+                with self.metrics.timer("qiita_request"):
+                    response = self.session.get(
+                        url, params=params, timeout=self.TIMEOUT
+                    )
+                self.rate_scheduler.update(response.headers)
+                self._record_response(response, labels)
+
+                # レート制限超過時はヘッダに従って待機し、リトライする
+                wait_time = self._get_retry_delay(response, attempt, labels)
+                if wait_time is not None:
+                    self.metrics.sleep(wait_time, "retry_sleep_seconds", **labels)
+                    continue
+
+                response.raise_for_status()
+
+                # レート制限情報をログ出力（待機は rate_scheduler が次回送信前に行う）
+                remaining = response.headers.get("Rate-Remaining", "Unknown")
+                logger.debug(f"Qiita API レート制限残り: {remaining}")
+
+                return response.json()
+
+            except requests.exceptions.RequestException as e:
+                if e.response is None:
+                    self.metrics.increment("api_errors", **labels)
+                logger.error(f"Qiita API リクエストエラー: {e}")
+                raise
+
+    def iter_search_pages(
+        self, query: str, start_page: int = 1, raise_errors: bool = False
+    ) -> Iterator[List[dict]]:
+        """
+        検索クエリに一致する記事をページ単位で順に返すジェネレータ
+
+        Qiita API はページ番号の上限（MAX_PAGE）を超えて取得できないため、
+        上限に達した場合は警告を出して打ち切る。
+
+        Args:
+            query (str): Qiita の検索クエリ
+            start_page (int): 取得を開始するページ番号（中断したバックフィルの再開用）
+            raise_errors (bool): 取得エラー時に打ち切らず例外を送出するか
+
+        Yields:
+            list: 1ページ分の記事のリスト
+        """
+        page = start_page
+        total = 0
         has_next = True
 
-        # ページネーションで全記事を取得
         while has_next:
-            # 検索クエリ
-            query = f"created:>={date_str}"
-            params = {"query": query, "per_page": self.PER_PAGE, "page": page}
+            params = self._search_params(query, page)
 
             logger.debug(f"Qiita検索: {query} (ページ {page})")
 
             try:
                 results = self._make_request("items", params)
+            except Exception as e:
+                self._record_fetch_error(e)
+                if raise_errors:
+                    raise
+                break
 
-                if not results:
-                    logger.debug("検索結果がありません")
-                    break
+            if not results:
+                logger.debug("検索結果がありません")
+                break
 
-                all_articles.extend(results)
-                logger.info(
-                    f"合計 {len(all_articles)} 記事を取得しました (ページ {page})"
-                )
+            total += len(results)
+            logger.info(f"{query}: 合計 {total} 記事を取得しました (ページ {page})")
 
-                # 次のページがあるか判断
-                has_next = len(results) == self.PER_PAGE
-                page += 1
+            # 次のページがあるか判断
+            has_next = self._has_next_page(query, results, page)
+            page += 1
 
-                # API制限に達しないよう1秒スリープ
-                time.sleep(1)
+            yield results
 
-            except Exception as e:
-                logger.error(f"記事取得中にエラーが発生しました: {e}")
-                break
+    def search_items(self, query: str) -> List[dict]:
+        """
+        検索クエリに一致する記事をページネーションですべて取得
+
+        Args:
+            query (str): Qiita の検索クエリ
+
+        Returns:
+            list: 取得した記事のリスト
+        """
+        return [article for page in self.iter_search_pages(query) for article in page]
+
+    def iter_articles(self, queries: List[str], workers: int = 1) -> Iterator[dict]:
+        """
+        複数の検索クエリを実行し、記事IDで重複排除しながら順に返すジェネレータ
+
+        逐次実行時はページ単位で記事を返す。workers が2以上の場合は
+        クエリ単位で並行に取得し、完了したクエリから入力順に返す。
+        リクエスト間隔は全ワーカーで共有する rate_scheduler が制御する。
+
+        Args:
+            queries (list): 検索クエリのリスト
+            workers (int): 並行して検索するワーカー数
+
+        Yields:
+            dict: 重複を除いた記事
+        """
+        if workers > 1 and len(queries) > 1:
+            logger.info(
+                f"{len(queries)} 件のクエリを {workers} ワーカーで並行取得します"
+            )
+            batches = (
+                result for _, result in bounded_map(self.search_items, queries, workers)
+            )
+        else:
+            batches = (
+                page for query in queries for page in self.iter_search_pages(query)
+            )
+
+        seen_ids = set()
+        for batch in batches:
+            for article in batch:
+                article_id = article.get("id")
+                if article_id in seen_ids:
+                    continue
+                seen_ids.add(article_id)
+                yield article
+
+    def fetch_articles(self, queries: List[str], workers: int = 1) -> List[dict]:
+        """
+        複数の検索クエリを実行し、結果を記事IDで重複排除して結合
+
+        Args:
+            queries (list): 検索クエリのリスト
+            workers (int): 並行して検索するワーカー数
+
+        Returns:
+            list: 重複を除いた記事のリスト
+        """
+        return list(self.iter_articles(queries, workers=workers))
+
+    def iter_popular_articles(
+        self,
+        days: int = 1,
+        min_likes: int = 500,
+        min_stocks: int = 500,
+        workers: int = 1,
+        fetch_from: Optional[datetime] = None,
+        on_article: Optional[Callable[[QiitaArticle], None]] = None,
+        search_thresholds: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[QiitaArticle]:
+        """
+        指定日数以内の人気記事を取得しながら順に返すジェネレータ
+
+        取得したページごとにフィルタリングするため、
+        条件を満たさない記事を保持し続けることはない。
+        検索範囲が1日を超える場合は検索を1日単位のクエリに分割し、
+        ページ上限による取りこぼしを防ぐ。
+
+        Args:
+            days (int): 何日前までの記事を取得するか
+            min_likes (int): 最低いいね数（LGTM or Stock）
+            min_stocks (int): 最低ストック数（LGTM or Stock）
+            workers (int): 並行して検索するワーカー数
+            fetch_from (datetime, optional): 検索を開始する日時（差分取得用）。
+                期間の開始日時より前の場合は期間の開始日時から検索する
+            on_article (callable, optional): 取得したすべての記事（条件を満たさないものを含む）
+                に対して呼び出すコールバック
+            search_thresholds (tuple, optional): 検索クエリで絞り込む (いいね数, ストック数)。
+                指定した場合はサーバー側で絞り込み、取得件数を減らす（最終判定は min_likes /
+                min_stocks で行う）
+
+        Yields:
+            QiitaArticle: 条件を満たす記事
+        """
+        # 日付範囲を計算 (タイムゾーン情報を含む)
+        start_date, end_date = get_date_range(days)
+        search_start = max(start_date, fetch_from) if fetch_from else start_date
+
+        # 日付文字列に変換
+        date_str = format_datetime(search_start)
 
-        # 人気記事をフィルタリング
-        for article in all_articles:
-            article_date = parse_iso_datetime(article["created_at"])
+        logger.info(f"{date_str} 以降の記事を検索中...")
+
+        queries = self.build_search_queries(search_start, end_date, search_thresholds)
 
-            # 日付が範囲内かチェック
-            # タイムゾーン情報を無視してUTCとして比較
-            article_date_naive = article_date.replace(tzinfo=None)
-            start_date_naive = start_date.replace(tzinfo=None)
-            end_date_naive = end_date.replace(tzinfo=None)
+        total_count = 0
+        popular_count = 0
+        for item in self.iter_articles(queries, workers=workers):
+            total_count += 1
+            article = self._to_popular_article(
+                item, start_date, end_date, min_likes, min_stocks, on_article
+            )
+            if article is not None:
+                popular_count += 1
+                yield article
 
-            if start_date_naive <= article_date_naive <= end_date_naive:
-                # いいね数またはストック数が条件を満たすか
-                likes = article.get("likes_count", 0)
-                stocks = article.get("stocks_count", 0)
+        logger.info(f"{total_count} 記事中、{popular_count} 件が条件に一致しました")
 
-                if likes >= min_likes or stocks >= min_stocks:
-                    popular_articles.append(article)
+    def get_item(self, item_id: str) -> dict:
+        """
+        記事IDを指定して1件の記事を取得
 
-        logger.info(
-            f"{len(all_articles)} 記事中、{len(popular_articles)} 件が条件に一致しました"
+        Args:
+            item_id (str): 記事ID
+
+        Returns:
+            dict: Qiita API から取得した記事データ
+        """
+        return self._make_request(f"items/{item_id}")
+
+    def iter_refreshed_articles(
+        self,
+        item_ids: Iterable[str],
+        start_date: datetime,
+        end_date: datetime,
+        min_likes: int = 500,
+        min_stocks: int = 500,
+        on_article: Optional[Callable[[QiitaArticle], None]] = None,
+    ) -> Iterator[QiitaArticle]:
+        """
+        指定した記事の最新のいいね数・ストック数を取得し、条件を満たすものを返すジェネレータ
+
+        Args:
+            item_ids (iterable): 再確認する記事IDのリスト
+            start_date (datetime): 期間の開始日時
+            end_date (datetime): 期間の終了日時
+            min_likes (int): 最低いいね数（LGTM or Stock）
+            min_stocks (int): 最低ストック数（LGTM or Stock）
+            on_article (callable, optional): 取得したすべての記事に対して呼び出すコールバック
+
+        Yields:
+            QiitaArticle: 条件を満たすようになった記事
+        """
+        for item_id in item_ids:
+            try:
+                item = self.get_item(item_id)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"記事 {item_id} の再確認中にエラーが発生しました: {e}")
+                continue
+
+            article = self._to_popular_article(
+                item, start_date, end_date, min_likes, min_stocks, on_article
+            )
+            if article is not None:
+                yield article
+
+    def get_popular_articles(
+        self,
+        days: int = 1,
+        min_likes: int = 500,
+        min_stocks: int = 500,
+        workers: int = 1,
+    ) -> List[QiitaArticle]:
+        """
+        指定日数以内の人気記事を取得
+
+        Args:
+            days (int): 何日前までの記事を取得するか
+            min_likes (int): 最低いいね数（LGTM or Stock）
+            min_stocks (int): 最低ストック数（LGTM or Stock）
+            workers (int): 並行して検索するワーカー数
+
+        Returns:
+            list: 条件を満たす記事のリスト
+        """
+        return list(
+            self.iter_popular_articles(
+                days=days, min_likes=min_likes, min_stocks=min_stocks, workers=workers
+            )
         )
-        return popular_articles
 
-    def format_article_for_notion(self, article: dict) -> dict:
+    def format_article_for_notion(
+        self, article: Union[QiitaArticle, dict], summary: Optional[str] = None
+    ) -> dict:
         """
         Qiita記事をNotion用に整形
 
         Args:
-            article (dict): Qiita API から取得した記事データ
+            article (QiitaArticle or dict): 記事データ（API の記事データも受け付ける）
+            summary (str, optional): 作成済みの要約。省略時は本文から作成する
 
         Returns:
             dict: Notion用にフォーマットされた記事データ
         """
-        # タグ情報を抽出
-        tags = [tag["name"] for tag in article.get("tags", [])]
+        if isinstance(article, dict):
+            article = QiitaArticle.from_item(article, keep_body=True)
+
+        # 本文を要約（キャッシュにあれば再利用）
+        if summary is None:
+            summary = self.get_cached_summary(article)
+            if summary is None:
+                with self.metrics.timer("summarize"):
+                    summary = self.summarize_article(article)
+                self.store_summary(article, summary)
+
+        return article.to_notion_record(summary)
+
+    def iter_format_articles_for_notion(
+        self, articles: Iterable[Union[QiitaArticle, dict]], workers: int = 1
+    ) -> Iterator[dict]:
+        """
+        記事を1件ずつNotion用に整形するジェネレータ
 
-        # 本文を要約
-        body = article.get("body", "")
-        if len(body) > 300:
-            summary = self.get_summary(body)
-        else:
-            summary = body[:300]
+        要約は記事が消費されるタイミングで遅延実行される。
+        workers が2以上の場合は要約をプロセスプールで並列に実行し、
+        結果は入力順に返す。各ワーカーは起動時に要約エンジンを一度だけ構築する。
 
-        return {
-            "title": article.get("title", ""),
-            "url": article.get("url", ""),
-            "author": article.get("user", {}).get(
-                "name", article.get("user", {}).get("id", "")
-            ),
-            "likes": article.get("likes_count", 0),
-            "stocks": article.get("stocks_count", 0),
-            "tags": tags,
-            "created_at": article.get("created_at", ""),
-            "summary": summary,
-        }
+        Args:
+            articles (iterable): 記事データ
+            workers (int): 要約を並列実行するプロセス数
+
+        Yields:
+            dict: Notion用にフォーマットされた記事データ
+        """
+        records = (
+            (
+                QiitaArticle.from_item(article, keep_body=True)
+                if isinstance(article, dict)
+                else article
+            )
+            for article in articles
+        )
+
+        if workers <= 1:
+            for article in records:
+                yield self.format_article_for_notion(article)
+            return
+
+        # キャッシュの参照はメインプロセスで行い、未キャッシュの記事のみを要約させる
+        pending = ((article, self.get_cached_summary(article)) for article in records)
+
+        logger.info(f"{workers} プロセスで並列に要約します")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=warm_up_summarizer,
+            initargs=(self.SUMMARY_LANGUAGE, self.SUMMARY_BACKEND),
+        ) as executor:
+            summaries = bounded_map(
+                self._summarize_uncached, pending, workers=workers, executor=executor
+            )
+            for (article, cached_summary), (summary, elapsed) in summaries:
+                if cached_summary is None:
+                    self.metrics.add_time("summarize", elapsed)
+                    self.store_summary(article, summary)
+                yield self.format_article_for_notion(article, summary=summary)
 
     @staticmethod
     def summarize_text(text: str, sentence_count: int = 3) -> str:
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+APIリクエストのレート制御を担当するモジュール
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Mapping, Optional
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    スレッドセーフなトークンバケット
+
+    rate 個/秒 の速度でトークンが補充され、最大 capacity 個まで蓄積される。
+    複数のワーカーで1つのインスタンスを共有することで、
+    全体のリクエスト速度を rate 以下に抑える。
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            rate (float): 1秒あたりに補充されるトークン数
+            capacity (float): バケットに蓄積できる最大トークン数
+            clock (callable): 現在時刻（秒）を返す関数
+            sleep (callable): 指定秒数待機する関数
+        """
+        if rate <= 0:
+            raise ValueError("rate は正の数で指定してください")
+        if capacity < 1:
+            raise ValueError("capacity は1以上で指定してください")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """経過時間に応じてトークンを補充（ロック取得済みで呼ぶこと）"""
+        now = self._clock()
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        トークンを待機せずに取得
+
+        Args:
+            tokens (float): 取得するトークン数
+
+        Returns:
+            bool: 取得できた場合は True
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        トークンを予約し、利用可能になるまでの待機秒数を返す
+
+        待機は呼び出し側で行う（asyncio のイベントループを止めずに待機する場合など）。
+        予約した順に送信枠が割り当てられる。
+
+        Args:
+            tokens (float): 予約するトークン数
+
+        Returns:
+            float: 送信まで待機すべき秒数
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        トークンが利用可能になるまで待機してから取得
+
+        Args:
+            tokens (float): 取得するトークン数
+
+        Returns:
+            float: 待機した合計秒数
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait_time = (tokens - self._tokens) / self.rate
+
+            self._sleep(wait_time)
+            waited += wait_time
+
+
+class RateScheduler:
+    """
+    レスポンスヘッダに基づく適応的なレートスケジューラ
+
+    Rate-Limit / Rate-Remaining / Rate-Reset ヘッダから残りリクエスト数と
+    リセットまでの時間を把握し、残量が十分なうちは待機せずに送信する。
+    残量が slowdown_ratio を下回ると、リセットまでの残り時間に
+    残りリクエストを均等に割り振るよう送信間隔を空ける。
+    """
+
+    def __init__(
+        self,
+        slowdown_ratio: float = 0.2,
+        reserve: int = 1,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            slowdown_ratio (float): 残量がこの割合を下回ったら減速を始める
+            reserve (int): 使い切らずに残しておくリクエスト数
+            clock (callable): 現在のUNIX時刻（秒）を返す関数
+            sleep (callable): 指定秒数待機する関数
+        """
+        self.slowdown_ratio = slowdown_ratio
+        self.reserve = reserve
+        self._clock = clock
+        self._sleep = sleep
+        self._limit: Optional[int] = None
+        self._remaining: Optional[int] = None
+        self._reset_at: Optional[float] = None
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse_int(value: Optional[str]) -> Optional[int]:
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        レスポンスヘッダからレート制限の状態を更新
+
+        Args:
+            headers (Mapping): Rate-Limit / Rate-Remaining / Rate-Reset を含むヘッダ
+        """
+        limit = self._parse_int(headers.get("Rate-Limit"))
+        remaining = self._parse_int(headers.get("Rate-Remaining"))
+        reset_at = self._parse_int(headers.get("Rate-Reset"))
+
+        with self._lock:
+            if limit is not None:
+                self._limit = limit
+            if remaining is not None:
+                self._remaining = remaining
+            if reset_at is not None:
+                self._reset_at = float(reset_at)
+
+    def _next_delay(self, now: float) -> float:
+        """次のリクエストまでに空けるべき間隔（ロック取得済みで呼ぶこと）"""
+        if self._remaining is None or self._reset_at is None:
+            return 0.0
+
+        # リセット時刻を過ぎていれば、上限まで回復したとみなす
+        if now >= self._reset_at:
+            self._remaining = self._limit
+            self._reset_at = None
+            return 0.0
+
+        if self._limit and self._remaining > self._limit * self.slowdown_ratio:
+            return 0.0
+
+        time_left = self._reset_at - now
+        usable = self._remaining - self.reserve
+        if usable <= 0:
+            return time_left
+        return time_left / usable
+
+    def reserve_slot(self) -> float:
+        """
+        次のリクエストの送信枠を予約し、送信まで待機すべき秒数を返す
+
+        待機は呼び出し側で行う（asyncio のイベントループを止めずに待機する場合など）。
+
+        Returns:
+            float: 送信まで待機すべき秒数
+        """
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self._next_delay(start)
+            if self._remaining is not None and self._remaining > 0:
+                self._remaining -= 1
+            return start - now
+
+    def wait(self) -> float:
+        """
+        次のリクエストを送信してよい時刻まで待機
+
+        複数スレッドから呼ばれた場合も、送信枠を順番に割り当てる。
+
+        Returns:
+            float: 待機した秒数
+        """
+        delay = self.reserve_slot()
+        if delay > 0:
+            logger.debug(f"レート制限に合わせて {delay:.2f} 秒待機します")
+            self._sleep(delay)
+        return delay
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """直近に把握している残りリクエスト数"""
+        return self._remaining
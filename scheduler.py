@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+定時実行（cron 形式のスケジュール）を担当するモジュール
+
+スケジュールは日本時間（JST）で評価し、次の実行時刻まで待機してから実行する。
+実行はロックファイルで1プロセスに限定し、停止中に実行されなかった分は
+再起動時に1回だけ実行する。
+"""
+
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from utils import JST, get_jst_now, parse_iso_datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+class CronSchedule:
+    """
+    cron 形式（分 時 日 月 曜日）のスケジュール
+
+    各フィールドは "*"、"5"、"1-5"、"*/15"、"0-30/10"、"1,15" の形式に対応する。
+    曜日は0（または7）が日曜日。日と曜日の両方を指定した場合は cron と同様に
+    いずれかに一致すれば実行する。"@hourly" / "@daily" / "@weekly" / "@monthly" も使える。
+    """
+
+    FIELDS = (
+        ("分", 0, 59),
+        ("時", 0, 23),
+        ("日", 1, 31),
+        ("月", 1, 12),
+        ("曜日", 0, 7),
+    )
+    ALIASES = {
+        "@hourly": "0 * * * *",
+        "@daily": "0 0 * * *",
+        "@weekly": "0 0 * * 0",
+        "@monthly": "0 0 1 * *",
+    }
+    MAX_STEPS = 10000  # 次の実行時刻の探索を打ち切る試行回数
+
+    def __init__(self, expression: str) -> None:
+        """
+        初期化
+
+        Args:
+            expression (str): cron 形式の文字列（例: "0 7 * * *"）
+        """
+        self.expression = expression
+        fields = self.ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != len(self.FIELDS):
+            raise ValueError(
+                f"cron 形式は「分 時 日 月 曜日」の5項目で指定してください: {expression}"
+            )
+        parsed = [
+            self._parse_field(text, name, low, high)
+            for text, (name, low, high) in zip(fields, self.FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # 7 も日曜日として扱い、datetime.weekday()（月曜日が0）の値に変換する
+        self.weekdays = frozenset((day - 1) % 7 for day in weekdays)
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+    @staticmethod
+    def _parse_field(text: str, name: str, low: int, high: int) -> FrozenSet[int]:
+        """cron の1フィールドを値の集合に変換"""
+        values = set()
+        for part in text.split(","):
+            range_text, _, step_text = part.partition("/")
+            try:
+                step = int(step_text) if step_text else 1
+                if range_text == "*":
+                    start, end = low, high
+                elif "-" in range_text:
+                    start, end = (int(value) for value in range_text.split("-", 1))
+                else:
+                    start = int(range_text)
+                    end = high if step_text else start
+            except ValueError:
+                raise ValueError(f"cron の{name}の指定が不正です: {text}") from None
+            if step < 1 or not low <= start <= end <= high:
+                raise ValueError(f"cron の{name}の指定が範囲外です: {text}")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _matches_day(self, dt: datetime) -> bool:
+        """日・曜日の条件を満たすか判定"""
+        day_match = dt.day in self.days
+        weekday_match = dt.weekday() in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_match and weekday_match
+        return day_match or weekday_match
+
+    def next_after(self, dt: datetime) -> datetime:
+        """
+        指定日時より後の最初の実行時刻を取得
+
+        一致しない月・日・時はまとめて読み飛ばすため、探索は数百ステップ以内に収まる。
+
+        Args:
+            dt (datetime): 基準日時（タイムゾーン付き）
+
+        Returns:
+            datetime: 次の実行時刻（JST）
+        """
+        candidate = dt.astimezone(JST).replace(second=0, microsecond=0)
+        candidate += timedelta(minutes=1)
+        for _ in range(self.MAX_STEPS):
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.year * 12 + candidate.month, 12)
+                candidate = candidate.replace(
+                    year=year, month=month + 1, day=1, hour=0, minute=0
+                )
+            elif not self._matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"実行時刻が見つからないスケジュールです: {self.expression}")
+
+
+@dataclass(frozen=True)
+class ScheduledJob:
+    """
+    定時実行するジョブ
+
+    options は daily_job の引数のうち、このスケジュールだけ変更するもの
+    （例: 毎時の軽量な差分同期では {"incremental": true, "backfill_days": 1}）。
+    """
+
+    name: str
+    schedule: CronSchedule
+    options: Dict[str, Any] = field(default_factory=dict)
+    catch_up: bool = True
+    jitter: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScheduledJob":
+        """
+        設定ファイルの1エントリから生成
+
+        Args:
+            data (dict): name, cron, options, catch_up, jitter を持つ辞書
+
+        Returns:
+            ScheduledJob: 定時実行するジョブ
+        """
+        name = data.get("name")
+        if not name:
+            raise ValueError("スケジュールの name が指定されていません")
+        if not data.get("cron"):
+            raise ValueError(f"スケジュール {name} の cron が指定されていません")
+        return cls(
+            name=name,
+            schedule=CronSchedule(data["cron"]),
+            options=dict(data.get("options", {})),
+            catch_up=bool(data.get("catch_up", True)),
+            jitter=float(data.get("jitter", 0.0)),
+        )
+
+
+def load_schedules(path: str) -> List[ScheduledJob]:
+    """
+    スケジュールの設定ファイル（JSON）を読み込む
+
+    形式: {"schedules": [{"name": "daily", "cron": "0 7 * * *"},
+                         {"name": "hourly", "cron": "0 8-23 * * *",
+                          "options": {"incremental": true}}]}
+
+    Args:
+        path (str): 設定ファイルのパス
+
+    Returns:
+        list: ScheduledJob のリスト
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    jobs = [ScheduledJob.from_dict(entry) for entry in config.get("schedules", [])]
+    if not jobs:
+        raise ValueError(f"スケジュールが定義されていません: {path}")
+    names = [job.name for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"スケジュール名が重複しています: {', '.join(duplicates)}")
+    return jobs
+
+
+class JobLock:
+    """
+    ロックファイルによるプロセス間の排他制御
+
+    OS のファイルロック（flock）を使うため、プロセスが異常終了しても
+    ロックは自動的に解放され、ファイルが残っていても次の実行は妨げない。
+    """
+
+    DEFAULT_PATH = "daily_job.lock"
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        """
+        初期化
+
+        Args:
+            path (str): ロックファイルのパス
+        """
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """
+        待たずにロックの取得を試みる
+
+        Returns:
+            bool: 取得できた場合は True（他のプロセスが保持している場合は False）
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        # 調査用に保持しているプロセスのIDを書き込む
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """ロックを解放"""
+        if self._fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._fd)
+        self._fd = None
+
+
+class ScheduleState:
+    """
+    SQLite によるスケジュールごとの最終実行時刻の記録
+
+    再起動時に、停止中に実行されなかったスケジュールを検出するために使う。
+    """
+
+    DEFAULT_PATH = "scheduler_state.sqlite3"
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        """
+        初期化
+
+        Args:
+            path (str): SQLite データベースファイルのパス（":memory:" も可）
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS schedule_runs (
+                name TEXT PRIMARY KEY,
+                last_run TEXT NOT NULL
+            )
+            """)
+        self._conn.commit()
+
+    def get_last_run(self, name: str) -> Optional[datetime]:
+        """
+        スケジュールの最終実行時刻を取得
+
+        Args:
+            name (str): スケジュール名
+
+        Returns:
+            datetime or None: 最終実行時刻（未実行の場合は None）
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_run FROM schedule_runs WHERE name = ?", (name,)
+            ).fetchone()
+        return parse_iso_datetime(row[0]) if row else None
+
+    def record_run(self, name: str, at: datetime) -> None:
+        """
+        スケジュールの実行時刻を記録
+
+        Args:
+            name (str): スケジュール名
+            at (datetime): 実行時刻
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO schedule_runs (name, last_run) VALUES (?, ?)",
+                (name, at.isoformat()),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+
+
+class Scheduler:
+    """
+    複数の cron スケジュールでジョブを実行するスケジューラ
+
+    - 次の実行時刻まで待機する（ポーリングしないため実行が遅れない）
+    - 実行中に過ぎた実行時刻はまとめて読み飛ばし、実行が積み重ならない
+    - 実行はロックファイルで排他し、他のプロセスが実行中の場合はその回を見送る
+    - 停止中に実行時刻を過ぎたスケジュールは、起動直後に1回だけ実行する（catch_up）
+    """
+
+    MAX_SLEEP = 300.0  # 1回の待機の上限（秒）。時刻の変更やサスペンドからの復帰に備える
+
+    def __init__(
+        self,
+        jobs: List[ScheduledJob],
+        run_job: Callable[[ScheduledJob], None],
+        lock_path: Optional[str] = JobLock.DEFAULT_PATH,
+        state_path: Optional[str] = ScheduleState.DEFAULT_PATH,
+        clock: Callable[[], datetime] = get_jst_now,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            jobs (list): 定時実行するジョブ
+            run_job (callable): ジョブを受け取って実行する関数
+            lock_path (str, optional): ロックファイルのパス（None で排他しない）
+            state_path (str, optional): 最終実行時刻の記録先（None で停止中の分を実行しない）
+            clock (callable): 現在時刻（タイムゾーン付き）を返す関数
+            sleep (callable): 指定秒数待機する関数
+        """
+        self.jobs = jobs
+        self.run_job = run_job
+        self.lock = JobLock(lock_path) if lock_path else None
+        self.state = ScheduleState(state_path) if state_path else None
+        self.clock = clock
+        self.sleep = sleep
+        # ジョブ名 → (実行時刻, ジッターを加えた実行予定時刻)
+        self._next: Dict[str, Tuple[datetime, datetime]] = {}
+
+        now = self.clock()
+        for job in jobs:
+            last_run = self.state.get_last_run(job.name) if self.state else None
+            if last_run is not None and job.schedule.next_after(last_run) <= now:
+                if job.catch_up:
+                    logger.info(
+                        f"{job.name}: 停止中に実行時刻を過ぎたため、起動直後に1回だけ実行します"
+                        f"（前回 {last_run.astimezone(JST):%Y-%m-%d %H:%M} JST）"
+                    )
+                    self._next[job.name] = (now, now)
+                    continue
+                logger.info(f"{job.name}: 停止中に過ぎた実行時刻は実行しません")
+            self._schedule_next(job, now)
+
+    def _schedule_next(self, job: ScheduledJob, now: datetime) -> None:
+        """now より後の次の実行時刻を設定"""
+        trigger = job.schedule.next_after(now)
+        due = trigger + timedelta(seconds=random.uniform(0, job.jitter))
+        self._next[job.name] = (trigger, due)
+
+    def next_run_times(self) -> Dict[str, datetime]:
+        """
+        ジョブごとの次の実行予定時刻を取得
+
+        Returns:
+            dict: ジョブ名 → 実行予定時刻（ジッターを含む）
+        """
+        return {name: due for name, (_, due) in self._next.items()}
+
+    def seconds_until_next(self) -> float:
+        """
+        次の実行予定時刻までの秒数を取得
+
+        Returns:
+            float: 秒数（実行予定時刻を過ぎている場合は0）
+        """
+        due = min(self.next_run_times().values())
+        return max((due - self.clock()).total_seconds(), 0.0)
+
+    def run_pending(self) -> List[str]:
+        """
+        実行予定時刻を過ぎたジョブを予定時刻の順に1回ずつ実行
+
+        Returns:
+            list: 実行したジョブ名（ロックを取得できず見送ったジョブは含まない）
+        """
+        executed = []
+        now = self.clock()
+        due_jobs = sorted(
+            (job for job in self.jobs if self._next[job.name][1] <= now),
+            key=lambda job: self._next[job.name][1],
+        )
+        for job in due_jobs:
+            trigger = self._next[job.name][0]
+            if self._run_locked(job, trigger):
+                executed.append(job.name)
+
+            finished = self.clock()
+            self._schedule_next(job, finished)
+            logger.info(
+                f"{job.name}: 次回の実行予定 {self._next[job.name][1]:%Y-%m-%d %H:%M:%S} JST"
+            )
+            skipped = self._count_skipped(job, trigger, finished)
+            if skipped:
+                logger.warning(
+                    f"{job.name}: 実行中に {skipped} 回分の実行時刻を過ぎたため、まとめて読み飛ばしました"
+                )
+        return executed
+
+    def _run_locked(self, job: ScheduledJob, trigger: datetime) -> bool:
+        """ロックを取得してジョブを実行し、実行した場合は最終実行時刻を記録"""
+        if self.lock is not None and not self.lock.acquire():
+            logger.warning(
+                f"{job.name}: 他のプロセスが実行中のため、{trigger:%H:%M} の実行を見送ります"
+                f"（ロックファイル: {self.lock.path}）"
+            )
+            return False
+        try:
+            logger.info(
+                f"{job.name}: 定時実行を開始します（{trigger:%Y-%m-%d %H:%M} JST）"
+            )
+            self.run_job(job)
+        except Exception as e:
+            # 1回の失敗でサービス全体を止めず、次の実行時刻に再実行する
+            logger.exception(f"{job.name}: 定時実行中にエラーが発生しました: {e}")
+        finally:
+            if self.lock is not None:
+                self.lock.release()
+        if self.state is not None:
+            self.state.record_run(job.name, self.clock())
+        return True
+
+    @staticmethod
+    def _count_skipped(job: ScheduledJob, trigger: datetime, finished: datetime) -> int:
+        """trigger の後、finished までに過ぎた実行時刻の数を数える"""
+        skipped = 0
+        current = job.schedule.next_after(trigger)
+        while current <= finished:
+            skipped += 1
+            current = job.schedule.next_after(current)
+        return skipped
+
+    def run_forever(self) -> None:
+        """次の実行予定時刻まで待機してジョブを実行する処理を繰り返す"""
+        for name, due in self.next_run_times().items():
+            logger.info(f"{name}: 次回の実行予定 {due:%Y-%m-%d %H:%M:%S} JST")
+        while True:
+            self.run_pending()
+            delay = self.seconds_until_next()
+            if delay > 0:
+                self.sleep(min(delay, self.MAX_SLEEP))
+
+    def close(self) -> None:
+        """最終実行時刻の記録を閉じる"""
+        if self.state is not None:
+            self.state.close()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+main.py の起動時間（モジュールの読み込み時間）を計測するベンチマーク
+
+`python -X importtime` で main.py の読み込みと --no-interactive の引数解析までを
+新しいプロセスで繰り返し計測し、予算を超えた場合や要約エンジン・API クライアントが
+起動時に読み込まれている場合は終了コード1で終了する。
+
+    python startup_benchmark.py --runs 5 --budget-ms 150
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MS = 150.0  # main.py の読み込み時間の予算（ミリ秒）
+# 起動時に読み込まれてはならない重いモジュール（初回のジョブ実行時に読み込む）
+LAZY_MODULES = ("sumy", "nltk", "numpy", "requests", "notion_client", "httpx")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_STARTUP_CODE = """
+import sys
+sys.argv = ["main.py", "--no-interactive"]
+import main
+main.parse_arguments()
+print("LOADED=" + ",".join(sorted(m for m in {modules} if m in sys.modules)))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    -X importtime の出力を解析
+
+    Args:
+        stderr (str): python -X importtime の標準エラー出力
+
+    Returns:
+        list: (モジュール名, 自身の読み込み時間(μs), 累計の読み込み時間(μs), 階層) のリスト
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def measure_startup(repo_dir: str) -> Dict[str, Any]:
+    """
+    新しいプロセスで main.py を読み込み、読み込み時間を計測
+
+    Args:
+        repo_dir (str): main.py のあるディレクトリ
+
+    Returns:
+        dict: main の累計読み込み時間(ms)、読み込みに時間のかかったモジュール、
+            起動時に読み込まれた LAZY_MODULES
+    """
+    env = {**os.environ, "PYTHONPATH": repo_dir}
+    code = _STARTUP_CODE.format(modules=repr(LAZY_MODULES))
+    # ログファイルなどを作業ツリーに残さないよう、一時ディレクトリで実行する
+    with tempfile.TemporaryDirectory() as work_dir:
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=work_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    # -X importtime は子モジュールを親より先に出力するため、main の直前の
+    # 最上位モジュール（site など）より後ろが main から読み込まれたモジュール
+    entries = parse_importtime(completed.stderr)
+    main_index = next(
+        index
+        for index, (module, _, _, depth) in enumerate(entries)
+        if module == "main" and depth == 0
+    )
+    start = main_index
+    while start > 0 and entries[start - 1][3] > 0:
+        start -= 1
+    main_us = entries[main_index][2]
+    top_level = sorted(
+        (
+            (module, cumulative)
+            for module, _, cumulative, depth in entries[start:main_index]
+            if depth == 1
+        ),
+        key=lambda entry: entry[1],
+        reverse=True,
+    )
+    loaded = completed.stdout.strip().rsplit("LOADED=", 1)[-1]
+    return {
+        "main_ms": main_us / 1000,
+        "slowest": [(module, us / 1000) for module, us in top_level[:10]],
+        "loaded_lazy_modules": [module for module in loaded.split(",") if module],
+    }
+
+
+def run_startup_benchmark(
+    runs: int = 5, budget_ms: float = DEFAULT_BUDGET_MS
+) -> Dict[str, Any]:
+    """
+    main.py の読み込み時間を runs 回計測し、予算と比較
+
+    Args:
+        runs (int): 計測回数（中央値で評価する）
+        budget_ms (float): 読み込み時間の予算（ミリ秒）
+
+    Returns:
+        dict: 計測結果と、予算内かつ重いモジュールを読み込んでいない場合に True となる ok
+    """
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    measurements = [measure_startup(repo_dir) for _ in range(runs)]
+    median_ms = statistics.median(m["main_ms"] for m in measurements)
+    loaded = sorted(
+        {module for m in measurements for module in m["loaded_lazy_modules"]}
+    )
+    return {
+        "runs": runs,
+        "median_ms": round(median_ms, 1),
+        "min_ms": round(min(m["main_ms"] for m in measurements), 1),
+        "budget_ms": budget_ms,
+        "slowest": [
+            (module, round(ms, 1)) for module, ms in measurements[-1]["slowest"]
+        ],
+        "loaded_lazy_modules": loaded,
+        "ok": median_ms <= budget_ms and not loaded,
+    }
+
+
+def parse_arguments() -> argparse.Namespace:
+    """コマンドライン引数をパース"""
+    parser = argparse.ArgumentParser(description="main.py の起動時間のベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="計測回数")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="main.py の読み込み時間の予算（ミリ秒、中央値で評価）",
+    )
+    parser.add_argument("--json", type=str, help="計測結果をJSONで保存するパス")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """メイン関数"""
+    args = parse_arguments()
+    logging.basicConfig(level=logging.INFO)
+
+    result = run_startup_benchmark(args.runs, args.budget_ms)
+    print(
+        f"main.py の読み込み時間: 中央値 {result['median_ms']} ms"
+        f"（最小 {result['min_ms']} ms、予算 {result['budget_ms']} ms）"
+    )
+    for module, ms in result["slowest"]:
+        print(f"  {module}\t{ms} ms")
+    if result["loaded_lazy_modules"]:
+        print(
+            f"起動時に読み込まれた重いモジュール: {', '.join(result['loaded_lazy_modules'])}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
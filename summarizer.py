@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+記事本文の要約を担当するモジュール
+"""
+
+import io
+import itertools
+import logging
+import math
+import re
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+class BaseSummarizerEngine(ABC):
+    """
+    要約エンジンの共通インターフェース
+
+    summarize を実装したクラスを register_summarizer で登録すると、
+    get_summarizer のバックエンド名で選択できるようになる。
+    """
+
+    def __init__(self, language: str = "japanese") -> None:
+        """
+        初期化
+
+        Args:
+            language (str): 言語（日本語の場合は"japanese"）
+        """
+        self.language = language
+
+    @abstractmethod
+    def summarize(self, text: str, sentences_count: int = 3) -> str:
+        """
+        テキストを要約
+
+        Args:
+            text (str): 要約するテキスト
+            sentences_count (int): 要約後の文の数
+
+        Returns:
+            str: 要約されたテキスト
+        """
+
+    def summarize_batch(
+        self, texts: Iterable[str], sentences_count: int = 3
+    ) -> List[str]:
+        """
+        複数のテキストをまとめて要約
+
+        Args:
+            texts (iterable): 要約するテキスト
+            sentences_count (int): 要約後の文の数
+
+        Returns:
+            list: 入力順の要約結果
+        """
+        return [self.summarize(text, sentences_count) for text in texts]
+
+
+class SummarizerEngine(BaseSummarizerEngine):
+    """
+    sumy の LSA による要約エンジン（バックエンド名 "lsa"）
+
+    Tokenizer / Stemmer / LsaSummarizer / ストップワードは生成時に一度だけ構築し、
+    以降の要約ではそれらを使い回す。
+    sumy（NLTK・numpy を含む）は読み込みに時間がかかるため、
+    モジュールの読み込み時ではなくエンジンの生成時に読み込む。
+    """
+
+    def __init__(self, language: str = "japanese") -> None:
+        """
+        初期化
+
+        Args:
+            language (str): 言語（日本語の場合は"japanese"）
+        """
+        from sumy.nlp.stemmers import Stemmer
+        from sumy.nlp.tokenizers import Tokenizer
+        from sumy.summarizers.lsa import LsaSummarizer
+        from sumy.utils import get_stop_words
+
+        self.language = language
+        self.tokenizer = Tokenizer(language)
+        self.summarizer = LsaSummarizer(Stemmer(language))
+        self.summarizer.stop_words = get_stop_words(language)
+
+    def summarize(self, text: str, sentences_count: int = 3) -> str:
+        """
+        テキストを要約
+
+        Args:
+            text (str): 要約するテキスト
+            sentences_count (int): 要約後の文の数
+
+        Returns:
+            str: 要約されたテキスト
+        """
+        from sumy.parsers.plaintext import PlaintextParser
+
+        parser = PlaintextParser.from_string(text, self.tokenizer)
+        summary_sentences = self.summarizer(parser.document, sentences_count)
+        return " ".join([str(sentence) for sentence in summary_sentences])
+
+
+# Markdown から本文以外の要素を取り除くためのパターン
+_CODE_FENCE = re.compile(r"^\s*(```|~~~)")
+_SKIPPED_LINE = re.compile(r"^\s*(\||:::|<!--|-{3,}\s*$|\*{3,}\s*$)|^( {4}|\t)")
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_INLINE_NOISE = re.compile(r"`[^`]*`|<[^>]+>|https?://\S+")
+_LINE_PREFIX = re.compile(r"^\s*(?:#{1,6}\s+|>\s*|[-*+]\s+|\d+\.\s+)+")
+_EMPHASIS = re.compile(r"\*\*|__|~~")
+_SENTENCE_END = re.compile(r"(?<=[。！？!?])")
+# 英単語と、漢字・カタカナの連続（ひらがなは助詞・語尾が多いため語として扱わない）
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z0-9+#]+|[\u4e00-\u9fff々ァ-ヴー]+")
+
+
+def iter_sentences(text: str, max_chars: int = 400) -> Iterator[str]:
+    """
+    Markdown の本文から文を順に取り出すジェネレータ
+
+    本文を1行ずつ1回だけ走査し、コードブロック・表・画像・URL・HTML タグを除去して、
+    行末と「。」「！」「？」で文に区切る。消費した分だけ走査するため、
+    文数の上限に達した時点で残りの本文は読まない。
+
+    Args:
+        text (str): Markdown の本文
+        max_chars (int): 1文あたりの最大文字数（超えた分は切り捨てる）
+
+    Yields:
+        str: 文
+    """
+    in_code_block = False
+    for line in io.StringIO(text):
+        if _CODE_FENCE.match(line):
+            in_code_block = not in_code_block
+            continue
+        if in_code_block or _SKIPPED_LINE.match(line):
+            continue
+
+        line = _IMAGE.sub("", line)
+        line = _LINK.sub(r"\1", line)
+        line = _INLINE_NOISE.sub(" ", line)
+        line = _EMPHASIS.sub("", _LINE_PREFIX.sub("", line))
+        for sentence in _SENTENCE_END.split(line):
+            sentence = sentence.strip()
+            if sentence:
+                yield sentence[:max_chars]
+
+
+def tokenize(sentence: str) -> List[str]:
+    """
+    文を TF-IDF 用の語に分割
+
+    形態素解析器を使わず、英単語は小文字化してそのまま、
+    3文字以上の漢字・カタカナの連続は文字 bigram に分割する。
+
+    Args:
+        sentence (str): 文
+
+    Returns:
+        list: 語のリスト
+    """
+    tokens = []
+    for match in _TOKEN.finditer(sentence):
+        word = match.group()
+        if word.isascii():
+            tokens.append(word.lower())
+        elif len(word) <= 2:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class TextRankEngine(BaseSummarizerEngine):
+    """
+    TF-IDF の類似度による TextRank で重要な文を抽出する要約エンジン（バックエンド名 "textrank"）
+
+    外部ライブラリを使わない pure Python 実装。文ベクトルは疎な辞書で表し、
+    類似度は転置インデックスから共通の語を持つ文の組だけ計算する。
+    対象とする文数を MAX_SENTENCES に制限するため、記事が長くても
+    1記事あたりの計算量は一定以下に収まる。
+    """
+
+    MAX_SENTENCES = 200  # 要約の対象とする先頭からの最大文数
+    MAX_SENTENCE_CHARS = 400  # 1文あたりの最大文字数
+    MIN_SENTENCE_CHARS = 10  # これより短い文は要約に含めない
+    DAMPING = 0.85  # TextRank の減衰係数
+    MAX_ITERATIONS = 50  # TextRank の最大反復回数
+    TOLERANCE = 1e-6  # 反復を打ち切るスコアの変化量
+
+    def summarize(self, text: str, sentences_count: int = 3) -> str:
+        """
+        テキストを要約
+
+        Args:
+            text (str): 要約するテキスト（Markdown 可）
+            sentences_count (int): 要約後の文の数
+
+        Returns:
+            str: 重要度の高い文を本文中の順に連結したテキスト
+        """
+        sentences = list(
+            itertools.islice(
+                iter_sentences(text, self.MAX_SENTENCE_CHARS), self.MAX_SENTENCES
+            )
+        )
+        if len(sentences) <= sentences_count:
+            return " ".join(sentences)
+
+        scores = self._rank(sentences)
+        candidates = [
+            index
+            for index, sentence in enumerate(sentences)
+            if len(sentence) >= self.MIN_SENTENCE_CHARS
+        ] or list(range(len(sentences)))
+        # スコアが同じ場合は本文の前にある文を優先する
+        selected = sorted(candidates, key=lambda index: (-scores[index], index))
+        return " ".join(
+            sentences[index] for index in sorted(selected[:sentences_count])
+        )
+
+    def _rank(self, sentences: List[str]) -> List[float]:
+        """文ごとの TextRank スコアを計算"""
+        term_counts = [Counter(tokenize(sentence)) for sentence in sentences]
+        sentence_count = len(sentences)
+        document_frequency = Counter(term for counts in term_counts for term in counts)
+
+        # 文ごとの TF-IDF ベクトル（疎）と、語 → (文, 重み) の転置インデックス
+        postings: Dict[str, List[tuple]] = defaultdict(list)
+        norms = []
+        for index, counts in enumerate(term_counts):
+            norm = 0.0
+            for term, count in counts.items():
+                weight = (1 + math.log(count)) * math.log(
+                    sentence_count / document_frequency[term] + 1
+                )
+                postings[term].append((index, weight))
+                norm += weight * weight
+            norms.append(math.sqrt(norm) or 1.0)
+
+        # 共通の語を持つ文の組についてのみコサイン類似度を累積する
+        edges: List[Dict[int, float]] = [defaultdict(float) for _ in sentences]
+        for entries in postings.values():
+            for (i, weight_i), (j, weight_j) in itertools.combinations(entries, 2):
+                similarity = weight_i * weight_j / (norms[i] * norms[j])
+                edges[i][j] += similarity
+                edges[j][i] += similarity
+
+        out_weights = [sum(neighbors.values()) for neighbors in edges]
+        scores = [1.0 / sentence_count] * sentence_count
+        base = (1 - self.DAMPING) / sentence_count
+        for _ in range(self.MAX_ITERATIONS):
+            updated = [
+                base
+                + self.DAMPING
+                * sum(
+                    weight / out_weights[j] * scores[j]
+                    for j, weight in edges[i].items()
+                )
+                for i in range(sentence_count)
+            ]
+            delta = sum(abs(a - b) for a, b in zip(updated, scores))
+            scores = updated
+            if delta < self.TOLERANCE:
+                break
+        return scores
+
+
+DEFAULT_BACKEND = "textrank"  # 既定の要約エンジン
+SUMMARIZER_BACKENDS: Dict[str, Callable[[str], BaseSummarizerEngine]] = {
+    "textrank": TextRankEngine,
+    "lsa": SummarizerEngine,
+}
+
+
+def register_summarizer(
+    name: str, factory: Callable[[str], BaseSummarizerEngine]
+) -> None:
+    """
+    要約エンジンのバックエンドを登録
+
+    Args:
+        name (str): バックエンド名
+        factory (callable): 言語を受け取って要約エンジンを返す関数（クラス）
+    """
+    SUMMARIZER_BACKENDS[name] = factory
+    get_summarizer.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_summarizer(
+    language: str = "japanese", backend: str = DEFAULT_BACKEND
+) -> BaseSummarizerEngine:
+    """
+    言語・バックエンドごとに共有される要約エンジンを取得
+
+    初回呼び出し時にのみエンジンを構築し、プロセス内で使い回す。
+
+    Args:
+        language (str): 言語（日本語の場合は"japanese"）
+        backend (str): バックエンド名（"textrank" または "lsa"）
+
+    Returns:
+        BaseSummarizerEngine: 要約エンジン
+    """
+    if backend not in SUMMARIZER_BACKENDS:
+        raise ValueError(
+            f"不明な要約エンジンです: {backend}（{', '.join(SUMMARIZER_BACKENDS)}）"
+        )
+    logger.debug(f"要約エンジンを初期化します: {backend} ({language})")
+    return SUMMARIZER_BACKENDS[backend](language)
+
+
+def warm_up_summarizer(
+    language: str = "japanese", backend: str = DEFAULT_BACKEND
+) -> None:
+    """
+    要約エンジンを事前に構築（ProcessPoolExecutor の initializer 用）
+
+    Args:
+        language (str): 言語（日本語の場合は"japanese"）
+        backend (str): バックエンド名
+    """
+    get_summarizer(language, backend)
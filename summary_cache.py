@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+要約結果の永続キャッシュを担当するモジュール
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+class SummaryCache:
+    """
+    SQLite による要約結果のキャッシュ
+
+    キーは記事IDと「本文 + 要約パラメータ」のハッシュから作るため、
+    本文が編集された記事や要約方式を変えた場合は自動的に再要約される。
+    保持件数が max_entries を超えると、最後に参照された時刻が古い順に削除する。
+    """
+
+    DEFAULT_PATH = "summary_cache.sqlite3"
+    DEFAULT_MAX_ENTRIES = 5000
+
+    def __init__(
+        self, path: str = DEFAULT_PATH, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            path (str): SQLite データベースファイルのパス（":memory:" も可）
+            max_entries (int): キャッシュに保持する最大件数
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                article_id TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(article_id: str, body: str, params: str) -> str:
+        """
+        キャッシュキーを作成
+
+        Args:
+            article_id (str): 記事ID
+            body (str): 記事本文
+            params (str): 要約パラメータを表す文字列
+
+        Returns:
+            str: "記事ID:ハッシュ" 形式のキー
+        """
+        digest = hashlib.sha256(f"{params}\0{body}".encode("utf-8")).hexdigest()
+        return f"{article_id}:{digest}"
+
+    def get(self, article_id: str, body: str, params: str) -> Optional[str]:
+        """
+        キャッシュ済みの要約を取得
+
+        Args:
+            article_id (str): 記事ID
+            body (str): 記事本文
+            params (str): 要約パラメータを表す文字列
+
+        Returns:
+            str or None: キャッシュ済みの要約、存在しない場合は None
+        """
+        key = self.make_key(article_id, body, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE summaries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, article_id: str, body: str, params: str, summary: str) -> None:
+        """
+        要約をキャッシュに保存し、上限を超えた分を古い順に削除
+
+        同じ記事の古いキー（本文編集前の要約など）は置き換える。
+
+        Args:
+            article_id (str): 記事ID
+            body (str): 記事本文
+            params (str): 要約パラメータを表す文字列
+            summary (str): 要約
+        """
+        key = self.make_key(article_id, body, params)
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM summaries WHERE article_id = ? AND key != ?",
+                (article_id, key),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, article_id, summary, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (key, article_id, summary, time.time()),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM summaries WHERE key IN (
+                    SELECT key FROM summaries ORDER BY last_used DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        ヒット数・ミス数・保持件数を取得
+
+        Returns:
+            dict: {"hits": ヒット数, "misses": ミス数, "entries": 保持件数}
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
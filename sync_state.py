@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Notion への同期状態の保存を担当するモジュール
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_properties(properties: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Notion のプロパティごとに値のフィンガープリントを計算
+
+    Args:
+        properties (dict): Notion API に送信するプロパティ
+
+    Returns:
+        dict: プロパティ名をキー、値のハッシュを値とする辞書
+    """
+    return {
+        name: hashlib.sha256(
+            json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:16]
+        for name, value in properties.items()
+    }
+
+
+class SyncStateStore:
+    """
+    SQLite による Notion 同期状態のストア
+
+    URLごとに書き込み先のページIDと、最後に書き込んだプロパティの
+    フィンガープリントを記録する。次回の同期では差分のあるプロパティのみを送信し、
+    変更のない記事は書き込み自体を省略できる。
+    """
+
+    DEFAULT_PATH = "sync_state.sqlite3"
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        """
+        初期化
+
+        Args:
+            path (str): SQLite データベースファイルのパス（":memory:" も可）
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                url TEXT PRIMARY KEY,
+                page_id TEXT NOT NULL,
+                fingerprints TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            )
+            """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sync_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+            """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS watchlist (
+                article_id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL
+            )
+            """)
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+        URLの同期状態を取得
+
+        Args:
+            url (str): 記事のURL
+
+        Returns:
+            tuple or None: (ページID, プロパティごとのフィンガープリント)、未同期の場合は None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_id, fingerprints FROM sync_state WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def record(self, url: str, page_id: str, fingerprints: Dict[str, str]) -> None:
+        """
+        書き込みが完了したプロパティの同期状態を記録
+
+        Args:
+            url (str): 記事のURL
+            page_id (str): 書き込み先のページID
+            fingerprints (dict): 書き込んだ全プロパティのフィンガープリント
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (url, page_id, fingerprints, synced_at)"
+                " VALUES (?, ?, ?, ?)",
+                (url, page_id, json.dumps(fingerprints, sort_keys=True), time.time()),
+            )
+            self._conn.commit()
+
+    def get_changed(
+        self,
+        url: str,
+        page_id: str,
+        properties: Dict[str, Any],
+        fingerprints: Dict[str, str],
+    ) -> Dict[str, Any]:
+        """
+        前回の同期状態と比較し、値が変わったプロパティのみを抽出
+
+        同期状態が無い、またはページIDが異なる場合はすべてのプロパティを返す。
+
+        Args:
+            url (str): 記事のURL
+            page_id (str): 更新対象のページID
+            properties (dict): 送信しようとしているプロパティ
+            fingerprints (dict): properties のフィンガープリント
+
+        Returns:
+            dict: 送信が必要なプロパティ
+        """
+        state = self.get(url)
+        if state is None or state[0] != page_id:
+            return properties
+
+        synced_fingerprints = state[1]
+        return {
+            name: value
+            for name, value in properties.items()
+            if synced_fingerprints.get(name) != fingerprints[name]
+        }
+
+    def forget(self, url: str) -> None:
+        """
+        URLの同期状態を削除
+
+        Args:
+            url (str): 記事のURL
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM sync_state WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def get_value(self, key: str) -> Optional[str]:
+        """
+        同期に関するメタ情報（最終処理日時など）を取得
+
+        Args:
+            key (str): キー
+
+        Returns:
+            str or None: 保存されている値、未保存の場合は None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM sync_meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_value(self, key: str, value: str) -> None:
+        """
+        同期に関するメタ情報を保存
+
+        Args:
+            key (str): キー
+            value (str): 値
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_meta (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+            self._conn.commit()
+
+    def watch(self, article_id: str, created_at: str) -> None:
+        """
+        閾値付近の記事を再確認リストに追加
+
+        Args:
+            article_id (str): 記事ID
+            created_at (str): 記事の作成日時（ISO形式）
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watchlist (article_id, created_at) VALUES (?, ?)",
+                (article_id, created_at),
+            )
+            self._conn.commit()
+
+    def unwatch(self, article_id: str) -> None:
+        """
+        記事を再確認リストから削除
+
+        Args:
+            article_id (str): 記事ID
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM watchlist WHERE article_id = ?", (article_id,)
+            )
+            self._conn.commit()
+
+    def watched(self) -> List[Tuple[str, str]]:
+        """
+        再確認リストの記事を取得
+
+        Returns:
+            list: (記事ID, 作成日時) のリスト
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT article_id, created_at FROM watchlist ORDER BY created_at"
+            ).fetchall()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sync_state").fetchone()[0]
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
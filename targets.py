@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+複数の Notion データベースへの振り分け（マルチターゲット同期）の設定を担当するモジュール
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from utils import get_date_range, parse_iso_datetime
+
+# ロギング設定
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SyncTarget:
+    """
+    同期先の Notion データベースと、そこに登録する記事の条件
+
+    いいね数・ストック数はいずれかが閾値以上であれば条件を満たす。
+    include_tags を指定した場合はいずれかのタグを含む記事のみ、
+    exclude_tags のタグを含む記事は除外する（タグは大文字・小文字を区別しない）。
+    """
+
+    name: str
+    database_id: str
+    min_likes: int = 500
+    min_stocks: int = 500
+    days: Optional[int] = None
+    include_tags: FrozenSet[str] = frozenset()
+    exclude_tags: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SyncTarget":
+        """
+        設定ファイルの1エントリから生成
+
+        database_id の "${NOTION_DB_ID_TEAM_A}" のような記述は環境変数で置き換える。
+
+        Args:
+            data (dict): name, database_id, min_likes, min_stocks, days,
+                include_tags, exclude_tags を持つ辞書
+
+        Returns:
+            SyncTarget: 同期先の設定
+        """
+        name = data.get("name")
+        database_id = os.path.expandvars(data.get("database_id", ""))
+        if not name:
+            raise ValueError("同期先の name が指定されていません")
+        if not database_id or database_id.startswith("$"):
+            raise ValueError(f"同期先 {name} の database_id が設定されていません")
+        return cls(
+            name=name,
+            database_id=database_id,
+            min_likes=int(data.get("min_likes", 500)),
+            min_stocks=int(data.get("min_stocks", 500)),
+            days=int(data["days"]) if data.get("days") is not None else None,
+            include_tags=frozenset(tag.lower() for tag in data.get("include_tags", [])),
+            exclude_tags=frozenset(tag.lower() for tag in data.get("exclude_tags", [])),
+        )
+
+    def get_date_range(self, default_days: int) -> Tuple[datetime, datetime]:
+        """
+        この同期先の対象期間を取得
+
+        Args:
+            default_days (int): days が未指定の場合の日数
+
+        Returns:
+            tuple: (開始日時, 終了日時)
+        """
+        return get_date_range(self.days or default_days)
+
+    def accepts(
+        self, record: Dict[str, Any], start_date: datetime, end_date: datetime
+    ) -> bool:
+        """
+        記事がこの同期先の条件を満たすか判定
+
+        Args:
+            record (dict): likes, stocks, tags, created_at を持つ記事データ
+            start_date (datetime): 対象期間の開始日時
+            end_date (datetime): 対象期間の終了日時
+
+        Returns:
+            bool: 条件を満たす場合は True
+        """
+        if record["likes"] < self.min_likes and record["stocks"] < self.min_stocks:
+            return False
+
+        created_at = parse_iso_datetime(record["created_at"]).replace(tzinfo=None)
+        if not (
+            start_date.replace(tzinfo=None)
+            <= created_at
+            <= end_date.replace(tzinfo=None)
+        ):
+            return False
+
+        tags = {tag.lower() for tag in record["tags"]}
+        if self.include_tags and not tags & self.include_tags:
+            return False
+        return not tags & self.exclude_tags
+
+
+def load_targets(path: str) -> List[SyncTarget]:
+    """
+    同期先の設定ファイル（JSON）を読み込む
+
+    {"targets": [{"name": ..., "database_id": ..., ...}, ...]} の形式を受け付ける。
+
+    Args:
+        path (str): 設定ファイルのパス
+
+    Returns:
+        list: 同期先のリスト
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    targets = [SyncTarget.from_dict(entry) for entry in config.get("targets", [])]
+    if not targets:
+        raise ValueError(f"同期先が設定されていません: {path}")
+    names = [target.name for target in targets]
+    if len(set(names)) != len(names):
+        raise ValueError(f"同期先の name が重複しています: {path}")
+    logger.info(f"{len(targets)} 件の同期先を読み込みました: {', '.join(names)}")
+    return targets
+
+
+def get_fetch_criteria(
+    targets: Iterable[SyncTarget], default_days: int
+) -> Tuple[int, int, int]:
+    """
+    すべての同期先を満たす最も広い取得条件を算出
+
+    Qiita からはこの条件で1回だけ取得し、同期先ごとの条件で振り分ける。
+
+    Args:
+        targets (iterable): 同期先のリスト
+        default_days (int): days が未指定の同期先の日数
+
+    Returns:
+        tuple: (日数, 最低いいね数, 最低ストック数)
+    """
+    targets = list(targets)
+    return (
+        max(target.days or default_days for target in targets),
+        min(target.min_likes for target in targets),
+        min(target.min_stocks for target in targets),
+    )
+
+
+def get_target_state_path(path: Optional[str], target: SyncTarget) -> Optional[str]:
+    """
+    同期先ごとの同期状態ファイルのパスを作成
+
+    同期状態は URL ごとにページIDを記録するため、データベースごとに分ける。
+
+    Args:
+        path (str, optional): 元のパス（None または空文字なら同期状態を使わない）
+        target (SyncTarget): 同期先
+
+    Returns:
+        str or None: "sync_state.<name>.sqlite3" のようなパス
+    """
+    if not path:
+        return None
+    if path == ":memory:":
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{target.name}{ext}"
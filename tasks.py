@@ -5,19 +5,54 @@
 タスク実行関数を定義するモジュール
 """
 
+import asyncio
+import itertools
 import logging
-from datetime import datetime
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from checkpoint import BackfillJournal
+from incremental import IncrementalSync
+from metrics import RunMetrics
 from qiita import QiitaClient
 from notion import NotionClient
-from utils import get_jst_now
+from notion_payload import NotionPayload, iter_payloads
+from pipeline import bounded_map, close_stages, threaded_stage
+from rate_limit import TokenBucket
+from summarizer import warm_up_summarizer
+from summary_cache import SummaryCache
+from sync_state import SyncStateStore
+from targets import (
+    SyncTarget,
+    get_fetch_criteria,
+    get_target_state_path,
+    load_targets,
+)
+from utils import format_datetime, get_date_range, get_jst_now
 
 # ロギング設定
 logger = logging.getLogger(__name__)
 
 
 def daily_job(
-    backfill_days: int = 1, min_likes: int = 500, min_stocks: int = 500
+    backfill_days: int = 1,
+    min_likes: int = 500,
+    min_stocks: int = 500,
+    notion_workers: int = 1,
+    qiita_workers: int = 1,
+    summary_workers: int = 1,
+    summary_cache_path: Optional[str] = SummaryCache.DEFAULT_PATH,
+    sync_state_path: Optional[str] = SyncStateStore.DEFAULT_PATH,
+    incremental: bool = False,
+    server_filter: bool = True,
+    journal_path: Optional[str] = None,
+    metrics_path: Optional[str] = None,
+    prometheus_path: Optional[str] = None,
+    metrics: Optional[RunMetrics] = None,
+    use_async: bool = False,
+    targets_path: Optional[str] = None,
+    staged: bool = True,
 ) -> None:
     """
     Qiitaから人気記事を取得してNotionに保存する日次ジョブ
@@ -26,42 +61,204 @@ def daily_job(
         backfill_days (int): バックフィル時の日数
         min_likes (int): 最小いいね数
         min_stocks (int): 最小ストック数
+        notion_workers (int): Notionへ並行して書き込むワーカー数
+        qiita_workers (int): Qiitaを並行して検索するワーカー数
+        summary_workers (int): 要約を並列実行するプロセス数
+        summary_cache_path (str, optional): 要約キャッシュのパス（None でキャッシュ無効）
+        sync_state_path (str, optional): Notion同期状態のパス（None で差分更新無効）
+        incremental (bool): 前回実行以降の記事のみを取得する差分同期を行うか
+        server_filter (bool): いいね数・ストック数の条件をQiitaの検索クエリに含めるか
+        journal_path (str, optional): バックフィルの進捗ジャーナルのパス（None で再開無効）
+        metrics_path (str, optional): 実行レポート（JSON）の保存先
+        prometheus_path (str, optional): Prometheus テキスト形式のメトリクスの保存先
+        metrics (RunMetrics, optional): 計測結果の記録先（省略時は実行ごとに作成）
+        use_async (bool): asyncio エンジン（async_daily_job）で実行するか。
+            ワーカー数は各APIの同時実行数として扱い、1の場合は各クライアントの既定値を使う。
+            incremental / journal_path / staged=False と同時に指定すると ValueError
+        targets_path (str, optional): 同期先の設定ファイル（JSON）。指定した場合は
+            multi_target_job で複数のデータベースに振り分ける（min_likes / min_stocks は使わない）。
+            incremental / journal_path / use_async と同時に指定すると ValueError
+        staged (bool): 取得・要約・書き込みをそれぞれ専用のスレッドで重ねて実行するか。
+            False の場合は書き込み側が次の記事を要求したときに取得・要約を進める
     """
+    if targets_path:
+        if incremental or journal_path or use_async:
+            raise ValueError(
+                "マルチターゲット同期は差分同期・進捗ジャーナル・asyncio エンジンに対応していません"
+            )
+        multi_target_job(
+            targets_path,
+            backfill_days=backfill_days,
+            notion_workers=notion_workers,
+            qiita_workers=qiita_workers,
+            summary_workers=summary_workers,
+            summary_cache_path=summary_cache_path,
+            sync_state_path=sync_state_path,
+            server_filter=server_filter,
+            metrics_path=metrics_path,
+            prometheus_path=prometheus_path,
+            metrics=metrics,
+            staged=staged,
+        )
+        return
+
+    if use_async:
+        if incremental or journal_path or not staged:
+            raise ValueError(
+                "asyncio エンジンは差分同期・進捗ジャーナル・段階実行の無効化に対応していません"
+            )
+        asyncio.run(
+            async_daily_job(
+                backfill_days=backfill_days,
+                min_likes=min_likes,
+                min_stocks=min_stocks,
+                qiita_concurrency=qiita_workers if qiita_workers > 1 else None,
+                notion_concurrency=notion_workers if notion_workers > 1 else None,
+                summary_workers=summary_workers,
+                summary_cache_path=summary_cache_path,
+                sync_state_path=sync_state_path,
+                server_filter=server_filter,
+                metrics_path=metrics_path,
+                prometheus_path=prometheus_path,
+                metrics=metrics,
+            )
+        )
+        return
+
     logger.info(
         f"日次ジョブ実行開始: {get_jst_now().strftime('%Y-%m-%d %H:%M:%S JST')}"
     )
 
-    try:
-        # 1. Qiitaクライアントを初期化
-        qiita_client = QiitaClient()
+    metrics = metrics or RunMetrics()
+    summary_cache = SummaryCache(summary_cache_path) if summary_cache_path else None
+    sync_state = SyncStateStore(sync_state_path) if sync_state_path else None
 
-        # 2. 指定日数分の人気記事を取得 (LGTM/Stock 500以上)
-        logger.info(f"過去 {backfill_days} 日分の人気記事を取得中...")
-        articles = qiita_client.get_popular_articles(
-            days=backfill_days, min_likes=min_likes, min_stocks=min_stocks
-        )
+    incremental_sync = None
+    if incremental:
+        if sync_state is None:
+            logger.warning("同期状態が無効なため、差分同期は行わず期間全体を取得します")
+        else:
+            incremental_sync = IncrementalSync(sync_state, min_likes, min_stocks)
 
-        if not articles:
-            logger.info("条件に一致する記事が見つかりませんでした")
-            return
+    journal = None
+    if journal_path:
+        if incremental_sync:
+            logger.warning(
+                "差分同期を行うため、バックフィルの進捗ジャーナルは使用しません"
+            )
+        else:
+            journal = BackfillJournal(
+                BackfillJournal.build_run_key(
+                    backfill_days, min_likes, min_stocks, server_filter
+                ),
+                journal_path,
+            )
 
-        logger.info(f"{len(articles)} 件の人気記事が見つかりました")
+    stages: List[Iterator] = []
+    try:
+        # 1. Qiita / Notion クライアントを初期化
+        qiita_client = QiitaClient(summary_cache=summary_cache, metrics=metrics)
+        notion_client = NotionClient(sync_state=sync_state, metrics=metrics)
 
-        # 3. 記事をNotion用フォーマットに変換
-        notion_articles = [
-            qiita_client.format_article_for_notion(article) for article in articles
-        ]
+        # 2. 指定日数分の人気記事をページ単位で取得 (LGTM/Stock 500以上)
+        logger.info(f"過去 {backfill_days} 日分の人気記事を取得中...")
+        start_date, end_date = get_date_range(backfill_days)
+        if journal:
+            # 中断した実行がある場合は、その期間のまま再開する
+            start_date, end_date = journal.start(start_date, end_date)
+        search_thresholds = None
+        if server_filter:
+            search_thresholds = (
+                incremental_sync.get_search_thresholds()
+                if incremental_sync
+                else (min_likes, min_stocks)
+            )
+        if journal:
+            articles = journal.iter_popular_articles(
+                qiita_client,
+                qiita_client.build_search_queries(
+                    start_date, end_date, search_thresholds
+                ),
+                start_date,
+                end_date,
+                min_likes,
+                min_stocks,
+            )
+        else:
+            articles = qiita_client.iter_popular_articles(
+                days=backfill_days,
+                min_likes=min_likes,
+                min_stocks=min_stocks,
+                workers=qiita_workers,
+                fetch_from=(
+                    incremental_sync.get_fetch_from() if incremental_sync else None
+                ),
+                on_article=incremental_sync.observe if incremental_sync else None,
+                search_thresholds=search_thresholds,
+            )
+        if incremental_sync:
+            # 差分取得の後、閾値付近の既知の記事のいいね数・ストック数のみを再確認
+            articles = itertools.chain(
+                articles,
+                incremental_sync.iter_refreshed(qiita_client, start_date, end_date),
+            )
+        if staged:
+            # Qiita のページ取得は要約・書き込みを待たずに先へ進める
+            articles = threaded_stage(articles, name="fetch")
+            stages.append(articles)
 
-        # 4. Notionクライアントを初期化
-        notion_client = NotionClient()
+        # 3. 記事をNotion用フォーマットに変換（要約は記事が届いた順に遅延実行）
+        notion_articles = qiita_client.iter_format_articles_for_notion(
+            articles, workers=summary_workers
+        )
+        if journal:
+            # 要約済みの記事を記録し、前回要約まで終えた記事は要約せずに書き込む
+            notion_articles = itertools.chain(
+                journal.pending_formatted(),
+                journal.iter_record_formatted(notion_articles),
+            )
+        if staged:
+            # 要約は書き込みと並行して進め、書き込み側は要約済みの記事を受け取るだけにする
+            notion_articles = threaded_stage(notion_articles, name="summarize")
+            stages.append(notion_articles)
 
-        # 5. 記事をNotionデータベースに追加/更新
+        # 4. 記事が届いた順にNotionデータベースに追加/更新
         logger.info(f"Notionデータベースに記事を登録中...")
         success_count, new_count, error_count, new_articles = (
-            notion_client.bulk_upsert_articles(notion_articles)
+            notion_client.bulk_upsert_articles(
+                notion_articles,
+                workers=notion_workers,
+                since=format_datetime(start_date - timedelta(days=1)),
+                on_result=journal.on_result if journal else None,
+            )
         )
+        metrics.set_gauge("articles_success", success_count)
+        metrics.set_gauge("articles_new", new_count)
+        metrics.set_gauge("articles_error", error_count)
+        metrics.set_gauge("articles_unchanged", notion_client.skipped_count)
+
+        if journal:
+            if error_count == 0:
+                journal.finish()
+            else:
+                logger.warning(
+                    "エラーが発生したため、次回はバックフィルを中断した位置から再開します"
+                )
+
+        # 取得・書き込みに失敗した記事を次回も取得できるよう、失敗がなかった場合のみ進める
+        if incremental_sync:
+            if error_count == 0 and qiita_client.fetch_error_count == 0:
+                incremental_sync.commit()
+            else:
+                logger.warning(
+                    "エラーが発生したため差分同期のハイウォーターマークは更新しません"
+                )
 
-        # 6. 新規記事がある場合はコンソールに通知
+        if success_count + error_count == 0:
+            logger.info("条件に一致する記事が見つかりませんでした")
+            return
+
+        # 5. 新規記事がある場合はコンソールに通知
         if new_articles:
             logger.info(f"{new_count} 件の新規記事を通知します")
         else:
@@ -75,6 +272,335 @@ def daily_job(
         logger.exception(f"日次ジョブ実行中にエラーが発生しました: {e}")
         raise
 
+    finally:
+        # 途中で失敗した場合も、キャッシュ等を閉じる前にステージのスレッドを下流から停止する
+        close_stages(stages)
+        if summary_cache is not None:
+            stats = summary_cache.stats()
+            logger.info(
+                f"要約キャッシュ: ヒット {stats['hits']}, ミス {stats['misses']}, 保持 {stats['entries']} 件"
+            )
+            metrics.set_gauge("summary_cache_hits", stats["hits"])
+            metrics.set_gauge("summary_cache_misses", stats["misses"])
+            summary_cache.close()
+        if sync_state is not None:
+            sync_state.close()
+        if journal is not None:
+            journal.close()
+        _export_metrics(metrics, metrics_path, prometheus_path)
+
+
+def multi_target_job(
+    targets_path: str,
+    backfill_days: int = 1,
+    notion_workers: int = 1,
+    qiita_workers: int = 1,
+    summary_workers: int = 1,
+    summary_cache_path: Optional[str] = SummaryCache.DEFAULT_PATH,
+    sync_state_path: Optional[str] = SyncStateStore.DEFAULT_PATH,
+    server_filter: bool = True,
+    metrics_path: Optional[str] = None,
+    prometheus_path: Optional[str] = None,
+    metrics: Optional[RunMetrics] = None,
+    staged: bool = True,
+) -> None:
+    """
+    1回の Qiita 取得で複数の Notion データベースに記事を振り分けるジョブ
+
+    すべての同期先を満たす最も広い期間・最も低い閾値で Qiita から1回だけ取得し、
+    要約も1記事1回だけ行う。各記事は条件を満たすすべての同期先に書き込むため、
+    同期先を増やしても Qiita へのリクエスト数は増えない。
+    Notion へのリクエストは全同期先で1つのトークンバケットを共有する。
+
+    Args:
+        targets_path (str): 同期先の設定ファイル（JSON）のパス
+        backfill_days (int): days が未指定の同期先の日数
+        notion_workers (int): Notionへ並行して書き込むワーカー数（全同期先で共有）
+        qiita_workers (int): Qiitaを並行して検索するワーカー数
+        summary_workers (int): 要約を並列実行するプロセス数
+        summary_cache_path (str, optional): 要約キャッシュのパス（None でキャッシュ無効）
+        sync_state_path (str, optional): Notion同期状態のパス。同期先ごとに
+            "<パス>.<name>" のファイルに分けて保存する（None で差分更新無効）
+        server_filter (bool): いいね数・ストック数の条件をQiitaの検索クエリに含めるか
+        metrics_path (str, optional): 実行レポート（JSON）の保存先
+        prometheus_path (str, optional): Prometheus テキスト形式のメトリクスの保存先
+        metrics (RunMetrics, optional): 計測結果の記録先（省略時は実行ごとに作成）
+        staged (bool): 取得・振り分け、要約、書き込みをそれぞれ専用のスレッドで重ねて実行するか
+    """
+    logger.info(
+        f"マルチターゲット同期開始: {get_jst_now().strftime('%Y-%m-%d %H:%M:%S JST')}"
+    )
+
+    targets = load_targets(targets_path)
+    days, min_likes, min_stocks = get_fetch_criteria(targets, backfill_days)
+    date_ranges = {
+        target.name: target.get_date_range(backfill_days) for target in targets
+    }
+
+    metrics = metrics or RunMetrics()
+    summary_cache = SummaryCache(summary_cache_path) if summary_cache_path else None
+    sync_states: Dict[str, Optional[SyncStateStore]] = {}
+    for target in targets:
+        state_path = get_target_state_path(sync_state_path, target)
+        sync_states[target.name] = SyncStateStore(state_path) if state_path else None
+
+    def route(record: dict) -> List[SyncTarget]:
+        """記事が条件を満たす同期先を返す"""
+        return [
+            target
+            for target in targets
+            if target.accepts(record, *date_ranges[target.name])
+        ]
+
+    stages: List[Iterator] = []
+    try:
+        qiita_client = QiitaClient(summary_cache=summary_cache, metrics=metrics)
+        rate_limiter = TokenBucket(
+            rate=NotionClient.REQUESTS_PER_SECOND,
+            capacity=NotionClient.REQUESTS_PER_SECOND,
+            sleep=metrics.sleeper("rate_limit_sleep_seconds", limiter="notion"),
+        )
+        notion_clients = {
+            target.name: NotionClient(
+                database_id=target.database_id,
+                rate_limiter=rate_limiter,
+                sync_state=sync_states[target.name],
+                metrics=metrics,
+            )
+            for target in targets
+        }
+
+        logger.info(
+            f"過去 {days} 日分の記事（いいね {min_likes} 以上またはストック {min_stocks} 以上）を"
+            f" {len(targets)} 件の同期先に振り分けます"
+        )
+        articles = qiita_client.iter_popular_articles(
+            days=days,
+            min_likes=min_likes,
+            min_stocks=min_stocks,
+            workers=qiita_workers,
+            search_thresholds=(min_likes, min_stocks) if server_filter else None,
+        )
+        # どの同期先にも該当しない記事（タグ条件など）は要約しない
+        articles = (
+            article for article in articles if route(article.to_notion_record(""))
+        )
+        if staged:
+            articles = threaded_stage(articles, name="fetch")
+            stages.append(articles)
+        notion_articles = qiita_client.iter_format_articles_for_notion(
+            articles, workers=summary_workers
+        )
+        if staged:
+            notion_articles = threaded_stage(notion_articles, name="summarize")
+            stages.append(notion_articles)
+
+        for target in targets:
+            start_date = date_ranges[target.name][0]
+            notion_clients[target.name].prepare_url_index(
+                since=format_datetime(start_date - timedelta(days=1))
+            )
+
+        def upsert(write: Tuple[SyncTarget, dict, NotionPayload]) -> Tuple[bool, bool]:
+            target, article, payload = write
+            try:
+                success, is_new, _ = notion_clients[target.name].upsert_article(
+                    article, payload
+                )
+            except Exception as e:
+                logger.error(f"{target.name}: 記事アップサート中にエラーが発生: {e}")
+                return False, False
+            return success, is_new
+
+        # プロパティは同期先によらず同じため、記事ごとに1回だけ組み立てる
+        writes = (
+            (target, article, payload)
+            for article, payload in iter_payloads(notion_articles)
+            for target in route(article)
+        )
+        counts = {
+            target.name: {"success": 0, "new": 0, "error": 0} for target in targets
+        }
+        for (target, _, _), (success, is_new) in bounded_map(
+            upsert, writes, workers=notion_workers
+        ):
+            result = ("new" if is_new else "success") if success else "error"
+            counts[target.name][result] += 1
+            metrics.increment("target_articles", target=target.name, result=result)
+
+        for target in targets:
+            count = counts[target.name]
+            logger.info(
+                f"{target.name}: 成功 {count['success'] + count['new']}, 新規 {count['new']}"
+                f", エラー {count['error']}, 変更なし {notion_clients[target.name].skipped_count}"
+            )
+        metrics.set_gauge(
+            "articles_success", sum(c["success"] + c["new"] for c in counts.values())
+        )
+        metrics.set_gauge("articles_new", sum(c["new"] for c in counts.values()))
+        metrics.set_gauge("articles_error", sum(c["error"] for c in counts.values()))
+        metrics.set_gauge(
+            "articles_unchanged",
+            sum(client.skipped_count for client in notion_clients.values()),
+        )
+        logger.info("マルチターゲット同期完了")
+
+    except Exception as e:
+        logger.exception(f"マルチターゲット同期中にエラーが発生しました: {e}")
+        raise
+
+    finally:
+        close_stages(stages)
+        if summary_cache is not None:
+            stats = summary_cache.stats()
+            metrics.set_gauge("summary_cache_hits", stats["hits"])
+            metrics.set_gauge("summary_cache_misses", stats["misses"])
+            summary_cache.close()
+        for sync_state in sync_states.values():
+            if sync_state is not None:
+                sync_state.close()
+        _export_metrics(metrics, metrics_path, prometheus_path)
+
+
+async def async_daily_job(
+    backfill_days: int = 1,
+    min_likes: int = 500,
+    min_stocks: int = 500,
+    qiita_concurrency: Optional[int] = None,
+    notion_concurrency: Optional[int] = None,
+    summary_workers: int = 1,
+    summary_cache_path: Optional[str] = SummaryCache.DEFAULT_PATH,
+    sync_state_path: Optional[str] = SyncStateStore.DEFAULT_PATH,
+    server_filter: bool = True,
+    metrics_path: Optional[str] = None,
+    prometheus_path: Optional[str] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> None:
+    """
+    daily_job の asyncio 版
+
+    Qiita の検索・要約・Notion への書き込みを1つのイベントループ上で重ねて実行する。
+    Qiita と Notion はそれぞれのクライアントの同時実行数とレート制御に従い、
+    要約はエグゼキュータで実行するため両方のAPIの送信枠を同時に使い切れる。
+
+    Args:
+        backfill_days (int): バックフィル時の日数
+        min_likes (int): 最小いいね数
+        min_stocks (int): 最小ストック数
+        qiita_concurrency (int, optional): Qiita で同時に実行する検索クエリ数
+        notion_concurrency (int, optional): Notion へ同時に書き込む記事数
+        summary_workers (int): 要約を並列実行するプロセス数（1ならスレッド1つで実行）
+        summary_cache_path (str, optional): 要約キャッシュのパス（None でキャッシュ無効）
+        sync_state_path (str, optional): Notion同期状態のパス（None で差分更新無効）
+        server_filter (bool): いいね数・ストック数の条件をQiitaの検索クエリに含めるか
+        metrics_path (str, optional): 実行レポート（JSON）の保存先
+        prometheus_path (str, optional): Prometheus テキスト形式のメトリクスの保存先
+        metrics (RunMetrics, optional): 計測結果の記録先（省略時は実行ごとに作成）
+    """
+    logger.info(
+        f"日次ジョブ実行開始（asyncio）: {get_jst_now().strftime('%Y-%m-%d %H:%M:%S JST')}"
+    )
+
+    # httpx の非同期クライアントは asyncio エンジンを使うときにだけ読み込む
+    from async_notion import AsyncNotionClient
+    from async_qiita import AsyncQiitaClient
+
+    metrics = metrics or RunMetrics()
+    summary_cache = SummaryCache(summary_cache_path) if summary_cache_path else None
+    sync_state = SyncStateStore(sync_state_path) if sync_state_path else None
+    executor: Executor
+    if summary_workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=summary_workers,
+            initializer=warm_up_summarizer,
+            initargs=(QiitaClient.SUMMARY_LANGUAGE, QiitaClient.SUMMARY_BACKEND),
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+
+    try:
+        async with (
+            AsyncQiitaClient(
+                summary_cache=summary_cache,
+                metrics=metrics,
+                concurrency=qiita_concurrency,
+            ) as qiita_client,
+            AsyncNotionClient(
+                sync_state=sync_state,
+                metrics=metrics,
+                concurrency=notion_concurrency,
+            ) as notion_client,
+        ):
+            logger.info(f"過去 {backfill_days} 日分の人気記事を取得中...")
+            start_date, end_date = get_date_range(backfill_days)
+            queries = QiitaClient.build_search_queries(
+                start_date,
+                end_date,
+                (min_likes, min_stocks) if server_filter else None,
+            )
+            articles = qiita_client.iter_popular_articles(
+                queries, start_date, end_date, min_likes, min_stocks
+            )
+            notion_articles = qiita_client.iter_format_articles_for_notion(
+                articles, executor, workers=max(summary_workers, 1)
+            )
+            success_count, new_count, error_count, _ = (
+                await notion_client.bulk_upsert_articles(
+                    notion_articles,
+                    since=format_datetime(start_date - timedelta(days=1)),
+                )
+            )
+            metrics.set_gauge("articles_success", success_count)
+            metrics.set_gauge("articles_new", new_count)
+            metrics.set_gauge("articles_error", error_count)
+            metrics.set_gauge("articles_unchanged", notion_client.skipped_count)
+
+        logger.info(
+            f"日次ジョブ実行完了: 成功 {success_count}, 新規 {new_count}, エラー {error_count}"
+        )
+
+    except Exception as e:
+        logger.exception(f"日次ジョブ実行中にエラーが発生しました: {e}")
+        raise
+
+    finally:
+        executor.shutdown()
+        if summary_cache is not None:
+            stats = summary_cache.stats()
+            metrics.set_gauge("summary_cache_hits", stats["hits"])
+            metrics.set_gauge("summary_cache_misses", stats["misses"])
+            summary_cache.close()
+        if sync_state is not None:
+            sync_state.close()
+        _export_metrics(metrics, metrics_path, prometheus_path)
+
+
+def _export_metrics(
+    metrics: RunMetrics,
+    metrics_path: Optional[str] = None,
+    prometheus_path: Optional[str] = None,
+) -> None:
+    """
+    ステージ別の所要時間をログに出力し、指定があれば実行レポートを保存
+
+    保存に失敗してもジョブ自体の結果には影響させない。
+
+    Args:
+        metrics (RunMetrics): 計測結果
+        metrics_path (str, optional): 実行レポート（JSON）の保存先
+        prometheus_path (str, optional): Prometheus テキスト形式の保存先
+    """
+    logger.info(
+        f"所要時間 {metrics.duration:.2f}s（ステージ別の累計: {metrics.summary() or 'なし'}）"
+    )
+    try:
+        if metrics_path:
+            metrics.write_json(metrics_path)
+        if prometheus_path:
+            metrics.write_prometheus(prometheus_path)
+    except OSError as e:
+        logger.error(f"実行レポートの保存に失敗しました: {e}")
+
 
 if __name__ == "__main__":
     # 単体テスト実行用
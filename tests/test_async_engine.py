@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+
+from async_notion import AsyncNotionClient
+from async_qiita import AsyncQiitaClient
+from fake_api import FakeApiServer
+from metrics import RunMetrics
+from notion import NotionClient
+from pipeline import abounded_map
+from qiita import QiitaClient
+from rate_limit import TokenBucket
+from tasks import daily_job
+
+
+def test_abounded_map_limits_concurrency():
+    running = 0
+    peak = 0
+
+    async def work(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * (3 - item % 3))
+        running -= 1
+        return item * 2
+
+    async def produce():
+        for item in range(9):
+            yield item
+
+    async def collect():
+        return [pair async for pair in abounded_map(work, produce(), limit=3)]
+
+    results = asyncio.run(collect())
+    assert sorted(results) == [(item, item * 2) for item in range(9)]
+    assert peak == 3
+
+
+async def _no_sleep(self, seconds, name="sleep_seconds", **labels):
+    self.observe(name, seconds, **labels)
+
+
+def test_async_qiita_retries_429(monkeypatch):
+    monkeypatch.setattr(RunMetrics, "async_sleep", _no_sleep)
+
+    async def fetch(server):
+        async with AsyncQiitaClient(
+            token="x" * 40, base_url=server.qiita_base_url
+        ) as client:
+            items = [await client.get_item(f"{i:020x}") for i in range(2)]
+            return items, client.metrics
+
+    with FakeApiServer(articles=3, qiita_error_every=2) as server:
+        items, metrics = asyncio.run(fetch(server))
+        assert [item["id"] for item in items] == [f"{i:020x}" for i in range(2)]
+        assert server.stats()["qiita_429"] == 1
+    assert metrics.get_counter("api_retries", api="qiita", endpoint="items/:id") == 1
+
+
+@pytest.mark.parametrize("summary_workers", [1, 2])
+def test_async_daily_job_end_to_end(monkeypatch, tmp_path, summary_workers):
+    with FakeApiServer(articles=10, days=2, body_length=400) as server:
+        monkeypatch.setenv("QIITA_TOKEN", "x" * 40)
+        monkeypatch.setenv("NOTION_TOKEN", "x" * 50)
+        monkeypatch.setenv("NOTION_DB_ID", "db")
+        monkeypatch.setenv("QIITA_API_BASE_URL", server.qiita_base_url)
+        monkeypatch.setenv("NOTION_API_BASE_URL", server.notion_base_url)
+        monkeypatch.setattr(AsyncNotionClient, "REQUESTS_PER_SECOND", 1000)
+
+        sync_state_path = str(tmp_path / "sync_state.sqlite3")
+        metrics = RunMetrics()
+        daily_job(
+            backfill_days=2,
+            summary_workers=summary_workers,
+            summary_cache_path="",
+            sync_state_path=sync_state_path,
+            metrics=metrics,
+            use_async=True,
+        )
+        assert len(server.notion_pages("db")) == 10
+        assert metrics.report()["gauges"]["articles_new"] == 10
+        assert metrics.get_counter("api_requests", api="notion", endpoint="POST pages")
+
+        # 2回目は変更がないため書き込まない
+        daily_job(
+            backfill_days=2,
+            summary_cache_path="",
+            sync_state_path=sync_state_path,
+            use_async=True,
+        )
+        assert server.stats()["pages_created"] == 10
+        assert server.stats()["pages_updated"] == 0
+
+
+def test_async_clients_do_not_inherit_sync_io():
+    # 共通部分だけを共有し、同期版の通信メソッドを持たない
+    assert not issubclass(AsyncQiitaClient, QiitaClient)
+    assert not issubclass(AsyncNotionClient, NotionClient)
+    assert not hasattr(AsyncQiitaClient, "get_popular_articles")
+    assert not hasattr(AsyncQiitaClient, "iter_refreshed_articles")
+
+
+@pytest.mark.parametrize(
+    "option", [{"incremental": True}, {"journal_path": "j"}, {"staged": False}]
+)
+def test_async_daily_job_rejects_unsupported_options(option):
+    with pytest.raises(ValueError):
+        daily_job(use_async=True, **option)
+
+
+def _article(i):
+    return {
+        "title": f"記事 {i}",
+        "url": f"https://qiita.com/user/items/{i}",
+        "author": "user",
+        "likes": 1,
+        "stocks": 2,
+        "tags": ["Python"],
+        "summary": "要約",
+        "created_at": "2024-01-01T00:00:00+09:00",
+    }
+
+
+def test_async_notion_caches_schema_and_records_rate_limit_sleep(monkeypatch):
+    monkeypatch.setattr(RunMetrics, "async_sleep", _no_sleep)
+
+    async def run(server):
+        async with AsyncNotionClient(
+            token="x" * 50,
+            database_id="db",
+            base_url=server.notion_base_url,
+            rate_limiter=TokenBucket(rate=1, capacity=1),
+        ) as client:
+            for i in range(2):
+                assert (await client.upsert_article(_article(i)))[0]
+            # スキーマの変更による書き込みエラーでは、キャッシュを破棄して再検証する
+            server.handle_notion(
+                "PATCH", "/databases/db", {"properties": {"summary": None}}
+            )
+            assert (await client.upsert_article(_article(2)))[0]
+            return client.metrics
+
+    with FakeApiServer(articles=0) as server:
+        metrics = asyncio.run(run(server))
+        assert len(server.notion_pages("db")) == 3
+
+    retrieves = metrics.get_counter(
+        "api_requests", api="notion", endpoint="GET databases/:id"
+    )
+    assert retrieves == 2
+    [sleeps] = [
+        h
+        for h in metrics.report()["histograms"]
+        if h["name"] == "rate_limit_sleep_seconds"
+    ]
+    assert sleeps["labels"] == {"limiter": "notion"}
+    assert sleeps["count"] > 0
+
+
+def test_async_notion_schema_cache_expires(monkeypatch):
+    monkeypatch.setattr(AsyncNotionClient, "REQUESTS_PER_SECOND", 1000)
+    monkeypatch.setattr(AsyncNotionClient, "SCHEMA_CACHE_TTL", 0)
+
+    async def run(server):
+        async with AsyncNotionClient(
+            token="x" * 50, database_id="db", base_url=server.notion_base_url
+        ) as client:
+            for i in range(2):
+                assert (await client.upsert_article(_article(i)))[0]
+            return client.metrics
+
+    with FakeApiServer(articles=0) as server:
+        metrics = asyncio.run(run(server))
+    assert (
+        metrics.get_counter("api_requests", api="notion", endpoint="GET databases/:id")
+        == 2
+    )
@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+import pytest
+
+from checkpoint import BackfillJournal
+from qiita import QiitaClient
+from utils import get_jst_now
+
+
+class _FakeQiita:
+    PER_PAGE = 2
+    MAX_PAGE = 100
+    is_popular_article = staticmethod(QiitaClient.is_popular_article)
+
+    def __init__(self, pages, fail_at=None):
+        self.pages = pages
+        self.fail_at = fail_at
+        self.requested = []
+
+    def iter_search_pages(self, query, start_page=1, raise_errors=False):
+        for page in range(start_page, len(self.pages) + 1):
+            self.requested.append(page)
+            if page == self.fail_at:
+                raise RuntimeError("接続エラー")
+            yield self.pages[page - 1]
+
+
+def _item(article_id, created_at, likes):
+    return {
+        "id": article_id,
+        "title": article_id,
+        "url": f"https://qiita.com/u/items/{article_id}",
+        "user": {"id": "u"},
+        "likes_count": likes,
+        "stocks_count": 0,
+        "tags": [{"name": "Python"}],
+        "created_at": created_at,
+        "body": "本文",
+    }
+
+
+def _window():
+    now = get_jst_now()
+    created_at = (now - timedelta(hours=1)).isoformat()
+    return now - timedelta(days=1), now, created_at
+
+
+def test_resumes_from_next_page_after_failure(tmp_path):
+    path = str(tmp_path / "journal.sqlite3")
+    start, end, created_at = _window()
+    pages = [
+        [_item("a", created_at, 10), _item("b", created_at, 1)],
+        [_item("c", created_at, 10)],
+    ]
+
+    journal = BackfillJournal("run", path)
+    journal.start(start, end)
+    first = _FakeQiita(pages, fail_at=2)
+    fetched = []
+    with pytest.raises(RuntimeError):
+        for article in journal.iter_popular_articles(first, ["q"], start, end, 5, 5):
+            fetched.append(article.id)
+    journal.close()
+    assert fetched == ["a"]
+
+    # 要約前に中断した記事 a と、未取得の2ページ目のみを再開する
+    journal = BackfillJournal("run", path)
+    assert journal.start(start + timedelta(hours=1), end) == (start, end)
+    second = _FakeQiita(pages)
+    resumed = [
+        article.id
+        for article in journal.iter_popular_articles(second, ["q"], start, end, 5, 5)
+    ]
+    assert resumed == ["a", "c"]
+    assert second.requested == [2]
+    assert journal.pending_articles()[0].tags == ("Python",)
+
+
+def test_interrupted_run_is_not_resumed_on_a_later_day(tmp_path):
+    path = str(tmp_path / "journal.sqlite3")
+    start, end, created_at = _window()
+    journal = BackfillJournal("run", path)
+    journal.start(start, end)
+    qiita = _FakeQiita([[_item("a", created_at, 10), _item("b", created_at, 1)]])
+    with pytest.raises(RuntimeError):
+        for _ in journal.iter_popular_articles(qiita, ["q"], start, end, 5, 5):
+            raise RuntimeError("中断")
+    journal.close()
+
+    # 翌日以降の同じ条件の実行は、古い期間を再開せず今回の期間で実行する
+    later = timedelta(days=2)
+    journal = BackfillJournal("run", path)
+    assert journal.start(start + later, end + later) == (start + later, end + later)
+    assert journal.get_query_progress("q") == (0, False)
+    assert journal.pending_articles() == []
+
+
+def test_pending_formatted_until_written():
+    journal = BackfillJournal("run", ":memory:")
+    start, end, created_at = _window()
+    qiita = _FakeQiita([[_item("a", created_at, 10), _item("c", created_at, 10)]])
+    list(journal.iter_popular_articles(qiita, ["q"], start, end, 5, 5))
+
+    formatted = [{"url": f"https://qiita.com/u/items/{i}"} for i in ("a", "c")]
+    assert list(journal.iter_record_formatted(formatted)) == formatted
+    assert journal.pending_articles() == []
+
+    journal.on_result(formatted[0], True, True, "page-a")
+    journal.on_result(formatted[1], False, False, None)
+    assert journal.pending_formatted() == [formatted[1]]
+
+    journal.finish()
+    assert journal.pending_formatted() == []
+    assert journal.get_query_progress("q") == (0, False)
+
+
+def test_run_key_depends_on_server_filter():
+    filtered = BackfillJournal.build_run_key(3, 500, 500, server_filter=True)
+    unfiltered = BackfillJournal.build_run_key(3, 500, 500, server_filter=False)
+    assert filtered != unfiltered
@@ -0,0 +1,53 @@
+import pytest
+
+from fake_api import FakeApiServer
+from notion import NotionClient
+from qiita import QiitaClient
+from tasks import daily_job
+
+
+@pytest.fixture
+def server():
+    with FakeApiServer(articles=10, days=2) as fake:
+        yield fake
+
+
+@pytest.fixture
+def fake_env(server, monkeypatch):
+    monkeypatch.setenv("QIITA_TOKEN", "x" * 40)
+    monkeypatch.setenv("NOTION_TOKEN", "x" * 50)
+    monkeypatch.setenv("NOTION_DB_ID", "db")
+    monkeypatch.setenv("QIITA_API_BASE_URL", server.qiita_base_url)
+    monkeypatch.setenv("NOTION_API_BASE_URL", server.notion_base_url)
+    monkeypatch.setattr(NotionClient, "REQUESTS_PER_SECOND", 1000)
+
+
+def test_search_filters_by_qualifiers(server):
+    client = QiitaClient(token="x" * 40, base_url=server.qiita_base_url)
+    items = client.search_items("likes:>=500")
+    assert len(items) == 5
+    assert all(item["likes_count"] >= 500 for item in items)
+    assert client.rate_scheduler.remaining == 999
+
+
+def test_qiita_429_is_retried(monkeypatch):
+    monkeypatch.setattr("qiita.time.sleep", lambda seconds: None)
+    with FakeApiServer(articles=3, qiita_error_every=2) as server:
+        client = QiitaClient(token="x" * 40, base_url=server.qiita_base_url)
+        assert client.get_item(f"{0:020x}")["id"] == f"{0:020x}"
+        assert client.get_item(f"{2:020x}")["id"] == f"{2:020x}"
+        assert server.stats()["qiita_429"] == 1
+
+
+def test_daily_job_end_to_end(server, fake_env, tmp_path):
+    sync_state_path = str(tmp_path / "sync_state.sqlite3")
+    daily_job(backfill_days=2, summary_cache_path="", sync_state_path=sync_state_path)
+
+    pages = server.notion_pages("db")
+    assert len(pages) == 10
+    assert server.stats()["pages_created"] == 10
+
+    # 2回目は変更がないため書き込まない
+    daily_job(backfill_days=2, summary_cache_path="", sync_state_path=sync_state_path)
+    assert server.stats()["pages_created"] == 10
+    assert server.stats()["pages_updated"] == 0
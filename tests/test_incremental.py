@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+from fake_api import FakeApiServer
+from incremental import IncrementalSync
+from notion import NotionClient
+from qiita import QiitaArticle, QiitaClient
+from sync_state import SyncStateStore
+from tasks import daily_job
+from utils import get_jst_now
+
+
+def _article(article_id, created_at, likes=0, stocks=0):
+    return QiitaArticle(
+        id=article_id,
+        title="",
+        url="",
+        author="",
+        likes=likes,
+        stocks=stocks,
+        tags=(),
+        created_at=created_at,
+    )
+
+
+def test_high_water_mark_is_saved_per_threshold():
+    store = SyncStateStore(":memory:")
+    sync = IncrementalSync(store, min_likes=100, min_stocks=100)
+    assert sync.get_fetch_from() is None
+
+    sync.observe(_article("a", "2024-05-06T10:00:00+09:00"))
+    sync.observe(_article("b", "2024-05-06T12:00:00+09:00"))
+    sync.commit()
+
+    fetch_from = IncrementalSync(store, 100, 100).get_fetch_from()
+    assert fetch_from.isoformat() == "2024-05-06T06:00:00+09:00"
+    assert IncrementalSync(store, 50, 100).get_fetch_from() is None
+
+
+def test_near_threshold_articles_are_refreshed():
+    store = SyncStateStore(":memory:")
+    now = get_jst_now()
+    created_at = (now - timedelta(hours=1)).isoformat()
+    old = (now - timedelta(days=10)).isoformat()
+
+    sync = IncrementalSync(store, min_likes=100, min_stocks=100)
+    sync.observe(_article("near", created_at, likes=60))
+    sync.observe(_article("far", created_at, likes=10))
+    sync.observe(_article("old", old, stocks=70))
+    assert {article_id for article_id, _ in store.watched()} == {"near", "old"}
+
+    class _FakeQiita:
+        def iter_refreshed_articles(self, item_ids, *args, **kwargs):
+            self.item_ids = list(item_ids)
+            return iter([])
+
+    fake = _FakeQiita()
+    next_run = IncrementalSync(store, min_likes=100, min_stocks=100)
+    list(next_run.iter_refreshed(fake, now - timedelta(days=7), now))
+    assert fake.item_ids == ["near"]
+    assert [article_id for article_id, _ in store.watched()] == ["near"]
+
+
+def test_full_window_is_rescanned_periodically():
+    store = SyncStateStore(":memory:")
+    now = get_jst_now()
+    created_at = (now - timedelta(hours=1)).isoformat()
+
+    first = IncrementalSync(store, min_likes=100, min_stocks=100)
+    assert first.get_fetch_from(now) is None
+    # 閾値の半分にも届かず、再確認リストに登録されない記事
+    first.observe(_article("slow", created_at, likes=10))
+    first.commit()
+    assert store.watched() == []
+
+    soon = IncrementalSync(store, min_likes=100, min_stocks=100)
+    assert soon.get_fetch_from(now + timedelta(hours=12)) is not None
+    assert not soon.is_full_scan
+    soon.commit()
+
+    # 前回の全体検索から FULL_SCAN_INTERVAL 経つと、後から伸びた記事も拾えるよう期間全体を検索
+    # 定時実行の開始時刻が前回よりわずかに早くても全体検索になる
+    later = now + IncrementalSync.FULL_SCAN_INTERVAL - timedelta(seconds=1)
+    rescan = IncrementalSync(store, min_likes=100, min_stocks=100)
+    assert rescan.get_fetch_from(later) is None
+    assert rescan.is_full_scan
+    rescan.commit()
+    assert IncrementalSync(store, 100, 100).get_fetch_from(later) is not None
+
+
+def test_fetch_error_does_not_advance_high_water_mark(monkeypatch, tmp_path):
+    with FakeApiServer(articles=5, days=1, qiita_error_every=1) as server:
+        monkeypatch.setenv("QIITA_TOKEN", "x" * 40)
+        monkeypatch.setenv("NOTION_TOKEN", "x" * 50)
+        monkeypatch.setenv("NOTION_DB_ID", "db")
+        monkeypatch.setenv("QIITA_API_BASE_URL", server.qiita_base_url)
+        monkeypatch.setenv("NOTION_API_BASE_URL", server.notion_base_url)
+        monkeypatch.setattr(NotionClient, "REQUESTS_PER_SECOND", 1000)
+        # 429 をリトライせず、検索ページの取得を失敗させる
+        monkeypatch.setattr(QiitaClient, "MAX_RETRIES", 0)
+
+        sync_state_path = str(tmp_path / "sync_state.sqlite3")
+        daily_job(
+            summary_cache_path="", sync_state_path=sync_state_path, incremental=True
+        )
+        assert server.stats()["qiita_429"] > 0
+
+    store = SyncStateStore(sync_state_path)
+    sync = IncrementalSync(store, 500, 500)
+    assert store.get_value(sync.full_scan_key) is None
+    assert sync.get_fetch_from() is None
+    store.close()
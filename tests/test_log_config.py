@@ -0,0 +1,51 @@
+import json
+import logging
+
+import pytest
+
+from log_config import get_run_id, run_id_context, setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_json_lines_include_run_id(tmp_path, restore_root_logger):
+    log_file = tmp_path / "app.log"
+    setup_logging(log_file=str(log_file), json_lines=True)
+    logger = logging.getLogger("test_log_config")
+
+    logger.info("実行前")
+    with run_id_context("run-1"):
+        assert get_run_id() == "run-1"
+        logger.info("実行中 %d", 1)
+    shutdown_logging()
+
+    entries = [json.loads(line) for line in log_file.read_text("utf-8").splitlines()]
+    assert [(e["run_id"], e["message"]) for e in entries] == [
+        ("-", "実行前"),
+        ("run-1", "実行中 1"),
+    ]
+    assert entries[1]["level"] == "INFO"
+
+
+def test_log_file_is_rotated_by_size(tmp_path, restore_root_logger):
+    log_file = tmp_path / "app.log"
+    setup_logging(log_file=str(log_file), max_bytes=200, backup_count=2)
+    logger = logging.getLogger("test_log_config")
+    for i in range(20):
+        logger.info("行 %d %s", i, "x" * 50)
+    shutdown_logging()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "app.log",
+        "app.log.1",
+        "app.log.2",
+    ]
+    assert log_file.stat().st_size <= 200
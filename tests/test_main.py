@@ -0,0 +1,90 @@
+import pytest
+
+import main
+from checkpoint import BackfillJournal
+
+
+@pytest.fixture
+def run_main(monkeypatch):
+    for name in ("QIITA_TOKEN", "NOTION_TOKEN", "NOTION_DB_ID"):
+        monkeypatch.setenv(name, "x")
+    monkeypatch.setattr(main, "setup_logging", lambda **kwargs: None)
+    calls = []
+    monkeypatch.setattr(
+        main, "run_exclusive", lambda lock_path, **kwargs: calls.append(kwargs)
+    )
+
+    def run(*argv):
+        monkeypatch.setattr("sys.argv", ["main.py", "--no-interactive", *argv])
+        main.main()
+        return calls
+
+    return run
+
+
+def test_backfill_runs_job_with_days(run_main):
+    [options] = run_main("--backfill", "days=3")
+    assert options["backfill_days"] == 3
+
+
+@pytest.mark.parametrize("value", ["days=x", "weeks=3", "days=0", "3"])
+def test_invalid_backfill_argument_exits(run_main, value):
+    with pytest.raises(SystemExit):
+        run_main("--backfill", value)
+
+
+def test_backfill_does_not_hide_job_errors(run_main, monkeypatch):
+    def fail(lock_path, **kwargs):
+        raise ValueError("ジョブ内のエラー")
+
+    monkeypatch.setattr(main, "run_exclusive", fail)
+    with pytest.raises(ValueError, match="ジョブ内のエラー"):
+        run_main("--backfill", "days=3")
+
+
+def test_targets_do_not_require_notion_db_id(run_main, monkeypatch):
+    monkeypatch.delenv("NOTION_DB_ID")
+    [options] = run_main("--backfill", "days=1", "--targets", "targets.json")
+    assert options["targets_path"] == "targets.json"
+    assert options["journal_path"] is None
+
+
+def test_backfill_uses_default_journal(run_main):
+    [options] = run_main("--backfill", "days=3")
+    assert options["journal_path"] == BackfillJournal.DEFAULT_PATH
+    [_, options] = run_main("--backfill", "days=3", "--journal", "")
+    assert options["journal_path"] == ""
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--incremental"],
+        ["--async"],
+        ["--journal", "journal.sqlite3"],
+        ["--journal", BackfillJournal.DEFAULT_PATH],
+        ["--journal", ""],
+    ],
+)
+def test_targets_reject_unsupported_options(run_main, argv):
+    with pytest.raises(SystemExit):
+        run_main("--targets", "targets.json", *argv)
+
+
+def test_async_backfill_runs_without_journal(run_main):
+    [options] = run_main("--backfill", "days=2", "--async")
+    assert options["use_async"] and options["journal_path"] is None
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--incremental"],
+        ["--no-staged"],
+        ["--journal", "journal.sqlite3"],
+        ["--journal", BackfillJournal.DEFAULT_PATH],
+    ],
+)
+def test_async_rejects_unsupported_options(run_main, argv):
+    with pytest.raises(SystemExit):
+        run_main("--async", *argv)
@@ -0,0 +1,98 @@
+import json
+
+from fake_api import FakeApiServer
+from metrics import RunMetrics
+from notion import NotionClient
+from tasks import daily_job
+
+
+def test_counters_stages_and_histograms():
+    metrics = RunMetrics(run_id="run")
+    metrics.increment("api_requests", api="qiita", endpoint="items")
+    metrics.increment("api_requests", 2, endpoint="items", api="qiita")
+    metrics.add_time("summarize", 0.5)
+    with metrics.timer("summarize"):
+        pass
+    metrics.observe("rate_limit_sleep_seconds", 0.3, limiter="notion")
+    metrics.observe("rate_limit_sleep_seconds", 100, limiter="notion")
+
+    report = metrics.report()
+    assert metrics.get_counter("api_requests", api="qiita", endpoint="items") == 3
+    assert report["stages"]["summarize"]["count"] == 2
+    histogram = report["histograms"][0]
+    assert histogram["buckets"]["0.5"] == 1 and histogram["buckets"]["+Inf"] == 1
+    assert histogram["count"] == 2
+
+
+def test_prometheus_text_format():
+    metrics = RunMetrics(run_id="run")
+    metrics.increment("api_rate_limited", api="notion", endpoint="POST pages")
+    metrics.observe("retry_sleep_seconds", 1, api="notion")
+    metrics.observe("retry_sleep_seconds", 3, api="notion")
+
+    text = metrics.to_prometheus()
+    assert (
+        'qiita_notion_bridge_api_rate_limited_total{api="notion",endpoint="POST pages"} 1'
+        in text
+    )
+    assert (
+        'qiita_notion_bridge_retry_sleep_seconds_bucket{api="notion",le="1"} 1' in text
+    )
+    assert (
+        'qiita_notion_bridge_retry_sleep_seconds_bucket{api="notion",le="+Inf"} 2'
+        in text
+    )
+    assert 'qiita_notion_bridge_retry_sleep_seconds_sum{api="notion"} 4' in text
+    assert 'qiita_notion_bridge_run_info{run_id="run"} 1' in text
+    assert text.count("run_id=") == 1
+
+
+def test_prometheus_label_values_are_escaped():
+    metrics = RunMetrics(run_id="run")
+    metrics.increment("queries", query='title:"Python" C:\\tmp\nnext')
+
+    text = metrics.to_prometheus()
+    assert (
+        'qiita_notion_bridge_queries_total{query="title:\\"Python\\" C:\\\\tmp\\nnext"} 1'
+        in text
+    )
+    # 改行は \n にエスケープされ、系列が途中で分断されない
+    assert not any(line.startswith("next") for line in text.splitlines())
+
+
+def test_daily_job_writes_run_report(monkeypatch, tmp_path):
+    with FakeApiServer(articles=5, days=2) as server:
+        monkeypatch.setenv("QIITA_TOKEN", "x" * 40)
+        monkeypatch.setenv("NOTION_TOKEN", "x" * 50)
+        monkeypatch.setenv("NOTION_DB_ID", "db")
+        monkeypatch.setenv("QIITA_API_BASE_URL", server.qiita_base_url)
+        monkeypatch.setenv("NOTION_API_BASE_URL", server.notion_base_url)
+        monkeypatch.setattr(NotionClient, "REQUESTS_PER_SECOND", 1000)
+
+        report_path = tmp_path / "report.json"
+        prom_path = tmp_path / "metrics.prom"
+        daily_job(
+            backfill_days=2,
+            summary_cache_path="",
+            sync_state_path="",
+            metrics_path=str(report_path),
+            prometheus_path=str(prom_path),
+        )
+        stats = server.stats()
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    requests = {
+        (c["labels"]["api"], c["labels"]["endpoint"]): c["value"]
+        for c in report["counters"]
+        if c["name"] == "api_requests"
+    }
+    assert requests[("notion", "POST pages")] == 5
+    assert (
+        sum(v for (api, _), v in requests.items() if api == "qiita")
+        == stats["qiita_requests"]
+    )
+    assert report["gauges"]["articles_new"] == 5
+    assert {"qiita_request", "notion_page_write", "notion_url_index"} <= set(
+        report["stages"]
+    )
+    assert "qiita_notion_bridge_articles_new 5" in prom_path.read_text(encoding="utf-8")
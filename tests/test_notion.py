@@ -1,6 +1,10 @@
 import os
 import pytest
+from fake_api import FakeApiServer
 from notion import NotionClient
+from notion_payload import build_payload
+from rate_limit import TokenBucket
+from sync_state import SyncStateStore
 
 
 def test_notion_client_init_env(monkeypatch):
@@ -16,3 +20,194 @@ def test_notion_client_init_invalid():
     os.environ.pop("NOTION_DB_ID", None)
     with pytest.raises(ValueError):
         NotionClient(token="short", database_id="short")
+
+
+class _FakeDatabases:
+    def __init__(self, pages):
+        self.pages = pages
+        self.retrieve_calls = 0
+        self.query_calls = 0
+
+    def retrieve(self, database_id):
+        self.retrieve_calls += 1
+        return {
+            "properties": {
+                name: {"type": info["type"]}
+                for name, info in NotionClient.REQUIRED_PROPERTIES.items()
+            }
+        }
+
+    def query(self, database_id, **kwargs):
+        self.query_calls += 1
+        pages = list(self.pages.store.values())
+        url_filter = kwargs.get("filter", {}).get("url")
+        if url_filter:
+            pages = [
+                p
+                for p in pages
+                if p["properties"]["url"]["url"] == url_filter["equals"]
+            ]
+        start = int(kwargs.get("start_cursor") or 0)
+        end = start + kwargs.get("page_size", 100)
+        has_more = end < len(pages)
+        return {
+            "results": pages[start:end],
+            "has_more": has_more,
+            "next_cursor": str(end) if has_more else None,
+        }
+
+
+class _FakePages:
+    def __init__(self):
+        self.store = {}
+        self.created = []
+        self.updated = []
+
+    def create(self, parent, properties):
+        page_id = f"page-{len(self.store)}"
+        self.store[page_id] = {"id": page_id, "properties": properties}
+        self.created.append(properties)
+        return {"id": page_id}
+
+    def update(self, page_id, properties):
+        self.store[page_id]["properties"].update(properties)
+        self.updated.append(properties)
+        return {"id": page_id}
+
+
+class _FakeNotion:
+    def __init__(self):
+        self.pages = _FakePages()
+        self.databases = _FakeDatabases(self.pages)
+
+
+def _make_client():
+    client = NotionClient(
+        token="x" * 40,
+        database_id="y" * 32,
+        rate_limiter=TokenBucket(rate=1e9, capacity=1e9),
+    )
+    client.client = _FakeNotion()
+    return client
+
+
+def _make_article(i):
+    return {
+        "title": f"title {i}",
+        "url": f"https://qiita.com/items/{i}",
+        "author": "author",
+        "likes": 10,
+        "stocks": 5,
+        "tags": ["Python"],
+        "summary": "summary",
+        "created_at": "2024-05-06T12:34:56+09:00",
+    }
+
+
+def test_schema_check_is_cached():
+    client = _make_client()
+    success, new, error, _ = client.bulk_upsert_articles(
+        [_make_article(i) for i in range(5)]
+    )
+    assert (success, new, error) == (5, 5, 0)
+    assert client.client.databases.retrieve_calls == 1
+
+    client.invalidate_schema_cache()
+    assert client._check_database()
+    assert client.client.databases.retrieve_calls == 2
+
+
+def test_url_index_resolves_existing_pages():
+    client = _make_client()
+    client.bulk_upsert_articles([_make_article(i) for i in range(150)])
+
+    client.client.databases.query_calls = 0
+    success, new, error, _ = client.bulk_upsert_articles(
+        [_make_article(i) for i in range(160)]
+    )
+    assert (success, new, error) == (160, 10, 0)
+    assert len(client.client.pages.updated) == 150
+    # 150 件のインデックス構築は page_size=100 で 2 回のクエリに収まる
+    assert client.client.databases.query_calls == 2
+
+
+def test_bulk_upsert_concurrent_workers():
+    client = _make_client()
+    articles = [_make_article(i) for i in range(20)]
+    success, new, error, new_articles = client.bulk_upsert_articles(articles, workers=4)
+    assert (success, new, error) == (20, 20, 0)
+    assert new_articles == articles
+
+
+def test_bulk_upsert_consumes_generator_lazily():
+    client = _make_client()
+    assert client.bulk_upsert_articles(iter([])) == (0, 0, 0, [])
+    assert client.client.databases.retrieve_calls == 0
+
+    articles = (_make_article(i) for i in range(3))
+    success, new, error, _ = client.bulk_upsert_articles(articles, since="2024-05-01")
+    assert (success, new, error) == (3, 3, 0)
+
+
+def test_sync_state_skips_unchanged_and_sends_diff():
+    client = _make_client()
+    client.sync_state = SyncStateStore(":memory:")
+    client.bulk_upsert_articles([_make_article(i) for i in range(3)])
+
+    articles = [_make_article(i) for i in range(3)]
+    articles[0]["likes"] = 99
+    success, new, error, _ = client.bulk_upsert_articles(articles)
+    assert (success, new, error) == (3, 0, 0)
+    assert client.client.pages.updated == [{"likes": {"number": 99}}]
+    assert client.skipped_count == 2
+
+
+def _fake_server_client(server, monkeypatch):
+    monkeypatch.setattr(NotionClient, "REQUESTS_PER_SECOND", 1000)
+    client = NotionClient(
+        token="x" * 50, database_id="db", base_url=server.notion_base_url
+    )
+    invalidations = []
+    original = client.invalidate_schema_cache
+
+    def invalidate():
+        invalidations.append(True)
+        original()
+
+    monkeypatch.setattr(client, "invalidate_schema_cache", invalidate)
+    return client, invalidations
+
+
+def test_payload_error_is_not_treated_as_schema_drift(monkeypatch):
+    with FakeApiServer(articles=0) as server:
+        client, invalidations = _fake_server_client(server, monkeypatch)
+        assert client.upsert_article(_make_article(0))[0]
+        requests_before = server.stats()["notion_requests"]
+        assert client.upsert_article(_make_article(2))[0]
+        requests_per_write = server.stats()["notion_requests"] - requests_before
+
+        article = _make_article(1)
+        payload = build_payload(article)
+        payload.properties["summary"]["rich_text"] = [
+            {"text": {"content": "あ" * 2001}}
+        ]
+        requests_before = server.stats()["notion_requests"]
+        assert client.upsert_article(article, payload) == (False, False, None)
+        # 文字数超過はスキーマを再検証しても直らないため、再検証もリトライもしない
+        assert invalidations == []
+        assert server.stats()["notion_requests"] - requests_before == requests_per_write
+
+
+def test_missing_property_triggers_schema_revalidation(monkeypatch):
+    with FakeApiServer(articles=0) as server:
+        client, invalidations = _fake_server_client(server, monkeypatch)
+        assert client.upsert_article(_make_article(0))[0]
+
+        # キャッシュの有効期間中にデータベースからプロパティが削除された
+        server.handle_notion(
+            "PATCH", "/databases/db", {"properties": {"summary": None}}
+        )
+        success, is_new, _ = client.upsert_article(_make_article(1))
+        assert success and is_new
+        assert invalidations == [True]
+        assert len(server.notion_pages("db")) == 2
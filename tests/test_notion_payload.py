@@ -0,0 +1,76 @@
+from fake_api import FakeApiServer
+from notion import NotionClient
+from notion_payload import (
+    MAX_TAGS,
+    MAX_TEXT_CHARS,
+    build_payloads,
+    build_tag_options,
+    chunk_rich_text,
+    normalize_tag,
+)
+
+
+def _article(**overrides):
+    article = {
+        "title": "記事",
+        "url": "https://qiita.com/user/items/1",
+        "author": "user",
+        "likes": 1,
+        "stocks": 2,
+        "tags": ["Python"],
+        "summary": "要約",
+        "created_at": "2024-01-01T00:00:00+09:00",
+    }
+    article.update(overrides)
+    return article
+
+
+def test_chunk_rich_text_splits_at_limit():
+    chunks = chunk_rich_text("あ" * (MAX_TEXT_CHARS * 2 + 1))
+    assert [len(c["text"]["content"]) for c in chunks] == [MAX_TEXT_CHARS] * 2 + [1]
+    assert chunk_rich_text("") == []
+
+
+def test_tag_options_are_normalized_and_deduplicated():
+    options = build_tag_options(
+        ["Ｐｙｔｈｏｎ", "python", " a,b ", ""] + list("xyzuvwstqr")
+    )
+    assert options[:2] == [{"name": "Python"}, {"name": "a b"}]
+    assert len(options) == MAX_TAGS
+    assert normalize_tag("Ｐｙｔｈｏｎ") is normalize_tag("Python")
+
+
+def test_long_summary_is_written_in_one_request(monkeypatch):
+    with FakeApiServer(articles=0) as server:
+        monkeypatch.setattr(NotionClient, "REQUESTS_PER_SECOND", 1000)
+        client = NotionClient(
+            token="x" * 50, database_id="db", base_url=server.notion_base_url
+        )
+        article = _article(summary="長い要約。" * 1000)
+        [(_, payload)] = build_payloads([article])
+        assert len(payload.properties["summary"]["rich_text"]) == 3
+
+        success, is_new, _ = client.upsert_article(article, payload)
+        assert success and is_new
+        [page] = server.notion_pages("db")
+        content = "".join(
+            item["text"]["content"]
+            for item in page["properties"]["summary"]["rich_text"]
+        )
+        assert content == article["summary"]
+        # 分割せずに1要素で送ると、模擬サーバーも Notion と同様に拒否する
+        assert (
+            server.handle_notion(
+                "POST",
+                "/pages",
+                {
+                    "parent": {"database_id": "db"},
+                    "properties": {
+                        "summary": {
+                            "rich_text": [{"text": {"content": article["summary"]}}]
+                        }
+                    },
+                },
+            )[0]
+            == 400
+        )
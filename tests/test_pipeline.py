@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import bounded_map, close_stages, threaded_stage
+
+
+def test_bounded_map_preserves_input_order():
+    def slow_square(x):
+        time.sleep(0.01 * (5 - x))
+        return x * x
+
+    results = list(bounded_map(slow_square, range(5), workers=3))
+    assert results == [(x, x * x) for x in range(5)]
+
+
+def test_bounded_map_limits_read_ahead():
+    consumed = []
+    release = threading.Event()
+
+    def source():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    def wait(x):
+        release.wait(0.1)
+        return x
+
+    results = bounded_map(wait, source(), workers=2, max_pending=4)
+    first = next(results)
+    assert first == (0, 0)
+    assert len(consumed) <= 4
+    release.set()
+    assert len(list(results)) == 99
+
+
+def test_threaded_stage_runs_ahead_up_to_queue_size():
+    produced = []
+
+    def source():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    stage = threaded_stage(source(), maxsize=2)
+    assert next(stage) == 0
+    # 取り出した1件・キューの2件・キューへの追加を待つ1件まで先に進み、そこで止まる
+    deadline = time.monotonic() + 1
+    while len(produced) < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert len(produced) == 4
+    assert list(stage) == list(range(1, 10))
+
+
+def test_threaded_stage_propagates_errors_and_stops_on_close():
+    def failing():
+        yield 1
+        raise ValueError("boom")
+
+    stage = threaded_stage(failing())
+    assert next(stage) == 1
+    with pytest.raises(ValueError):
+        next(stage)
+
+    closed = threading.Event()
+
+    def endless():
+        try:
+            while True:
+                yield 0
+        finally:
+            closed.set()
+
+    fetch = threaded_stage(endless(), maxsize=1, name="fetch")
+    summarize = threaded_stage((x + 1 for x in fetch), maxsize=1, name="summarize")
+    assert next(summarize) == 1
+    close_stages([fetch, summarize])
+    assert closed.is_set()
+    assert not any(t.name.startswith("pipeline-") for t in threading.enumerate())
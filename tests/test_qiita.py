@@ -1,6 +1,14 @@
+import json
 import os
 import pytest
-from qiita import QiitaClient
+import requests
+from datetime import datetime
+from fake_api import FakeApiServer
+from notion import NotionClient
+from qiita import QiitaArticle, QiitaClient
+from summary_cache import SummaryCache
+from tasks import daily_job
+from utils import get_date_range
 
 
 def test_qiita_client_init_env(monkeypatch):
@@ -13,3 +21,183 @@ def test_qiita_client_init_invalid():
     os.environ.pop("QIITA_TOKEN", None)
     with pytest.raises(ValueError):
         QiitaClient(token="short")
+
+
+class _FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+        self.content = json.dumps(payload).encode("utf-8")
+        self.raw = None
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+    def json(self):
+        return self._payload
+
+
+class _FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def test_make_request_retries_after_429(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("qiita.time.sleep", sleeps.append)
+    client = QiitaClient(token="x" * 40)
+    client.session = _FakeSession(
+        [
+            _FakeResponse(429, headers={"Retry-After": "3"}),
+            _FakeResponse(
+                200, payload=[{"id": "a"}], headers={"Rate-Remaining": "900"}
+            ),
+        ]
+    )
+    assert client._make_request("items") == [{"id": "a"}]
+    assert client.session.calls == 2
+    assert len(sleeps) == 1 and 3 <= sleeps[0] <= 4
+    assert (
+        client.metrics.get_counter("api_requests", api="qiita", endpoint="items") == 2
+    )
+    assert client.metrics.get_counter("api_retries", api="qiita", endpoint="items") == 1
+
+
+def test_session_reuses_pooled_adapter():
+    client = QiitaClient(token="x" * 40)
+    adapter = client.session.get_adapter(QiitaClient.BASE_URL)
+    assert adapter._pool_maxsize == QiitaClient.POOL_MAXSIZE
+    assert client.session.headers["Authorization"] == f"Bearer {'x' * 40}"
+
+
+def test_build_date_queries_splits_per_day():
+    queries = QiitaClient.build_date_queries(
+        datetime(2024, 5, 1, 7, 0), datetime(2024, 5, 3, 7, 0)
+    )
+    assert queries == [
+        "created:>=2024-05-01 created:<2024-05-02",
+        "created:>=2024-05-02 created:<2024-05-03",
+        "created:>=2024-05-03 created:<2024-05-04",
+    ]
+
+
+def test_fetch_articles_merges_and_deduplicates(monkeypatch):
+    client = QiitaClient(token="x" * 40)
+    pages = {
+        "q1": [{"id": "a"}, {"id": "b"}],
+        "q2": [{"id": "b"}, {"id": "c"}],
+    }
+    monkeypatch.setattr(client, "search_items", lambda query: pages[query])
+    articles = client.fetch_articles(["q1", "q2"], workers=2)
+    assert [article["id"] for article in articles] == ["a", "b", "c"]
+
+
+def _make_item(likes=0, body="本文"):
+    return {
+        "id": "abc",
+        "title": "タイトル",
+        "url": "https://qiita.com/u/items/abc",
+        "user": {"id": "u", "name": "ユーザー"},
+        "likes_count": likes,
+        "stocks_count": 0,
+        "tags": [{"name": "Python"}, {"name": "Notion"}],
+        "created_at": "2024-05-06T12:34:56+09:00",
+        "body": body,
+        "rendered_body": "<p>" + body + "</p>",
+    }
+
+
+def test_qiita_article_is_compact():
+    article = QiitaArticle.from_item(_make_item())
+    assert not hasattr(article, "__dict__")
+    assert article.body == ""
+    assert article.tags == ("Python", "Notion")
+    assert QiitaArticle.from_item(_make_item(), keep_body=True).body == "本文"
+
+
+def test_format_article_for_notion_from_record():
+    client = QiitaClient(token="x" * 40)
+    article = QiitaArticle.from_item(_make_item(likes=600), keep_body=True)
+    formatted = client.format_article_for_notion(article)
+    assert formatted == {
+        "title": "タイトル",
+        "url": "https://qiita.com/u/items/abc",
+        "author": "ユーザー",
+        "likes": 600,
+        "stocks": 0,
+        "tags": ["Python", "Notion"],
+        "created_at": "2024-05-06T12:34:56+09:00",
+        "summary": "本文",
+    }
+
+
+def test_iter_format_articles_parallel_keeps_order():
+    client = QiitaClient(token="x" * 40)
+    long_body = "これは長い本文の文です。" * 40
+    articles = []
+    for i in range(4):
+        item = _make_item(body=long_body if i % 2 else "短い本文")
+        item["url"] = f"https://qiita.com/u/items/{i}"
+        articles.append(QiitaArticle.from_item(item, keep_body=True))
+
+    sequential = list(client.iter_format_articles_for_notion(articles))
+    parallel = list(client.iter_format_articles_for_notion(articles, workers=2))
+    assert parallel == sequential
+    assert [a["url"] for a in parallel] == [a.url for a in articles]
+
+
+def test_format_article_uses_summary_cache(monkeypatch):
+    client = QiitaClient(token="x" * 40, summary_cache=SummaryCache(":memory:"))
+    calls = []
+    monkeypatch.setattr(
+        QiitaClient,
+        "summarize_article",
+        staticmethod(lambda article: calls.append(article.id) or "要約"),
+    )
+    article = QiitaArticle.from_item(_make_item(), keep_body=True)
+    client.format_article_for_notion(article)
+    client.format_article_for_notion(article)
+    assert calls == ["abc"]
+    assert client.summary_cache.stats()["hits"] == 1
+
+
+def test_add_threshold_qualifiers_splits_or_condition():
+    queries = QiitaClient.add_threshold_qualifiers(["created:>=2024-05-01"], 300, 200)
+    assert queries == [
+        "created:>=2024-05-01 stocks:>=200",
+        "created:>=2024-05-01 likes:>=300",
+    ]
+
+
+def test_build_search_queries_adds_thresholds_to_daily_query():
+    start_date, end_date = get_date_range(1)
+    day = start_date.strftime("%Y-%m-%d")
+    assert QiitaClient.build_search_queries(start_date, end_date, (300, 200)) == [
+        f"created:>={day} stocks:>=200",
+        f"created:>={day} likes:>=300",
+    ]
+    assert QiitaClient.build_search_queries(start_date, end_date) == [
+        f"created:>={day}"
+    ]
+
+
+def test_default_daily_run_fetches_only_popular_articles(monkeypatch):
+    with FakeApiServer(articles=10, days=1, noise=150) as server:
+        monkeypatch.setenv("QIITA_TOKEN", "x" * 40)
+        monkeypatch.setenv("NOTION_TOKEN", "x" * 50)
+        monkeypatch.setenv("NOTION_DB_ID", "db")
+        monkeypatch.setenv("QIITA_API_BASE_URL", server.qiita_base_url)
+        monkeypatch.setenv("NOTION_API_BASE_URL", server.notion_base_url)
+        monkeypatch.setattr(NotionClient, "REQUESTS_PER_SECOND", 1000)
+
+        daily_job(summary_cache_path="", sync_state_path="")
+        # 閾値付きの2本のクエリがそれぞれ1ページで完了する
+        assert server.stats()["qiita_requests"] == 2
+        assert len(server.notion_pages("db")) == 10
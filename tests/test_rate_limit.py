@@ -0,0 +1,58 @@
+from rate_limit import RateScheduler, TokenBucket
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_burst_then_wait():
+    clock = _FakeClock()
+    bucket = TokenBucket(rate=3, capacity=3, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        assert bucket.acquire() == 0.0
+    assert not bucket.try_acquire()
+    waited = bucket.acquire()
+    assert abs(waited - 1 / 3) < 1e-9
+
+
+def test_token_bucket_refill_is_capped():
+    clock = _FakeClock()
+    bucket = TokenBucket(rate=3, capacity=3, clock=clock, sleep=clock.sleep)
+    clock.now += 100
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+
+
+def test_rate_scheduler_full_speed_with_budget():
+    clock = _FakeClock()
+    scheduler = RateScheduler(clock=clock, sleep=clock.sleep)
+    scheduler.update(
+        {"Rate-Limit": "1000", "Rate-Remaining": "900", "Rate-Reset": "3600"}
+    )
+    assert sum(scheduler.wait() for _ in range(10)) == 0.0
+
+
+def test_rate_scheduler_spreads_requests_near_exhaustion():
+    clock = _FakeClock()
+    scheduler = RateScheduler(reserve=1, clock=clock, sleep=clock.sleep)
+    scheduler.update(
+        {"Rate-Limit": "1000", "Rate-Remaining": "11", "Rate-Reset": "100"}
+    )
+    assert scheduler.wait() == 0.0
+    # 残り 10 件（うち 1 件は予備）を 100 秒に均等配分する
+    assert abs(scheduler.wait() - 10.0) < 1e-9
+
+
+def test_rate_scheduler_waits_for_reset_when_exhausted():
+    clock = _FakeClock()
+    scheduler = RateScheduler(reserve=1, clock=clock, sleep=clock.sleep)
+    scheduler.update({"Rate-Limit": "1000", "Rate-Remaining": "1", "Rate-Reset": "60"})
+    assert scheduler.wait() == 0.0
+    assert scheduler.wait() == 60.0
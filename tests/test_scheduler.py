@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scheduler import CronSchedule, JobLock, ScheduledJob, Scheduler, ScheduleState
+from utils import JST
+
+
+def _jst(*args):
+    return datetime(*args, tzinfo=JST)
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_cron_schedule_next_after():
+    daily = CronSchedule("0 7 * * *")
+    assert daily.next_after(_jst(2024, 1, 1, 7, 0)) == _jst(2024, 1, 2, 7, 0)
+    # ホストのタイムゾーンによらず JST で評価する（UTC 00:00 は JST 09:00）
+    utc = datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)
+    assert daily.next_after(utc) == _jst(2024, 1, 2, 7, 0)
+
+    weekdays = CronSchedule("*/15 8-9 * * 1-5")
+    assert weekdays.next_after(_jst(2024, 1, 5, 9, 50)) == _jst(2024, 1, 8, 8, 0)
+    assert CronSchedule("@monthly").next_after(_jst(2024, 12, 5)) == _jst(2025, 1, 1)
+    with pytest.raises(ValueError):
+        CronSchedule("0 25 * * *")
+
+
+def test_scheduler_catches_up_once_and_skips_overrun_triggers(tmp_path):
+    state_path = str(tmp_path / "state.sqlite3")
+    state = ScheduleState(state_path)
+    state.record_run("daily", _jst(2024, 1, 1, 7, 5))
+    state.close()
+
+    clock = FakeClock(_jst(2024, 1, 3, 10, 0))
+    runs = []
+
+    def run_job(job):
+        runs.append((job.name, clock.now))
+        if job.name == "hourly":
+            clock.now += timedelta(hours=3)
+
+    jobs = [
+        ScheduledJob("daily", CronSchedule("0 7 * * *")),
+        ScheduledJob("hourly", CronSchedule("0 * * * *"), catch_up=False),
+    ]
+    scheduler = Scheduler(
+        jobs, run_job, lock_path=None, state_path=state_path, clock=clock
+    )
+    # 停止中に過ぎた2回分の daily は起動直後に1回だけ実行する
+    assert scheduler.run_pending() == ["daily"]
+    assert scheduler.next_run_times()["daily"] == _jst(2024, 1, 4, 7, 0)
+    assert scheduler.seconds_until_next() == 3600
+
+    clock.now = _jst(2024, 1, 3, 11, 0)
+    assert scheduler.run_pending() == ["hourly"]
+    # 実行中（11:00〜14:00）に過ぎた実行時刻は読み飛ばす
+    assert scheduler.next_run_times()["hourly"] == _jst(2024, 1, 3, 15, 0)
+    assert [name for name, _ in runs] == ["daily", "hourly"]
+    scheduler.close()
+
+
+def test_scheduler_skips_run_while_lock_is_held(tmp_path):
+    lock_path = str(tmp_path / "daily_job.lock")
+    held = JobLock(lock_path)
+    assert held.acquire()
+
+    clock = FakeClock(_jst(2024, 1, 1, 6, 59))
+    runs = []
+    scheduler = Scheduler(
+        [ScheduledJob("daily", CronSchedule("0 7 * * *"))],
+        runs.append,
+        lock_path=lock_path,
+        state_path=None,
+        clock=clock,
+    )
+    clock.now = _jst(2024, 1, 1, 7, 0)
+    assert scheduler.run_pending() == []
+    assert scheduler.next_run_times()["daily"] == _jst(2024, 1, 2, 7, 0)
+
+    held.release()
+    clock.now = _jst(2024, 1, 2, 7, 0)
+    assert scheduler.run_pending() == ["daily"]
+    assert len(runs) == 1
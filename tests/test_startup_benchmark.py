@@ -0,0 +1,19 @@
+from startup_benchmark import parse_importtime, run_startup_benchmark
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   summary_cache\n"
+        "import time:       300 |        420 | main\n"
+    )
+    assert parse_importtime(stderr) == [
+        ("summary_cache", 120, 120, 1),
+        ("main", 300, 420, 0),
+    ]
+
+
+def test_main_does_not_load_heavy_modules_on_startup():
+    result = run_startup_benchmark(runs=1, budget_ms=10_000)
+    assert result["loaded_lazy_modules"] == []
+    assert result["ok"]
@@ -0,0 +1,96 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from summarizer import (
+    BaseSummarizerEngine,
+    SummarizerEngine,
+    TextRankEngine,
+    get_summarizer,
+    iter_sentences,
+)
+
+TEXT = "これは一つ目の文です。これは二つ目の文です。三つ目の文になります。四つ目の文です。最後の文です。"
+
+
+def test_get_summarizer_is_shared():
+    assert get_summarizer("japanese") is get_summarizer("japanese")
+
+
+def test_engine_without_summarize_cannot_be_created():
+    class IncompleteEngine(BaseSummarizerEngine):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteEngine("japanese")
+
+
+def test_summarize_batch_matches_single():
+    engine = SummarizerEngine("japanese")
+    single = engine.summarize(TEXT, sentences_count=2)
+    assert engine.summarize_batch([TEXT, TEXT], sentences_count=2) == [single, single]
+    assert single.count("。") == 2
+
+
+def test_summarizer_loads_sumy_on_first_use():
+    code = (
+        "import sys, summarizer\n"
+        "assert 'sumy' not in sys.modules\n"
+        "summarizer.get_summarizer('japanese')\n"
+        "assert 'sumy' not in sys.modules\n"
+        "summarizer.get_summarizer('japanese', 'lsa')\n"
+        "assert 'sumy' in sys.modules\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        check=True,
+    )
+
+
+MARKDOWN = """# はじめに
+この記事ではPythonの非同期処理について解説します。
+
+```python
+import asyncio
+print("コードブロックの文です。")
+```
+
+| 列 | 値 |
+|---|---|
+![画像](https://example.com/image.png)
+非同期処理ではイベントループが重要です！[公式ドキュメント](https://docs.python.org)も参照してください。
+"""
+
+
+def test_iter_sentences_strips_markdown():
+    assert list(iter_sentences(MARKDOWN)) == [
+        "はじめに",
+        "この記事ではPythonの非同期処理について解説します。",
+        "非同期処理ではイベントループが重要です！",
+        "公式ドキュメントも参照してください。",
+    ]
+
+
+def test_textrank_picks_central_sentences_in_order():
+    text = (
+        "非同期処理ではイベントループがタスクを実行します。"
+        "今日は天気が良いので散歩に出かけました。"
+        "イベントループは非同期処理のタスクを順番に切り替えます。"
+        "昼食はカレーライスでした。"
+        "タスクの切り替えはイベントループが担当し、非同期処理を支えます。"
+    )
+    summary = get_summarizer("japanese", "textrank").summarize(text, 2)
+    assert "天気" not in summary and "カレー" not in summary
+    assert summary.startswith("非同期処理では") or summary.startswith(
+        "イベントループは"
+    )
+
+
+def test_textrank_caps_sentences_considered():
+    engine = TextRankEngine("japanese")
+    text = "重要な文です。" * (engine.MAX_SENTENCES * 5)
+    assert engine.summarize(text, 3).count("。") == 3
+    assert isinstance(get_summarizer("japanese"), TextRankEngine)
@@ -0,0 +1,35 @@
+from summary_cache import SummaryCache
+
+
+def test_summary_cache_hit_and_miss():
+    cache = SummaryCache(":memory:")
+    assert cache.get("a", "本文", "lsa") is None
+    cache.put("a", "本文", "lsa", "要約")
+    assert cache.get("a", "本文", "lsa") == "要約"
+    # 本文やパラメータが変わった場合は再要約させる
+    assert cache.get("a", "編集後の本文", "lsa") is None
+    assert cache.get("a", "本文", "textrank") is None
+    assert cache.stats() == {"hits": 1, "misses": 3, "entries": 1}
+
+
+def test_summary_cache_evicts_least_recently_used(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("summary_cache.time.time", lambda: now[0])
+    cache = SummaryCache(":memory:", max_entries=2)
+    for article_id in ("a", "b"):
+        now[0] += 1
+        cache.put(article_id, "本文", "lsa", article_id)
+    now[0] += 1
+    cache.get("a", "本文", "lsa")
+    now[0] += 1
+    cache.put("c", "本文", "lsa", "c")
+    assert len(cache) == 2
+    assert cache.get("b", "本文", "lsa") is None
+    assert cache.get("a", "本文", "lsa") == "a"
+
+
+def test_summary_cache_replaces_edited_article():
+    cache = SummaryCache(":memory:")
+    cache.put("a", "本文", "lsa", "古い要約")
+    cache.put("a", "編集後の本文", "lsa", "新しい要約")
+    assert len(cache) == 1
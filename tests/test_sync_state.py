@@ -0,0 +1,17 @@
+from sync_state import SyncStateStore, fingerprint_properties
+
+
+def test_fingerprint_properties_detects_changes():
+    before = fingerprint_properties({"likes": {"number": 1}, "tags": {"a": [1, 2]}})
+    after = fingerprint_properties({"likes": {"number": 2}, "tags": {"a": [1, 2]}})
+    assert before["tags"] == after["tags"]
+    assert before["likes"] != after["likes"]
+
+
+def test_sync_state_record_and_forget():
+    store = SyncStateStore(":memory:")
+    assert store.get("https://qiita.com/items/a") is None
+    store.record("https://qiita.com/items/a", "page-1", {"likes": "x"})
+    assert store.get("https://qiita.com/items/a") == ("page-1", {"likes": "x"})
+    store.forget("https://qiita.com/items/a")
+    assert len(store) == 0
@@ -0,0 +1,154 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+from fake_api import FakeApiServer
+from metrics import RunMetrics
+from notion import NotionClient
+from targets import SyncTarget, get_fetch_criteria, load_targets
+from tasks import daily_job
+from utils import get_date_range
+
+
+def _record(likes, stocks, tags):
+    start_date, _ = get_date_range(1)
+    return {
+        "likes": likes,
+        "stocks": stocks,
+        "tags": tags,
+        "created_at": (start_date + timedelta(hours=1)).isoformat(),
+    }
+
+
+def test_target_filters_by_thresholds_and_tags():
+    target = SyncTarget(
+        name="backend",
+        database_id="db",
+        min_likes=100,
+        min_stocks=200,
+        include_tags=frozenset({"python"}),
+        exclude_tags=frozenset({"ポエム"}),
+    )
+    date_range = get_date_range(1)
+    assert target.accepts(_record(100, 0, ["Python"]), *date_range)
+    assert not target.accepts(_record(99, 199, ["Python"]), *date_range)
+    assert not target.accepts(_record(100, 0, ["Go"]), *date_range)
+    assert not target.accepts(_record(100, 0, ["Python", "ポエム"]), *date_range)
+
+
+def test_load_targets_expands_env_and_computes_widest_criteria(monkeypatch, tmp_path):
+    monkeypatch.setenv("NOTION_DB_ID_TEAM", "team-db")
+    path = tmp_path / "targets.json"
+    path.write_text(
+        json.dumps(
+            {
+                "targets": [
+                    {"name": "a", "database_id": "${NOTION_DB_ID_TEAM}", "days": 3},
+                    {"name": "b", "database_id": "db", "min_likes": 100},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    targets = load_targets(str(path))
+    assert targets[0].database_id == "team-db"
+    assert get_fetch_criteria(targets, 1) == (3, 100, 500)
+
+    path.write_text(
+        json.dumps({"targets": [{"name": "a", "database_id": "${MISSING_DB}"}]}),
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError):
+        load_targets(str(path))
+
+
+def test_multi_target_job_fetches_qiita_once(monkeypatch, tmp_path):
+    with FakeApiServer(articles=10, days=2) as server:
+        monkeypatch.setenv("QIITA_TOKEN", "x" * 40)
+        monkeypatch.setenv("NOTION_TOKEN", "x" * 50)
+        monkeypatch.setenv("QIITA_API_BASE_URL", server.qiita_base_url)
+        monkeypatch.setenv("NOTION_API_BASE_URL", server.notion_base_url)
+        monkeypatch.setattr(NotionClient, "REQUESTS_PER_SECOND", 1000)
+
+        # 1つの同期先で実行したときの Qiita へのリクエスト数
+        single_path = tmp_path / "single.json"
+        single_path.write_text(
+            json.dumps({"targets": [{"name": "all", "database_id": "db-single"}]}),
+            encoding="utf-8",
+        )
+        daily_job(
+            backfill_days=2,
+            summary_cache_path="",
+            sync_state_path="",
+            targets_path=str(single_path),
+        )
+        single_requests = server.stats()["qiita_requests"]
+
+        server.reset(articles=10)
+        multi_path = tmp_path / "multi.json"
+        multi_path.write_text(
+            json.dumps(
+                {
+                    "targets": [
+                        {"name": "all", "database_id": "db-all"},
+                        {
+                            "name": "likes",
+                            "database_id": "db-likes",
+                            "min_stocks": 10**6,
+                        },
+                        {
+                            "name": "none",
+                            "database_id": "db-none",
+                            "min_likes": 10**6,
+                            "min_stocks": 10**6,
+                        },
+                    ]
+                }
+            ),
+            encoding="utf-8",
+        )
+        metrics = RunMetrics()
+        daily_job(
+            backfill_days=2,
+            summary_cache_path="",
+            sync_state_path=str(tmp_path / "sync_state.sqlite3"),
+            targets_path=str(multi_path),
+            metrics=metrics,
+        )
+
+        assert server.stats()["qiita_requests"] == single_requests
+        all_pages = server.notion_pages("db-all")
+        likes_pages = server.notion_pages("db-likes")
+        assert len(all_pages) == 10
+        assert 0 < len(likes_pages) < 10
+        assert server.notion_pages("db-none") == []
+        assert metrics.get_counter("target_articles", target="all", result="new") == 10
+        assert metrics.report()["gauges"]["articles_unchanged"] == 0
+
+        # 2回目は変更がないため、書き込んだページはすべて「変更なし」として数える
+        metrics = RunMetrics()
+        daily_job(
+            backfill_days=2,
+            summary_cache_path="",
+            sync_state_path=str(tmp_path / "sync_state.sqlite3"),
+            targets_path=str(multi_path),
+            metrics=metrics,
+        )
+        assert metrics.report()["gauges"]["articles_unchanged"] == len(all_pages) + len(
+            likes_pages
+        )
+    assert (tmp_path / "sync_state.all.sqlite3").exists()
+
+
+@pytest.mark.parametrize(
+    "option", [{"incremental": True}, {"journal_path": "j"}, {"use_async": True}]
+)
+def test_targets_reject_unsupported_options(tmp_path, option):
+    path = tmp_path / "targets.json"
+    path.write_text(
+        json.dumps({"targets": [{"name": "a", "database_id": "db"}]}),
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError):
+        daily_job(targets_path=str(path), **option)
@@ -45,6 +45,10 @@ def parse_iso_datetime(iso_string: str) -> datetime:
         return datetime.now(timezone.utc)
 
 
+# JSTタイムゾーン (UTC+9)
+JST = timezone(timedelta(hours=9))
+
+
 def get_jst_now() -> datetime:
     """
     現在の日本時間を取得
@@ -52,9 +56,7 @@ def get_jst_now() -> datetime:
     Returns:
         datetime: 日本時間の現在時刻
     """
-    # JSTタイムゾーン (UTC+9)
-    jst = timezone(timedelta(hours=9))
-    return datetime.now(jst)
+    return datetime.now(JST)
 
 
 def get_date_range(days: int) -> Tuple[datetime, datetime]: